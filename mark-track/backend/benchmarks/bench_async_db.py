@@ -0,0 +1,65 @@
+"""Concurrent request throughput: sync Session vs AsyncSession inside async handlers.
+
+Each request runs a query that spends QUERY_SECONDS inside Postgres, which is
+how a slow roster or grade query looks to the event loop.
+
+Usage (from the backend directory, with the POSTGRES_* variables set):
+    python -m benchmarks.bench_async_db [concurrency] [requests]
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+backend_dir = str(Path(__file__).resolve().parent.parent)
+if backend_dir not in sys.path:
+    sys.path.append(backend_dir)
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from database.postgres_setup import engine, get_db, get_async_db, disconnect_db
+
+QUERY_SECONDS = 0.02
+
+engine.echo = False
+app = FastAPI()
+
+@app.get("/sync")
+async def sync_handler(db: Session = Depends(get_db)):
+    db.execute(text("SELECT pg_sleep(:s)"), {"s": QUERY_SECONDS})
+    return {"ok": True}
+
+@app.get("/async")
+async def async_handler(db: AsyncSession = Depends(get_async_db)):
+    await db.execute(text("SELECT pg_sleep(:s)"), {"s": QUERY_SECONDS})
+    return {"ok": True}
+
+async def run(path: str, concurrency: int, total: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        await client.get(path)  # warm the pool
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        return total / (time.perf_counter() - start)
+
+async def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    print(f"{total} requests, concurrency {concurrency}, {QUERY_SECONDS * 1000:.0f} ms per query")
+    for path in ("/sync", "/async"):
+        rps = await run(path, concurrency, total)
+        print(f"{path:<8} {rps:8.1f} req/s")
+    await disconnect_db()
+
+if __name__ == "__main__":
+    asyncio.run(main())
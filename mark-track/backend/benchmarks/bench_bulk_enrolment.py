@@ -0,0 +1,99 @@
+"""Bulk class enrolment: per-id lookups vs the set-based add_students_to_class.
+
+Seeds N students and an empty class, enrols them once with the old
+one-query-per-id loop and once through the endpoint, then removes the data.
+
+Usage (from the backend directory, with the POSTGRES_* variables set):
+    python -m benchmarks.bench_bulk_enrolment [sizes...]
+"""
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+backend_dir = str(Path(__file__).resolve().parent.parent)
+if backend_dir not in sys.path:
+    sys.path.append(backend_dir)
+
+from sqlalchemy import delete, select
+
+from database.postgres_setup import AsyncSessionLocal, disconnect_db
+from models.database_models import Class, ClassStudent, Student
+from routers.admin import add_students_to_class
+
+ADMIN = SimpleNamespace(role="admin")
+
+class JsonRequest:
+    def __init__(self, payload):
+        self.payload = payload
+
+    async def json(self):
+        return self.payload
+
+async def seed(size: int):
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    class_id = f"{prefix}-class"
+    student_ids = [f"{prefix}-{i}" for i in range(size)]
+    async with AsyncSessionLocal() as db:
+        db.add(Class(id=class_id, name=class_id))
+        db.add_all(
+            Student(id=sid, student_id=sid, first_name="Bench", last_name=str(i))
+            for i, sid in enumerate(student_ids)
+        )
+        await db.commit()
+    return class_id, student_ids
+
+async def reset(class_id: str):
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(ClassStudent).where(ClassStudent.class_id == class_id))
+        await db.commit()
+
+async def cleanup(class_id: str, student_ids):
+    await reset(class_id)
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Student).where(Student.student_id.in_(student_ids)))
+        await db.execute(delete(Class).where(Class.id == class_id))
+        await db.commit()
+
+async def per_id_enrolment(class_id: str, student_ids):
+    """The previous implementation: three lookups per id."""
+    async with AsyncSessionLocal() as db:
+        for student_id in student_ids:
+            await db.scalar(select(Student).where(Student.student_id == student_id))
+        for student_id in student_ids:
+            existing_class = await db.scalar(
+                select(Class).join(ClassStudent).where(ClassStudent.student_id == student_id)
+            )
+            if not existing_class:
+                db.add(ClassStudent(class_id=class_id, student_id=student_id))
+        await db.commit()
+
+async def set_based_enrolment(class_id: str, student_ids):
+    async with AsyncSessionLocal() as db:
+        # __wrapped__ skips the per-user rate limit
+        await add_students_to_class.__wrapped__(
+            class_id, JsonRequest({"student_ids": student_ids}), db=db, current_user=ADMIN
+        )
+
+async def timed(fn, *args) -> float:
+    start = time.perf_counter()
+    await fn(*args)
+    return time.perf_counter() - start
+
+async def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000]
+    for size in sizes:
+        class_id, student_ids = await seed(size)
+        try:
+            per_id = await timed(per_id_enrolment, class_id, student_ids)
+            await reset(class_id)
+            set_based = await timed(set_based_enrolment, class_id, student_ids)
+            print(f"{size:>6} ids  per-id {per_id * 1000:9.1f} ms  set-based {set_based * 1000:8.1f} ms")
+        finally:
+            await cleanup(class_id, student_ids)
+    await disconnect_db()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+"""Login throughput: bcrypt inline in the handler vs on the password hashing pool.
+
+Runs a burst of concurrent logins against each variant while a probe keeps
+hitting a trivial endpoint, and reports login throughput and the probe's
+worst latency (how long the event loop was unavailable to other requests).
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_login [concurrency] [logins]
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+backend_dir = str(Path(__file__).resolve().parent.parent)
+if backend_dir not in sys.path:
+    sys.path.append(backend_dir)
+
+import httpx
+from fastapi import FastAPI
+
+from utils.security import get_password_hash, verify_password, verify_password_async, password_hasher
+
+PASSWORD = "correct horse battery staple"
+HASHED = get_password_hash(PASSWORD)
+PROBE_INTERVAL = 0.005
+
+app = FastAPI()
+
+@app.post("/inline")
+async def inline_login():
+    return {"ok": verify_password(PASSWORD, HASHED)}
+
+@app.post("/pool")
+async def pool_login():
+    return {"ok": await verify_password_async(PASSWORD, HASHED)}
+
+@app.get("/ping")
+async def ping():
+    return {"ok": True}
+
+async def run(path: str, concurrency: int, total: int):
+    transport = httpx.ASGITransport(app=app)
+    semaphore = asyncio.Semaphore(concurrency)
+    probe_latencies = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with semaphore:
+                response = await client.post(path)
+                response.raise_for_status()
+
+        async def probe(stop: asyncio.Event):
+            # Time from "due" (after a 5 ms sleep) to a served /ping, so a
+            # blocked loop shows up even when the probe could not start
+            while not stop.is_set():
+                start = time.perf_counter()
+                await asyncio.sleep(PROBE_INTERVAL)
+                await client.get("/ping")
+                probe_latencies.append(time.perf_counter() - start - PROBE_INTERVAL)
+
+        stop = asyncio.Event()
+        probe_task = asyncio.create_task(probe(stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probe_task
+    return total / elapsed, max(probe_latencies) * 1000
+
+async def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    total = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    print(f"{total} logins, concurrency {concurrency}, {password_hasher.workers} hashing workers")
+    for path in ("/inline", "/pool"):
+        rps, worst_probe_ms = await run(path, concurrency, total)
+        print(f"{path:<8} {rps:8.1f} logins/s   worst /ping latency {worst_probe_ms:8.1f} ms")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,100 @@
+"""Admin student list: whole table per request vs keyset pages.
+
+Seeds N students, then measures wall time and peak Python allocation for
+the previous load-everything query, a single keyset page and walking every
+page through get_all_students, and removes the data.
+
+Usage (from the backend directory, with the POSTGRES_* variables set):
+    python -m benchmarks.bench_pagination [rows] [page_size]
+"""
+import asyncio
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+from types import SimpleNamespace
+
+backend_dir = str(Path(__file__).resolve().parent.parent)
+if backend_dir not in sys.path:
+    sys.path.append(backend_dir)
+
+from sqlalchemy import delete, insert, select
+
+from database.postgres_setup import AsyncSessionLocal, disconnect_db
+from models.database_models import Student
+from routers.admin import STUDENT_FIELDS, get_all_students
+from utils.pagination import PageParams
+
+ADMIN = SimpleNamespace(role="admin")
+
+async def seed(size: int) -> str:
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    async with AsyncSessionLocal() as db:
+        for start in range(0, size, 10000):
+            await db.execute(insert(Student), [
+                {"id": f"{prefix}-{i:07d}", "student_id": f"{prefix}-{i:07d}", "first_name": "Bench", "last_name": str(i)}
+                for i in range(start, min(start + 10000, size))
+            ])
+        await db.commit()
+    return prefix
+
+async def cleanup(prefix: str):
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Student).where(Student.id.like(f"{prefix}-%")))
+        await db.commit()
+
+async def load_everything():
+    """The previous implementation: every student in one response."""
+    async with AsyncSessionLocal() as db:
+        students = (await db.scalars(select(Student))).all()
+        return [{
+            "id": s.id,
+            "first_name": s.first_name,
+            "last_name": s.last_name,
+            "student_id": s.student_id
+        } for s in students]
+
+async def one_page(page_size: int, cursor=None):
+    async with AsyncSessionLocal() as db:
+        return await get_all_students(
+            PageParams(cursor=cursor, limit=page_size), STUDENT_FIELDS(fields=None), db=db, current_user=ADMIN
+        )
+
+async def walk_pages(page_size: int):
+    cursor, pages = None, 0
+    while True:
+        result = await one_page(page_size, cursor)
+        pages += 1
+        cursor = result["next_cursor"]
+        if cursor is None:
+            return pages
+
+async def measured(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    await fn(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed * 1000, peak / 1024 / 1024
+
+async def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    page_size = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    prefix = await seed(size)
+    try:
+        print(f"{size} students, page size {page_size}")
+        for label, fn, args in (
+            ("load everything", load_everything, ()),
+            ("first page", one_page, (page_size,)),
+            ("walk all pages", walk_pages, (page_size,)),
+        ):
+            ms, mib = await measured(fn, *args)
+            print(f"{label:<16} {ms:9.1f} ms   peak {mib:7.1f} MiB")
+    finally:
+        await cleanup(prefix)
+        await disconnect_db()
+
+if __name__ == "__main__":
+    asyncio.run(main())
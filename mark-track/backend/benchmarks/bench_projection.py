@@ -0,0 +1,93 @@
+"""Per-row cost of ORM entities vs Core column projections on a list read.
+
+Seeds N students and reads them three ways: full ORM entities copied into
+dicts (the previous handlers), every column through select(...).mappings(),
+and a two-column ?fields= projection. Reports CPU time and peak Python
+allocation per row, then removes the data.
+
+Usage (from the backend directory, with the POSTGRES_* variables set):
+    python -m benchmarks.bench_projection [rows] [repeats]
+"""
+import asyncio
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+
+backend_dir = str(Path(__file__).resolve().parent.parent)
+if backend_dir not in sys.path:
+    sys.path.append(backend_dir)
+
+from sqlalchemy import delete, insert, select
+
+from database.postgres_setup import AsyncSessionLocal, disconnect_db
+from models.database_models import Student
+from routers.admin import STUDENT_FIELDS
+
+async def seed(size: int) -> str:
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    async with AsyncSessionLocal() as db:
+        await db.execute(insert(Student), [
+            {"id": f"{prefix}-{i:07d}", "student_id": f"{prefix}-{i:07d}", "first_name": "Bench", "last_name": str(i)}
+            for i in range(size)
+        ])
+        await db.commit()
+    return prefix
+
+async def cleanup(prefix: str):
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Student).where(Student.id.like(f"{prefix}-%")))
+        await db.commit()
+
+async def orm_entities(prefix: str):
+    async with AsyncSessionLocal() as db:
+        students = (await db.scalars(select(Student).where(Student.id.like(f"{prefix}-%")))).all()
+        return [{
+            "id": s.id,
+            "first_name": s.first_name,
+            "last_name": s.last_name,
+            "student_id": s.student_id
+        } for s in students]
+
+async def core_mappings(prefix: str, fields=None):
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(
+            select(*STUDENT_FIELDS(fields=fields)).where(Student.id.like(f"{prefix}-%"))
+        )).mappings().all()
+        return [dict(row) for row in rows]
+
+async def core_two_fields(prefix: str):
+    return await core_mappings(prefix, "id,last_name")
+
+async def measure(fn, prefix: str, size: int, repeats: int):
+    cpu = []
+    for _ in range(repeats):
+        start = time.process_time()
+        await fn(prefix)
+        cpu.append(time.process_time() - start)
+    tracemalloc.start()
+    await fn(prefix)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(cpu) / size * 1e6, peak / size
+
+async def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    prefix = await seed(size)
+    try:
+        print(f"{size} rows, best of {repeats}")
+        for label, fn in (
+            ("ORM entities", orm_entities),
+            ("Core, all columns", core_mappings),
+            ("Core, fields=2", core_two_fields),
+        ):
+            us_per_row, bytes_per_row = await measure(fn, prefix, size, repeats)
+            print(f"{label:<18} {us_per_row:7.2f} us/row CPU   {bytes_per_row:7.0f} B/row peak")
+    finally:
+        await cleanup(prefix)
+        await disconnect_db()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""Response serialization for a 1,000-student roster with marks.
+
+Serves the same payload through four in-process apps: plain dicts with the
+default JSONResponse, plain dicts with an orjson response class, the
+StudentsResponse model with the default response class, and the model with
+an orjson default class. No database is needed.
+
+Usage (from the backend directory):
+    python -m benchmarks.bench_serialization [students] [requests]
+"""
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+backend_dir = str(Path(__file__).resolve().parent.parent)
+if backend_dir not in sys.path:
+    sys.path.append(backend_dir)
+
+import orjson
+from fastapi import APIRouter, FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from models.teacher import StudentsResponse
+
+class OrjsonResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+def roster(size: int) -> dict:
+    return {"students": [{
+        "id": f"student-{i}",
+        "student_id": f"S{i:05d}",
+        "first_name": "Bench",
+        "last_name": str(i),
+        "marks": [
+            {"id": f"mark-{i}-{j}", "value": 8.0, "description": "Test", "date": datetime(2024, 1, j + 1)}
+            for j in range(10)
+        ],
+        "absences": [
+            {"id": f"absence-{i}-{j}", "is_motivated": False, "description": None, "date": datetime(2024, 2, j + 1)}
+            for j in range(3)
+        ],
+        "average_mark": 8.0,
+        "total_absences": 3,
+        "motivated_absences": 0
+    } for i in range(size)]}
+
+def make_client(payload: dict, typed: bool, default_response_class=None) -> TestClient:
+    router = APIRouter()
+    if typed:
+        @router.get("/roster", response_model=StudentsResponse, response_model_exclude_unset=True)
+        async def typed_roster():
+            return payload
+    else:
+        @router.get("/roster")
+        async def untyped_roster():
+            return payload
+    app = FastAPI(default_response_class=default_response_class) if default_response_class else FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    payload = roster(size)
+    print(f"{size} students, mean of {requests} requests")
+    for label, typed, response_class in (
+        ("dicts, JSONResponse", False, None),
+        ("dicts, orjson", False, OrjsonResponse),
+        ("model, default class", True, None),
+        ("model, orjson", True, OrjsonResponse),
+    ):
+        client = make_client(payload, typed, response_class)
+        client.get("/roster").raise_for_status()
+        start = time.perf_counter()
+        for _ in range(requests):
+            client.get("/roster")
+        print(f"{label:<22} {(time.perf_counter() - start) / requests * 1000:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Student overview: /subjects plus /marks and /absences per subject vs /dashboard.
+
+Seeds one student in a class with N subjects (each with a teacher, marks and
+absences), loads the overview both ways over ASGI, and reports HTTP requests,
+SQL statements and wall time per page load. The seeded data is removed at the end.
+
+Usage (from the backend directory, with the POSTGRES_* variables set):
+    python -m benchmarks.bench_student_dashboard [subjects] [rounds]
+"""
+import asyncio
+import sys
+import time
+import uuid
+from pathlib import Path
+
+backend_dir = str(Path(__file__).resolve().parent.parent)
+if backend_dir not in sys.path:
+    sys.path.append(backend_dir)
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import delete, event
+
+from database.postgres_setup import AsyncSessionLocal, async_engine, disconnect_db
+from models.database_models import Absence, Class, ClassStudent, ClassSubject, Mark, Student, Subject, Teacher
+from models.principal import Principal, StudentPrincipal
+from routers import student
+from routers.auth import get_current_user
+
+MARKS_PER_SUBJECT = 10
+ABSENCES_PER_SUBJECT = 5
+
+async def seed(subject_count: int):
+    prefix = f"bench-{uuid.uuid4().hex[:8]}"
+    student_row = Student(id=f"{prefix}-student", student_id=f"{prefix}-sid", first_name="Bench", last_name="Student")
+    class_row = Class(id=f"{prefix}-class", name=prefix)
+    subjects = [Subject(id=f"{prefix}-subject-{i}", name=f"{prefix} {i}") for i in range(subject_count)]
+    teachers = [
+        Teacher(id=f"{prefix}-teacher-{i}", first_name="Bench", last_name=str(i), subject_id=s.id)
+        for i, s in enumerate(subjects)
+    ]
+    async with AsyncSessionLocal() as db:
+        db.add_all([student_row, class_row, *subjects, *teachers])
+        await db.flush()
+        db.add(ClassStudent(class_id=class_row.id, student_id=student_row.student_id))
+        for subject, teacher in zip(subjects, teachers):
+            db.add(ClassSubject(class_id=class_row.id, subject_id=subject.id, teacher_id=teacher.id))
+            db.add_all(
+                Mark(id=str(uuid.uuid4()), student_id=student_row.id, teacher_id=teacher.id,
+                     subject_id=subject.id, value=1 + i % 10)
+                for i in range(MARKS_PER_SUBJECT)
+            )
+            db.add_all(
+                Absence(id=str(uuid.uuid4()), student_id=student_row.id, teacher_id=teacher.id,
+                        subject_id=subject.id, is_motivated=i % 2 == 0)
+                for i in range(ABSENCES_PER_SUBJECT)
+            )
+        await db.commit()
+    principal = Principal(
+        id=f"{prefix}-user",
+        email=f"{prefix}@example.com",
+        role="student",
+        status=None,
+        student=StudentPrincipal(
+            id=student_row.id, student_id=student_row.student_id, first_name="Bench", last_name="Student"
+        )
+    )
+    return prefix, principal
+
+async def cleanup(prefix: str):
+    like = f"{prefix}-%"
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Mark).where(Mark.subject_id.like(like)))
+        await db.execute(delete(Absence).where(Absence.subject_id.like(like)))
+        await db.execute(delete(ClassSubject).where(ClassSubject.class_id.like(like)))
+        await db.execute(delete(ClassStudent).where(ClassStudent.class_id.like(like)))
+        await db.execute(delete(Teacher).where(Teacher.id.like(like)))
+        await db.execute(delete(Subject).where(Subject.id.like(like)))
+        await db.execute(delete(Class).where(Class.id.like(like)))
+        await db.execute(delete(Student).where(Student.id.like(like)))
+        await db.commit()
+
+async def fan_out(client: httpx.AsyncClient) -> int:
+    """What the overview did before: the subject list, then two requests per subject."""
+    subjects = (await client.get("/student/subjects")).json()["subjects"]
+    for subject in subjects:
+        (await client.get("/student/marks", params={"subject_id": subject["id"]})).raise_for_status()
+        (await client.get("/student/absences", params={"subject_id": subject["id"]})).raise_for_status()
+    return 1 + 2 * len(subjects)
+
+async def dashboard(client: httpx.AsyncClient) -> int:
+    (await client.get("/student/dashboard")).raise_for_status()
+    return 1
+
+async def measure(client, load, rounds: int, statements: list):
+    await load(client)  # warm up
+    statements.clear()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        requests = await load(client)
+    elapsed = time.perf_counter() - start
+    return requests, len(statements) / rounds, elapsed / rounds * 1000
+
+async def main():
+    subject_count = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    statements = []
+    event.listen(
+        async_engine.sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement)
+    )
+
+    prefix, principal = await seed(subject_count)
+    app = FastAPI()
+    app.include_router(student.router, prefix="/student")
+    app.dependency_overrides[get_current_user] = lambda: principal
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            print(f"{subject_count} subjects, {MARKS_PER_SUBJECT} marks and {ABSENCES_PER_SUBJECT} absences each")
+            for name, load in (("fan-out", fan_out), ("dashboard", dashboard)):
+                requests, queries, ms = await measure(client, load, rounds, statements)
+                print(f"{name:<10} {requests:4d} requests  {queries:6.1f} queries  {ms:8.1f} ms per page load")
+    finally:
+        await cleanup(prefix)
+        await disconnect_db()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -15,6 +15,7 @@ if backend_dir not in sys.path:
     sys.path.append(backend_dir)
 
 from database.postgres_setup import engine, Base
+from database import partitions
 from models.database_models import (
     User, Teacher, Student, Class, ClassStudent,
     Subject, ClassSubject, Mark, Absence, Notification
@@ -24,6 +25,9 @@ from models.database_models import (
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+# Convert notifications into a table range-partitioned by created_at month
+NOTIFICATION_PARTITIONING = os.getenv("NOTIFICATION_PARTITIONING", "false").lower() in ("1", "true", "yes")
+
 def create_sample_users(session):
     # Create sample users with different roles
     users = [
@@ -305,6 +309,186 @@ def create_sample_classes(session):
     session.commit()
     return classes
 
+def column_missing(table: str, column: str) -> str:
+    return (
+        "SELECT NOT EXISTS (SELECT 1 FROM information_schema.columns "
+        f"WHERE table_schema = current_schema() AND table_name = '{table}' AND column_name = '{column}')"
+    )
+
+def column_nullable(table: str, column: str) -> str:
+    return (
+        "SELECT NOT attnotnull FROM pg_attribute "
+        f"WHERE attrelid = '{table}'::regclass AND attname = '{column}'"
+    )
+
+def trigger_missing(table: str, trigger: str) -> str:
+    return (
+        "SELECT NOT EXISTS (SELECT 1 FROM pg_trigger "
+        f"WHERE tgrelid = '{table}'::regclass AND tgname = '{trigger}')"
+    )
+
+# One-off changes for tables created before a column or constraint was added
+# (create_all only creates missing tables, it never alters existing ones).
+# Each step is (check, statements): the statements run only while the check
+# returns true, so booting against an up-to-date database takes no table locks
+# and never rewrites rows.
+SCHEMA_UPDATES = [
+    (column_missing("notifications", "subject_name"), [
+        "ALTER TABLE notifications ADD COLUMN IF NOT EXISTS subject_name VARCHAR",
+        """
+        UPDATE notifications n
+        SET subject_name = s.name
+        FROM subjects s
+        WHERE n.subject_id = s.id
+        """,
+    ]),
+    (column_missing("notifications", "teacher_first_name"), [
+        "ALTER TABLE notifications ADD COLUMN IF NOT EXISTS teacher_first_name VARCHAR",
+        "ALTER TABLE notifications ADD COLUMN IF NOT EXISTS teacher_last_name VARCHAR",
+        """
+        UPDATE notifications n
+        SET teacher_first_name = t.first_name, teacher_last_name = t.last_name
+        FROM teachers t
+        WHERE n.teacher_id = t.id
+        """,
+    ]),
+    (column_missing("absences", "roll_call_date"), [
+        "ALTER TABLE absences ADD COLUMN IF NOT EXISTS roll_call_date DATE",
+    ]),
+    # The unread index and counters match is_read = false, so NULL must not occur
+    (column_nullable("notifications", "is_read"), [
+        "UPDATE notifications SET is_read = false WHERE is_read IS NULL",
+        "ALTER TABLE notifications ALTER COLUMN is_read SET DEFAULT false",
+        "ALTER TABLE notifications ALTER COLUMN is_read SET NOT NULL",
+    ]),
+    # Wake the notification stream listeners in every worker (routers/notifications.py).
+    # Created only when missing: dropping it on boot would miss NOTIFYs for rows
+    # inserted meanwhile and queue behind writers for the table lock
+    (trigger_missing("notifications", "notifications_notify"), [
+        """
+        CREATE OR REPLACE FUNCTION notify_notification_insert() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify(
+                'notifications',
+                json_build_object('id', NEW.id, 'student_id', NEW.student_id)::text
+            );
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        """
+        CREATE TRIGGER notifications_notify
+        AFTER INSERT ON notifications
+        FOR EACH ROW EXECUTE FUNCTION notify_notification_insert()
+        """,
+    ]),
+]
+
+def apply_schema_updates(engine):
+    """Run the SCHEMA_UPDATES steps the database still needs, in one transaction.
+
+    The advisory lock makes workers booting together wait for each other; the
+    later ones then find every check false and change nothing.
+    """
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('schema_updates'))"))
+        for check, statements in SCHEMA_UPDATES:
+            if not conn.scalar(text(check)):
+                continue
+            for statement in statements:
+                conn.execute(text(statement))
+    logger.info("Schema updates applied")
+
+def index_ddl(index, concurrently: bool = True) -> str:
+    columns = ", ".join(column.name for column in index.columns)
+    where = index.dialect_options["postgresql"]["where"]
+    return (
+        f"CREATE {'UNIQUE ' if index.unique else ''}INDEX {'CONCURRENTLY ' if concurrently else ''}"
+        f"IF NOT EXISTS {index.name} ON {index.table.name} ({columns})"
+        + (f" WHERE {where}" if where is not None else "")
+    )
+
+def create_indexes_concurrently(engine):
+    """Build any model index missing from an existing database without locking writes.
+
+    create_all only adds indexes together with new tables. CREATE INDEX
+    CONCURRENTLY cannot run inside a transaction, and a failed build leaves an
+    invalid index behind that IF NOT EXISTS would skip, so those are dropped
+    and rebuilt. An index that is still being built is invalid too, so the
+    session advisory lock keeps workers booting together from racing, and
+    indexes listed in pg_stat_progress_create_index are left alone.
+    Partitioned tables do not support CONCURRENTLY; their indexes are created
+    by partition_notifications and only checked here.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("SELECT pg_advisory_lock(hashtext('create_indexes'))"))
+        try:
+            invalid = set(conn.execute(text("""
+                SELECT c.relname FROM pg_index i
+                JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE NOT i.indisvalid
+                AND i.indexrelid NOT IN (SELECT index_relid FROM pg_stat_progress_create_index)
+            """)).scalars())
+            partitioned = set(conn.execute(text("""
+                SELECT c.relname FROM pg_partitioned_table p
+                JOIN pg_class c ON c.oid = p.partrelid
+            """)).scalars())
+
+            for table in Base.metadata.sorted_tables:
+                concurrently = table.name not in partitioned
+                for index in table.indexes:
+                    if index.name in invalid and concurrently:
+                        logger.warning(f"Rebuilding invalid index {index.name}")
+                        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index.name}"))
+                    conn.execute(text(index_ddl(index, concurrently)))
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(hashtext('create_indexes'))"))
+    logger.info("Indexes verified")
+
+def partition_notifications(engine, months_ahead: int = 3):
+    """Rebuild notifications as a table partitioned by created_at month, copying existing rows.
+
+    Runs once, in one transaction, so the table is locked while rows are copied.
+    The primary key becomes (id, created_at) because a partitioned table's keys
+    must include the partition column. Rows outside the monthly partitions land
+    in notifications_default. The insert trigger is recreated by
+    apply_schema_updates.
+    """
+    with engine.begin() as conn:
+        if conn.scalar(partitions.IS_PARTITIONED_SQL, {"table": partitions.PARENT}):
+            return
+        logger.info("Partitioning notifications by month...")
+        conn.execute(text("ALTER TABLE notifications RENAME TO notifications_unpartitioned"))
+        conn.execute(text(
+            "UPDATE notifications_unpartitioned SET created_at = COALESCE(date, now()) "
+            "WHERE created_at IS NULL"
+        ))
+        first = conn.scalar(text("SELECT min(created_at) FROM notifications_unpartitioned"))
+        conn.execute(text("""
+            CREATE TABLE notifications (
+                LIKE notifications_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS,
+                PRIMARY KEY (id, created_at)
+            ) PARTITION BY RANGE (created_at)
+        """))
+        current = partitions.month_start(datetime.utcnow().date())
+        start = partitions.month_start(first.date()) if first else current
+        for month in partitions.months_between(start, partitions.add_months(current, months_ahead)):
+            conn.execute(text(partitions.create_partition_sql(month)))
+        conn.execute(text(
+            f"CREATE TABLE {partitions.DEFAULT_PARTITION} PARTITION OF notifications DEFAULT"
+        ))
+        conn.execute(text("INSERT INTO notifications SELECT * FROM notifications_unpartitioned"))
+        conn.execute(text("DROP TABLE notifications_unpartitioned"))
+        for foreign_key in Notification.__table__.foreign_key_constraints:
+            column = foreign_key.column_keys[0]
+            target = next(iter(foreign_key.elements)).target_fullname.replace(".", "(") + ")"
+            conn.execute(text(
+                f"ALTER TABLE notifications ADD FOREIGN KEY ({column}) REFERENCES {target}"
+            ))
+        for index in Notification.__table__.indexes:
+            conn.execute(text(index_ddl(index, concurrently=False)))
+    logger.info("Notifications partitioned")
+
 def init_db():
     try:
         # Create engine first
@@ -313,6 +497,10 @@ def init_db():
         # Create all tables based on models if they don't exist
         logger.info("Creating tables if they don't exist...")
         Base.metadata.create_all(bind=engine)
+        if NOTIFICATION_PARTITIONING:
+            partition_notifications(engine)
+        apply_schema_updates(engine)
+        create_indexes_concurrently(engine)
         
         # Log all tables
         logger.info("Existing tables:")
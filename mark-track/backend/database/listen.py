@@ -0,0 +1,85 @@
+import asyncio
+import logging
+from typing import Callable, Optional
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+class PostgresListener:
+    """Keeps one dedicated connection LISTENing on a channel and hands each payload to a callback.
+
+    The connection lives outside the SQLAlchemy pool, so it never competes with
+    request handlers. NOTIFY is not queued for absent listeners: `on_reconnect`
+    runs after every (re)connection so consumers can resynchronise.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str,
+        on_payload: Callable[[str], None],
+        on_reconnect: Optional[Callable[[], None]] = None,
+        reconnect_delay: float = 1.0
+    ):
+        self.dsn = dsn
+        self.channel = channel
+        self.on_payload = on_payload
+        self.on_reconnect = on_reconnect
+        self.reconnect_delay = reconnect_delay
+        self._task: Optional[asyncio.Task] = None
+        self.connected = False
+        self.received = 0
+        self.reconnects = 0
+
+    def _handle(self, connection, pid, channel, payload) -> None:
+        self.received += 1
+        try:
+            self.on_payload(payload)
+        except Exception as e:
+            logger.error(f"Error handling {channel} notification: {str(e)}", exc_info=True)
+
+    async def _run(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                lost = asyncio.get_running_loop().create_future()
+                connection.add_termination_listener(
+                    lambda _: lost.done() or lost.set_result(None)
+                )
+                await connection.add_listener(self.channel, self._handle)
+                self.connected = True
+                if self.on_reconnect:
+                    self.on_reconnect()
+                await lost
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"LISTEN {self.channel} connection failed: {str(e)}")
+            finally:
+                self.connected = False
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            self.reconnects += 1
+            await asyncio.sleep(self.reconnect_delay)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> dict:
+        return {
+            "channel": self.channel,
+            "connected": self.connected,
+            "received": self.received,
+            "reconnects": self.reconnects
+        }
@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import String, delete, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.database_models import Notification, NotificationOutbox, Subject, Teacher
+from utils.metrics import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_OUTBOX_BATCH_SIZE = int(os.getenv("NOTIFICATION_OUTBOX_BATCH_SIZE", "500"))
+# Fallback polling for rows written by other workers; local writes wake the worker directly
+NOTIFICATION_OUTBOX_POLL_INTERVAL = float(os.getenv("NOTIFICATION_OUTBOX_POLL_INTERVAL", "1"))
+
+def outbox_row(
+    student_id: str,
+    teacher_id: str,
+    subject_id: str,
+    value: Optional[float] = None,
+    is_motivated: Optional[bool] = None,
+    description: Optional[str] = None
+) -> dict:
+    return {
+        "student_id": student_id,
+        "teacher_id": teacher_id,
+        "subject_id": subject_id,
+        "value": value,
+        "is_motivated": is_motivated,
+        "description": description,
+        "created_at": datetime.utcnow()
+    }
+
+async def enqueue_notifications(db: AsyncSession, rows: List[dict]) -> None:
+    """Add outbox rows to the caller's transaction; they are delivered only if it commits."""
+    if rows:
+        await db.execute(insert(NotificationOutbox).values(rows))
+
+async def deliver_batch(db: AsyncSession, batch_size: int, denormalise_names: bool = True) -> List[datetime]:
+    """Move up to batch_size outbox rows into notifications in one statement and commit.
+
+    Returns the outbox created_at of each delivered row. SKIP LOCKED lets several
+    workers drain the outbox concurrently without delivering a row twice.
+    """
+    claimed = (
+        delete(NotificationOutbox)
+        .where(NotificationOutbox.id.in_(
+            select(NotificationOutbox.id)
+            .order_by(NotificationOutbox.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ))
+        .returning(*NotificationOutbox.__table__.c)
+        .cte("claimed")
+    )
+    if denormalise_names:
+        names = (Subject.name, Teacher.first_name, Teacher.last_name)
+    else:
+        names = (literal(None, String), literal(None, String), literal(None, String))
+    source = (
+        select(
+            func.gen_random_uuid().cast(String),
+            claimed.c.student_id,
+            claimed.c.teacher_id,
+            claimed.c.subject_id,
+            claimed.c.value,
+            claimed.c.is_motivated,
+            claimed.c.description,
+            claimed.c.created_at,
+            literal(False),
+            claimed.c.created_at,
+            *names
+        )
+        .select_from(claimed)
+        .outerjoin(Subject, Subject.id == claimed.c.subject_id)
+        .outerjoin(Teacher, Teacher.id == claimed.c.teacher_id)
+    )
+    delivered = (await db.scalars(
+        insert(Notification)
+        .from_select(
+            [
+                "id", "student_id", "teacher_id", "subject_id", "value", "is_motivated", "description",
+                "date", "is_read", "created_at", "subject_name", "teacher_first_name", "teacher_last_name"
+            ],
+            source
+        )
+        .returning(Notification.created_at)
+    )).all()
+    await db.commit()
+    return list(delivered)
+
+class NotificationOutboxWorker:
+    """Background task that drains the notification outbox in batches."""
+
+    def __init__(self, session_factory, batch_size: int, poll_interval: float, denormalise_names: bool = True):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.denormalise_names = denormalise_names
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.delivered = Counter()
+        self.batches = Counter()
+        self.errors = Counter()
+        # Time from the mark/absence commit to the notification being visible
+        self.lag_ms = Histogram()
+
+    def notify(self) -> None:
+        """Wake the worker after committing outbox rows, instead of waiting for the next poll."""
+        self._wake.set()
+
+    async def run_once(self) -> int:
+        async with self.session_factory() as db:
+            created = await deliver_batch(db, self.batch_size, self.denormalise_names)
+        if created:
+            now = datetime.utcnow()
+            self.delivered.inc(len(created))
+            self.batches.inc()
+            for created_at in created:
+                self.lag_ms.observe((now - created_at).total_seconds() * 1000)
+        return len(created)
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                delivered = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors.inc()
+                logger.error(f"Error delivering notifications: {str(e)}", exc_info=True)
+                delivered = 0
+            if delivered >= self.batch_size:
+                continue  # more rows are probably waiting
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "batch_size": self.batch_size,
+            "poll_interval_seconds": self.poll_interval,
+            "delivered": self.delivered.value,
+            "batches": self.batches.value,
+            "errors": self.errors.value,
+            "lag_ms": self.lag_ms.snapshot()
+        }
@@ -0,0 +1,77 @@
+import re
+from datetime import date
+from typing import List, Optional
+from sqlalchemy import text
+
+# notifications can be range-partitioned by created_at month (see
+# init_db.partition_notifications); old months are then removed with DROP TABLE
+PARENT = "notifications"
+DEFAULT_PARTITION = f"{PARENT}_default"
+PARTITION_NAME = re.compile(rf"^{PARENT}_(\d{{4}})_(\d{{2}})$")
+
+IS_PARTITIONED_SQL = text(
+    "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table))"
+)
+PARTITIONS_SQL = text("""
+    SELECT c.relname FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    WHERE i.inhparent = to_regclass(:table)
+""")
+
+def month_start(day: date) -> date:
+    return date(day.year, day.month, 1)
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(month: date) -> str:
+    return f"{PARENT}_{month:%Y_%m}"
+
+def partition_month(name: str) -> Optional[date]:
+    """The month a partition covers, or None for the default partition and unrelated tables."""
+    match = PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+def create_partition_sql(month: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {PARENT} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+def months_between(first: date, last: date) -> List[date]:
+    months, month = [], month_start(first)
+    while month <= last:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+def expired_partitions(names: List[str], today: date, retention_months: int) -> List[str]:
+    """Monthly partitions that end before the first month still retained."""
+    keep_from = add_months(month_start(today), -retention_months)
+    return sorted(
+        name for name in names
+        if (month := partition_month(name)) is not None and add_months(month, 1) <= keep_from
+    )
+
+async def maintain_partitions(db, today: date, months_ahead: int, retention_months: int) -> List[str]:
+    """Create the coming months' partitions and drop expired ones; returns the dropped names.
+
+    No-op unless notifications is partitioned. The advisory lock keeps several
+    workers from running the DDL at the same time.
+    """
+    if not await db.scalar(IS_PARTITIONED_SQL, {"table": PARENT}):
+        return []
+    if not await db.scalar(text("SELECT pg_try_advisory_xact_lock(hashtext('notification_partitions'))")):
+        return []
+    current = month_start(today)
+    for month in months_between(current, add_months(current, months_ahead)):
+        await db.execute(text(create_partition_sql(month)))
+    dropped = []
+    if retention_months > 0:
+        names = list((await db.execute(PARTITIONS_SQL, {"table": PARENT})).scalars())
+        dropped = expired_partitions(names, today, retention_months)
+        for name in dropped:
+            await db.execute(text(f"DROP TABLE IF EXISTS {name}"))
+    await db.commit()
+    return dropped
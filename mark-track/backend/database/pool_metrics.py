@@ -0,0 +1,54 @@
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from utils.metrics import Counter, Histogram
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waits."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_wait_ms = Histogram()
+        self.checkout_timeouts = Counter()
+        # Checkouts currently in progress (queued behind a saturated pool, or connecting)
+        self.waiting = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.checkout_timeouts.inc()
+            raise
+        finally:
+            self.waiting -= 1
+            self.checkout_wait_ms.observe((time.perf_counter() - start) * 1000)
+
+    def recreate(self):
+        # Keep the same histogram when the pool is recreated (e.g. on dispose)
+        new_pool = super().recreate()
+        new_pool.checkout_wait_ms = self.checkout_wait_ms
+        new_pool.checkout_timeouts = self.checkout_timeouts
+        return new_pool
+
+def pool_snapshot(pool) -> dict:
+    """Current connection counts and checkout wait statistics for a QueuePool."""
+    snapshot = {
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+    }
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        snapshot["waiting"] = pool.waiting
+        snapshot["checkout_timeouts"] = pool.checkout_timeouts.value
+        snapshot["checkout_wait_ms"] = pool.checkout_wait_ms.snapshot()
+    return snapshot
+
+def pool_saturated(pool, max_waiting: int) -> bool:
+    """True when every connection is checked out and more than max_waiting checkouts are queued."""
+    if pool._max_overflow < 0 or pool.checkedout() < pool.size() + pool._max_overflow:
+        return False
+    return getattr(pool, "waiting", 0) > max_waiting
@@ -5,9 +5,12 @@ import time
 from sqlalchemy import create_engine, MetaData
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from databases import Database
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.sql import text
 from dotenv import load_dotenv
 import psycopg2
+from database.pool_metrics import InstrumentedAsyncQueuePool, pool_snapshot
+from utils.metrics import register_collector
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -23,11 +26,23 @@ DATABASE_NAME = os.getenv("POSTGRES_DB")
 DATABASE_HOST = os.getenv("POSTGRES_HOST", "postgres")
 DATABASE_PORT = os.getenv("POSTGRES_PORT", "5432")
 
+# Connection pool configuration (per worker process)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() in ("1", "true", "yes")
+
 logger.debug(f"Database configuration: USER={DATABASE_USER}, DB={DATABASE_NAME}")
+logger.debug(
+    f"Pool configuration: SIZE={DB_POOL_SIZE}, MAX_OVERFLOW={DB_MAX_OVERFLOW}, "
+    f"TIMEOUT={DB_POOL_TIMEOUT}, RECYCLE={DB_POOL_RECYCLE}, PRE_PING={DB_POOL_PRE_PING}"
+)
 
 # Create database URL
 DATABASE_URL = f"postgresql://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}:{DATABASE_PORT}/{DATABASE_NAME}"
-database = Database(DATABASE_URL)
+ASYNC_DATABASE_URL = f"postgresql+asyncpg://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}:{DATABASE_PORT}/{DATABASE_NAME}"
 
 def wait_for_db(max_retries=30, delay=2):
     """Wait for the database to be ready."""
@@ -53,15 +68,38 @@ def wait_for_db(max_retries=30, delay=2):
             logger.warning(f"Database not ready, waiting {delay} seconds... (attempt {retries}/{max_retries})")
             time.sleep(delay)
 
-# Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL, echo=True)
+POOL_OPTIONS = {
+    "pool_size": DB_POOL_SIZE,
+    "max_overflow": DB_MAX_OVERFLOW,
+    "pool_timeout": DB_POOL_TIMEOUT,
+    "pool_recycle": DB_POOL_RECYCLE,
+    "pool_pre_ping": DB_POOL_PRE_PING,
+}
+
+# Create SQLAlchemy engine (used for startup tasks and scripts)
+engine = create_engine(DATABASE_URL, echo=DB_ECHO, **POOL_OPTIONS)
 metadata = MetaData()
 
+# Create async SQLAlchemy engine (used by the API routers)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=DB_ECHO,
+    poolclass=InstrumentedAsyncQueuePool,
+    **POOL_OPTIONS
+)
+register_collector("db_pool", lambda: pool_snapshot(async_engine.pool))
+
 # Create declarative base
 Base = declarative_base()
 
-# Create session factory
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
 
 def get_db():
     db = SessionLocal()
@@ -70,10 +108,17 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """Yield an AsyncSession that does not block the event loop."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
 async def connect_db():
-    await database.connect()
+    """Open the first async pool connection so the first request does not pay for it."""
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
 
 async def disconnect_db():
-    await database.disconnect()
+    await async_engine.dispose()
 
 
@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.partitions import maintain_partitions
+from models.database_models import Notification
+from utils.metrics import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+# Opt-in: read notifications older than this many days are deleted for good.
+# The default 0 keeps every notification and the sweep deletes nothing
+NOTIFICATION_RETENTION_DAYS = int(os.getenv("NOTIFICATION_RETENTION_DAYS", "0"))
+# Rows per DELETE; each chunk is its own short transaction
+NOTIFICATION_RETENTION_CHUNK_SIZE = int(os.getenv("NOTIFICATION_RETENTION_CHUNK_SIZE", "1000"))
+NOTIFICATION_RETENTION_CHUNK_PAUSE = float(os.getenv("NOTIFICATION_RETENTION_CHUNK_PAUSE", "0.05"))
+NOTIFICATION_RETENTION_INTERVAL = float(os.getenv("NOTIFICATION_RETENTION_INTERVAL", "3600"))
+# Only used when notifications is partitioned by month
+NOTIFICATION_PARTITION_MONTHS_AHEAD = int(os.getenv("NOTIFICATION_PARTITION_MONTHS_AHEAD", "3"))
+# Whole months (read or not) older than this are dropped; 0 keeps every partition
+NOTIFICATION_PARTITION_RETENTION_MONTHS = int(os.getenv("NOTIFICATION_PARTITION_RETENTION_MONTHS", "0"))
+
+async def purge_read_notifications(db: AsyncSession, cutoff: datetime, chunk_size: int) -> int:
+    """Delete up to chunk_size read notifications created before cutoff and commit.
+
+    SKIP LOCKED leaves rows other transactions hold (e.g. a student deleting
+    the same notification) for the next chunk instead of waiting on them.
+    """
+    deleted = (await db.scalars(
+        delete(Notification)
+        .where(Notification.id.in_(
+            select(Notification.id)
+            .where(Notification.is_read == True, Notification.created_at < cutoff)
+            .limit(chunk_size)
+            .with_for_update(skip_locked=True)
+        ))
+        .returning(Notification.id)
+    )).all()
+    await db.commit()
+    return len(deleted)
+
+class NotificationRetentionWorker:
+    """Background task that periodically purges old read notifications in small chunks."""
+
+    def __init__(
+        self,
+        session_factory,
+        retention_days: int,
+        chunk_size: int,
+        interval: float,
+        chunk_pause: float = 0.0,
+        months_ahead: int = 3,
+        partition_retention_months: int = 0
+    ):
+        self.session_factory = session_factory
+        self.retention_days = retention_days
+        self.chunk_size = chunk_size
+        self.interval = interval
+        self.chunk_pause = chunk_pause
+        self.months_ahead = months_ahead
+        self.partition_retention_months = partition_retention_months
+        self._task: Optional[asyncio.Task] = None
+        self.deleted = Counter()
+        self.chunks = Counter()
+        self.sweeps = Counter()
+        self.partitions_dropped = Counter()
+        self.errors = Counter()
+        self.sweep_ms = Histogram()
+
+    async def sweep(self) -> int:
+        started = time.perf_counter()
+        now = datetime.utcnow()
+        total = 0
+        if self.retention_days > 0:
+            cutoff = now - timedelta(days=self.retention_days)
+            while True:
+                async with self.session_factory() as db:
+                    deleted = await purge_read_notifications(db, cutoff, self.chunk_size)
+                total += deleted
+                self.deleted.inc(deleted)
+                self.chunks.inc()
+                if deleted < self.chunk_size:
+                    break
+                # Give other writers room between chunks
+                await asyncio.sleep(self.chunk_pause)
+        async with self.session_factory() as db:
+            dropped = await maintain_partitions(
+                db, now.date(), self.months_ahead, self.partition_retention_months
+            )
+        if dropped:
+            self.partitions_dropped.inc(len(dropped))
+            logger.info(f"Dropped notification partitions: {', '.join(dropped)}")
+        self.sweeps.inc()
+        self.sweep_ms.observe((time.perf_counter() - started) * 1000)
+        return total
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors.inc()
+                logger.error(f"Error purging notifications: {str(e)}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def snapshot(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "retention_days": self.retention_days,
+            "chunk_size": self.chunk_size,
+            "interval_seconds": self.interval,
+            "partition_retention_months": self.partition_retention_months,
+            "deleted": self.deleted.value,
+            "chunks": self.chunks.value,
+            "sweeps": self.sweeps.value,
+            "partitions_dropped": self.partitions_dropped.value,
+            "errors": self.errors.value,
+            "sweep_ms": self.sweep_ms.snapshot()
+        }
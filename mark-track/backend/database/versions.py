@@ -0,0 +1,41 @@
+from datetime import datetime
+from typing import Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.database_models import CacheVersion
+
+SUBJECTS_KEY = "subjects"
+
+def marks_key(student_id: str, subject_id: str) -> str:
+    return f"marks:{student_id}:{subject_id}"
+
+def absences_key(student_id: str, subject_id: str) -> str:
+    return f"absences:{student_id}:{subject_id}"
+
+def teacher_dashboard_key(teacher_id: str) -> str:
+    return f"teacher_dashboard:{teacher_id}"
+
+async def bump_version(db: AsyncSession, *keys: str) -> None:
+    """Increment the version of each key inside the caller's transaction, in one statement.
+
+    Call this before committing the write it describes, so readers never see
+    the new version without the new data.
+    """
+    now = datetime.utcnow()
+    # One multi-row upsert; keys are deduplicated (ON CONFLICT cannot touch a row
+    # twice) and sorted so concurrent writers lock rows in the same order
+    statement = pg_insert(CacheVersion).values([
+        {"key": key, "version": 1, "updated_at": now} for key in sorted(set(keys))
+    ])
+    await db.execute(statement.on_conflict_do_update(
+        index_elements=[CacheVersion.key],
+        set_={"version": CacheVersion.version + 1, "updated_at": now}
+    ))
+
+async def get_version(db: AsyncSession, key: str) -> Tuple[int, Optional[datetime]]:
+    """Current (version, updated_at) of a key; (0, None) if it was never bumped."""
+    row = (await db.execute(
+        select(CacheVersion.version, CacheVersion.updated_at).where(CacheVersion.key == key)
+    )).first()
+    return (row.version, row.updated_at) if row else (0, None)
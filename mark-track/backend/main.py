@@ -1,12 +1,14 @@
 import logging
 import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from database.init_db import init_db
-from database.postgres_setup import wait_for_db
-from routers import auth, roles, profiles, subjects, admin, teacher, student, notifications
+from database.postgres_setup import wait_for_db, connect_db, disconnect_db
+from routers import auth, roles, profiles, subjects, admin, teacher, student, notifications, metrics
 from middleware.rate_limit import limiter
+from middleware.load_shedding import LoadSheddingMiddleware
 from slowapi.middleware import SlowAPIMiddleware
 
 #Logging    
@@ -21,12 +23,32 @@ except Exception as e:
     logger.error(f"Failed to initialize database: {str(e)}")
     raise e
 
+#Async DB pool and background worker lifecycle (mounted apps do not receive lifespan events)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await connect_db()
+    notifications.outbox_worker.start()
+    notifications.notification_listener.start()
+    notifications.retention_worker.start()
+    auth.principal_listener.start()
+    yield
+    await auth.principal_listener.stop()
+    await notifications.retention_worker.stop()
+    await notifications.notification_listener.stop()
+    notifications.notification_broker.close_all()
+    await notifications.outbox_worker.stop()
+    await disconnect_db()
+
 app = FastAPI(
     docs_url=None,  
     redoc_url=None,  
     openapi_url=None,  
+    lifespan=lifespan
 )
 
+# No default_response_class: routes with a response_model are serialized
+# straight to JSON bytes by Pydantic, which a custom default class would
+# disable (see benchmarks/bench_serialization.py)
 api = FastAPI(
     docs_url=None,  
     redoc_url=None,  
@@ -36,6 +58,9 @@ api = FastAPI(
 
 origins = os.getenv("ALLOWED_ORIGINS").split(",")
 
+#Load Shedding Middleware (added first so CORS headers still wrap its 503s)
+api.add_middleware(LoadSheddingMiddleware)
+
 #CORS Middleware
 api.add_middleware(
     CORSMiddleware,
@@ -69,6 +94,7 @@ api.include_router(admin.router, prefix="/admin", tags=["Admin"])
 api.include_router(teacher.router, prefix="/teacher", tags=["Teacher"])
 api.include_router(student.router, prefix="/student", tags=["Student"])
 api.include_router(notifications.router, prefix="/notifications", tags=["Notifications"])
+api.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
 
 #Root Route
 @api.get("/")
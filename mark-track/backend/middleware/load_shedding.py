@@ -0,0 +1,59 @@
+import json
+import logging
+import os
+from database.pool_metrics import pool_saturated
+from database.postgres_setup import async_engine
+from utils.metrics import Counter, register_collector
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Shed once this many checkouts are already queued behind a fully used pool
+DB_SHED_MAX_WAITING = int(os.getenv("DB_SHED_MAX_WAITING", "10"))
+DB_SHED_RETRY_AFTER = os.getenv("DB_SHED_RETRY_AFTER", "2")
+# Paths that never touch the database and must stay reachable under load
+EXEMPT_PATHS = {"/", "/metrics"}
+
+shed_requests = Counter()
+register_collector("load_shedding", lambda: {
+    "max_waiting": DB_SHED_MAX_WAITING,
+    "shed": shed_requests.value
+})
+
+class LoadSheddingMiddleware:
+    """Answer 503 with Retry-After up front while the DB pool is saturated,
+    instead of letting requests time out on connection checkout."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Mounted under /api: newer Starlette keeps the prefix in path and sets root_path
+        path, root_path = scope["path"], scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):] or "/"
+
+        if (
+            path in EXEMPT_PATHS
+            or not pool_saturated(async_engine.pool, DB_SHED_MAX_WAITING)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        shed_requests.inc()
+        logger.warning(f"DB pool saturated, shedding {scope['method']} {scope['path']}")
+        body = json.dumps({"detail": "Server busy, please retry"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", DB_SHED_RETRY_AFTER.encode())
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -1,28 +1,116 @@
 import logging
+import os
+import time
 from fastapi import Request, HTTPException
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from slowapi.middleware import SlowAPIMiddleware
+from utils.jwt_utils import verify_token
+from utils.metrics import Counter, Histogram, register_collector
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Shared counter store, e.g. redis://redis:6379/0. The default memory:// store is
+# per worker process, so with N workers the effective limit is N times higher.
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+# moving-window is an exact sliding window; on Redis each hit is one atomic script call
+RATE_LIMIT_STRATEGY = os.getenv("RATE_LIMIT_STRATEGY", "moving-window")
+
+class InstrumentedLimiter(Limiter):
+    """slowapi Limiter that records how long each limit check takes."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.check_ms = Histogram(buckets=(0.1, 0.5, 1, 2.5, 5, 10, 25, 50, 100))
+        self.checks = Counter()
+        self.rejected = Counter()
+
+    def _check_request_limit(self, *args, **kwargs):
+        start = time.perf_counter()
+        self.checks.inc()
+        try:
+            return super()._check_request_limit(*args, **kwargs)
+        except RateLimitExceeded:
+            self.rejected.inc()
+            raise
+        finally:
+            self.check_ms.observe((time.perf_counter() - start) * 1000)
+
+    def snapshot(self) -> dict:
+        return {
+            "storage": RATE_LIMIT_STORAGE_URI.split("://", 1)[0],
+            "strategy": RATE_LIMIT_STRATEGY,
+            "checks": self.checks.value,
+            "rejected": self.rejected.value,
+            "check_ms": self.check_ms.snapshot()
+        }
+
 def custom_key_func(request: Request):
     return request.headers.get("X-Forwarded-For", request.client.host)
 # Initialize rate limiter
-limiter = Limiter(key_func=custom_key_func)
+limiter = InstrumentedLimiter(
+    key_func=custom_key_func,
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    strategy=RATE_LIMIT_STRATEGY,
+    # Keep serving (with per-worker limits) if the shared store is unreachable
+    in_memory_fallback_enabled=RATE_LIMIT_STORAGE_URI != "memory://"
+)
+register_collector("rate_limiter", limiter.snapshot)
+
+def user_key_func(request: Request):
+    """Key limits by the authenticated user, falling back to the client address."""
+    token = request.cookies.get("access_token")
+    if token:
+        try:
+            email = verify_token(token).get("sub")
+        except HTTPException:
+            email = None
+        if email:
+            return f"user:{email}"
+    return custom_key_func(request)
+
+def admin_classes_cost(request: Request) -> int:
+    # One unit per 50 classes on the requested page
+    try:
+        page_size = int(request.query_params.get("limit", 50))
+    except ValueError:
+        page_size = 50
+    return max(1, -(-page_size // 50))
+
+def class_roster_cost(request: Request) -> int:
+    include_stats = request.query_params.get("include_stats", "true").lower() not in ("0", "false", "no")
+    return 5 if include_stats else 1
+
+def bulk_enrolment_cost(request: Request) -> int:
+    # Roughly one unit per 250 student ids in the body
+    try:
+        body_size = int(request.headers.get("content-length", 0))
+    except ValueError:
+        body_size = 0
+    return 1 + body_size // 10_000
 
 # Create rate limit strings
 LOGIN_RATE_LIMIT = "5/minute"
 REGISTER_RATE_LIMIT = "3/minute"
+# Per-user budgets in cost units for the expensive endpoints
+ADMIN_CLASSES_RATE_LIMIT = "120/minute"
+CLASS_ROSTER_RATE_LIMIT = "300/minute"
+BULK_ENROLMENT_RATE_LIMIT = "60/minute"
 
 # Create rate limit decorators
 login_limit = limiter.limit(LOGIN_RATE_LIMIT)
 register_limit = limiter.limit(REGISTER_RATE_LIMIT)
+admin_classes_limit = limiter.limit(ADMIN_CLASSES_RATE_LIMIT, key_func=user_key_func, cost=admin_classes_cost)
+class_roster_limit = limiter.limit(CLASS_ROSTER_RATE_LIMIT, key_func=user_key_func, cost=class_roster_cost)
+bulk_enrolment_limit = limiter.limit(BULK_ENROLMENT_RATE_LIMIT, key_func=user_key_func, cost=bulk_enrolment_cost)
 
 # Export the limiter and decorators for use in routes
-__all__ = ['limiter', 'login_limit', 'register_limit']
+__all__ = [
+    'limiter', 'login_limit', 'register_limit',
+    'admin_classes_limit', 'class_roster_limit', 'bulk_enrolment_limit'
+]
 
 async def rate_limit_middleware(request: Request, call_next):
     """Middleware to apply rate limiting."""
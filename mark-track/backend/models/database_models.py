@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime, Float, Enum as SAEnum
+from sqlalchemy import false, text, Column, Integer, BigInteger, String, Boolean, ForeignKey, Date, DateTime, Float, Index, Enum as SAEnum
 from sqlalchemy.orm import relationship
 from database.postgres_setup import Base
 from datetime import datetime
@@ -60,6 +60,9 @@ class Class(Base):
 
 class ClassStudent(Base):
     __tablename__ = "class_students"
+    __table_args__ = (
+        Index("ix_class_students_student", "student_id"),
+    )
     
     class_id = Column(String, ForeignKey("classes.id"), primary_key=True)
     student_id = Column(String, ForeignKey("students.student_id"), primary_key=True)
@@ -78,6 +81,9 @@ class Subject(Base):
 
 class ClassSubject(Base):
     __tablename__ = "class_subjects"
+    __table_args__ = (
+        Index("ix_class_subjects_teacher", "teacher_id"),
+    )
     
     class_id = Column(String, ForeignKey("classes.id"), primary_key=True)
     subject_id = Column(String, ForeignKey("subjects.id"), primary_key=True)
@@ -89,6 +95,9 @@ class ClassSubject(Base):
 
 class Mark(Base):
     __tablename__ = "marks"
+    __table_args__ = (
+        Index("ix_marks_student_subject", "student_id", "subject_id"),
+    )
     
     id = Column(String, primary_key=True)
     student_id = Column(String, ForeignKey("students.id"))
@@ -104,6 +113,12 @@ class Mark(Base):
 
 class Absence(Base):
     __tablename__ = "absences"
+    __table_args__ = (
+        Index("ix_absences_student_subject", "student_id", "subject_id"),
+        # One roll-call absence per student, subject and day; NULLs (absences
+        # recorded one by one) never conflict
+        Index("ux_absences_roll_call", "student_id", "subject_id", "roll_call_date", unique=True),
+    )
     
     id = Column(String, primary_key=True)
     student_id = Column(String, ForeignKey("students.id"))
@@ -112,6 +127,8 @@ class Absence(Base):
     is_motivated = Column(Boolean, default=False)
     description = Column(String)
     date = Column(DateTime, default=datetime.utcnow)
+    # Set only for absences written by a roll call
+    roll_call_date = Column(Date, nullable=True)
     
     student = relationship("Student")
     teacher = relationship("Teacher")
@@ -119,6 +136,20 @@ class Absence(Base):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Matches the feed's keyset order (created_at, id)
+        Index("ix_notifications_student_created", "student_id", "created_at", "id"),
+        # Only unread rows, so the unread count stays an index-only scan however long the history
+        Index(
+            "ix_notifications_student_unread", "student_id",
+            postgresql_where=text("is_read = false")
+        ),
+        # Drives the retention purge of old read notifications (database/retention.py)
+        Index(
+            "ix_notifications_read_created", "created_at",
+            postgresql_where=text("is_read = true")
+        ),
+    )
     
     id = Column(String, primary_key=True)
     student_id = Column(String, ForeignKey("students.id"))
@@ -128,12 +159,37 @@ class Notification(Base):
     is_motivated = Column(Boolean, nullable=True)
     description = Column(String)
     date = Column(DateTime, default=datetime.utcnow)
-    is_read = Column(Boolean, default=False)
+    is_read = Column(Boolean, default=False, server_default=false(), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Denormalised at write time so the feed can be read without joins
+    subject_name = Column(String, nullable=True)
+    teacher_first_name = Column(String, nullable=True)
+    teacher_last_name = Column(String, nullable=True)
     student = relationship("Student")
     teacher = relationship("Teacher")
     subject = relationship("Subject")
 
+class NotificationOutbox(Base):
+    """Notifications waiting to be delivered, written in the same transaction as the mark or absence."""
+    __tablename__ = "notification_outbox"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    student_id = Column(String, ForeignKey("students.id"))
+    teacher_id = Column(String, ForeignKey("teachers.id"))
+    subject_id = Column(String, ForeignKey("subjects.id"))
+    value = Column(Float, nullable=True)
+    is_motivated = Column(Boolean, nullable=True)
+    description = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class CacheVersion(Base):
+    """Change counter for cached data, shared by all workers (see database/versions.py)."""
+    __tablename__ = "cache_versions"
+
+    key = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
 class Admin(Base):
     __tablename__ = "admins"
     
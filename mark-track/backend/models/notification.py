@@ -1,4 +1,5 @@
-from typing import Optional
+from datetime import datetime
+from typing import List, Optional
 from pydantic import BaseModel
 
 class MarkNotification(BaseModel):
@@ -21,4 +22,23 @@ class AbsenceNotification(BaseModel):
 class ClassAsignmentNotification(BaseModel):
     pass
 
-    
\ No newline at end of file
+    
+
+class NotificationItem(BaseModel):
+    id: str
+    student_id: str
+    teacher_id: Optional[str] = None
+    subject_id: Optional[str] = None
+    value: Optional[float] = None
+    is_motivated: Optional[bool] = None
+    description: Optional[str] = None
+    date: Optional[datetime] = None
+    is_read: bool = False
+    created_at: Optional[datetime] = None
+    subject_name: Optional[str] = None
+    teacher_first_name: Optional[str] = None
+    teacher_last_name: Optional[str] = None
+
+class NotificationsPage(BaseModel):
+    notifications: List[NotificationItem]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from typing import Optional
+from models.database_models import RegistrationStatus
+
+@dataclass(frozen=True)
+class TeacherPrincipal:
+    id: str
+    subject_id: Optional[str]
+    first_name: Optional[str]
+    last_name: Optional[str]
+
+@dataclass(frozen=True)
+class StudentPrincipal:
+    id: str
+    student_id: Optional[str]
+    first_name: Optional[str]
+    last_name: Optional[str]
+
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user together with their role profile, loaded once per request."""
+    id: str
+    email: str
+    role: str
+    status: Optional[RegistrationStatus]
+    teacher: Optional[TeacherPrincipal] = None
+    student: Optional[StudentPrincipal] = None
+    admin_id: Optional[str] = None
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 
 
 class StudentDetails(BaseModel):
@@ -26,3 +26,13 @@ class StudentRequest(BaseModel):
 
 class AddStudentsToClass(BaseModel):
     student_ids: List[str]
+
+class StudentSummary(BaseModel):
+    id: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    student_id: Optional[str] = None
+
+class StudentsPage(BaseModel):
+    students: List[StudentSummary]
+    next_cursor: Optional[str] = None
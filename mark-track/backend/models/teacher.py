@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, List, Optional
 from datetime import datetime
 
 class TeacherDetails(BaseModel):
@@ -65,13 +65,49 @@ class TeacherClass(BaseModel):
 class TeacherClasses(BaseModel):
     classes: List[TeacherClass]
 
+# Read models: everything but the id is optional because list endpoints
+# accept ?fields=; routes set response_model_exclude_unset so unrequested
+# fields are left out rather than sent as null
+class MarkEntry(BaseModel):
+    id: str
+    value: Optional[float] = None
+    description: Optional[str] = None
+    date: Optional[datetime] = None
+    subject_name: Optional[str] = None
+
+class AbsenceEntry(BaseModel):
+    id: str
+    is_motivated: Optional[bool] = None
+    description: Optional[str] = None
+    date: Optional[datetime] = None
+    subject_name: Optional[str] = None
+
+class MarksPage(BaseModel):
+    marks: List[MarkEntry]
+    next_cursor: Optional[str] = None
+
+class AbsencesPage(BaseModel):
+    absences: List[AbsenceEntry]
+    next_cursor: Optional[str] = None
+
+class TeacherSummary(BaseModel):
+    id: str
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    subject_id: Optional[str] = None
+    email: Optional[str] = None
+
+class TeachersPage(BaseModel):
+    teachers: List[TeacherSummary]
+    next_cursor: Optional[str] = None
+
 class StudentResponse(BaseModel):
     id: str
     student_id: str
-    first_name: str
-    last_name: str
-    marks: Optional[List[Mark]] = None
-    absences: Optional[List[Absence]] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    marks: Optional[List[MarkEntry]] = None
+    absences: Optional[List[AbsenceEntry]] = None
     average_mark: Optional[float] = None
     total_absences: Optional[int] = None
     motivated_absences: Optional[int] = None
@@ -86,3 +122,33 @@ class TeacherProfileRequest(BaseModel):
     gov_number: str
     subject_id: str
     user_id: str
+
+# Write models for the JSON bodies of the bulk endpoints. Strict, so a number
+# where a string belongs is rejected instead of reaching parsing or the
+# database; dates stay strings and are parsed with utils.dates.parse_datetime
+class BulkMarkRow(BaseModel):
+    model_config = ConfigDict(strict=True)
+
+    student_id: str = Field(..., min_length=1)
+    value: float
+    date: Optional[str] = None
+    description: Optional[str] = None
+
+class BulkMarksRequest(BaseModel):
+    model_config = ConfigDict(strict=True)
+
+    subject_id: Optional[str] = None
+    date: Optional[str] = None
+    description: Optional[str] = None
+    # Validated row by row with BulkMarkRow, so one bad row does not reject the batch
+    marks: List[Any] = Field(..., min_length=1)
+
+class RollCallRequest(BaseModel):
+    model_config = ConfigDict(strict=True)
+
+    subject_id: Optional[str] = None
+    date: Optional[str] = None
+    present: Optional[List[str]] = None
+    absent: Optional[List[str]] = None
+    is_motivated: bool = False
+    description: Optional[str] = None
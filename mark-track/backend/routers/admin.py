@@ -1,16 +1,28 @@
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends, Request
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
+from sqlalchemy import select, delete, func, literal, any_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 import uuid
-from typing import List
+from typing import List, Optional
 
-from database.postgres_setup import get_db
+from database.postgres_setup import get_async_db
+from database.versions import SUBJECTS_KEY, bump_version
 from models.database_models import (
     Teacher, Class, Student, Subject as SubjectModel,
     ClassSubject, ClassStudent, User
 )
 from routers.auth import get_current_user
+from routers.subjects import get_subject_catalogue, subject_catalogue
+from middleware.rate_limit import admin_classes_limit, bulk_enrolment_limit
+from models.principal import Principal
+from models.student import StudentsPage
+from models.teacher import TeachersPage
+from utils.pagination import PageParams, keyset_page, next_page
+from utils.projection import Projection
+from utils.sql import string_array
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -18,74 +30,92 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-@router.get("/teachers")
+TEACHER_FIELDS = Projection({
+    "id": Teacher.id,
+    "first_name": Teacher.first_name,
+    "last_name": Teacher.last_name,
+    "subject_id": Teacher.subject_id,
+    "email": User.email
+})
+STUDENT_FIELDS = Projection({
+    "id": Student.id,
+    "first_name": Student.first_name,
+    "last_name": Student.last_name,
+    "student_id": Student.student_id
+})
+
+@router.get("/teachers", response_model=TeachersPage, response_model_exclude_unset=True)
 async def get_all_teachers(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    page: PageParams = Depends(),
+    columns: list = Depends(TEACHER_FIELDS),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'admin':
             raise HTTPException(status_code=403, detail="Only admins can access this endpoint")
 
         teachers = (
-            db.query(Teacher)
-            .join(User)
-            .all()
-        )
+            await db.execute(
+                keyset_page(select(*columns).select_from(Teacher).join(User), [Teacher.id], page)
+            )
+        ).mappings().all()
+        teachers, next_cursor = next_page(teachers, page, lambda row: (row["id"],))
         
-        return {
-            "teachers": [{
-                "id": t.id,
-                "first_name": t.first_name,
-                "last_name": t.last_name,
-                "subject_id": t.subject_id,
-                "email": t.user.email
-            } for t in teachers]
-        }
+        return {"teachers": [dict(row) for row in teachers], "next_cursor": next_cursor}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching teachers: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching teachers: {str(e)}")
 
 @router.get("/classes")
+@admin_classes_limit
 async def get_all_classes(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    class_id: Optional[str] = None,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'admin':
             raise HTTPException(status_code=403, detail="Only admins can access this endpoint")
 
-        classes = db.query(Class).all()
-        result = []
-        
-        for cls in classes:
-            # Get subjects and teachers for this class using ORM
-            class_subjects = (
-                db.query(ClassSubject)
-                .filter(ClassSubject.class_id == cls.id)
-                .all()
-            )
-            
-            # Get students for this class using ORM
-            class_students = (
-                db.query(Student)
-                .join(ClassStudent)
-                .filter(ClassStudent.class_id == cls.id)
-                .all()
+        filters = [Class.id == class_id] if class_id else []
+        total = await db.scalar(select(func.count()).select_from(Class).where(*filters))
+
+        # Subjects (with their teacher) and students are loaded in one query each
+        classes = (
+            await db.scalars(
+                keyset_page(
+                    select(Class)
+                    .where(*filters)
+                    .options(
+                        selectinload(Class.subjects).joinedload(ClassSubject.teacher),
+                        selectinload(Class.students)
+                    ),
+                    [Class.id],
+                    page
+                )
             )
-            
-            class_data = {
-                "id": cls.id,
-                "name": cls.name,
-                "subjects": [{
-                    "subject_id": cs.subject_id,
-                    "teacher_id": cs.teacher_id
-                } for cs in class_subjects],
-                "students": [student.student_id for student in class_students]
-            }
-            result.append(class_data)
-            
-        return {"classes": result}
+        ).all()
+        classes, next_cursor = next_page(classes, page, lambda cls: (cls.id,))
+
+        result = [{
+            "id": cls.id,
+            "name": cls.name,
+            "subjects": [{
+                "subject_id": cs.subject_id,
+                "teacher_id": cs.teacher_id,
+                "teacher_name": f"{cs.teacher.first_name} {cs.teacher.last_name}" if cs.teacher else None
+            } for cs in cls.subjects],
+            "students": [cs.student_id for cs in cls.students]
+        } for cls in classes]
+
+        return {"classes": result, "total": total, "limit": page.limit, "next_cursor": next_cursor}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching classes: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching classes: {str(e)}")
@@ -93,8 +123,8 @@ async def get_all_classes(
 @router.post("/classes")
 async def create_class(
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'admin':
@@ -103,7 +133,7 @@ async def create_class(
         data = await request.json()
         class_id = data.get('class_id')
         
-        existing_class = db.query(Class).filter(Class.id == class_id).first()
+        existing_class = await db.scalar(select(Class).where(Class.id == class_id))
         if existing_class:
             raise HTTPException(status_code=400, detail="Class already exists.")
 
@@ -113,20 +143,20 @@ async def create_class(
             created_at=datetime.utcnow()
         )
         db.add(new_class)
-        db.commit()
+        await db.commit()
         
         return {"message": "Class created successfully."}
     except Exception as e:
         logger.error(f"Error creating class: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error creating class: {str(e)}")
 
 @router.post("/classes/{class_id}/students")
 async def add_student_to_class(
     class_id: str,
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'admin':
@@ -135,21 +165,20 @@ async def add_student_to_class(
         data = await request.json()
         student_id = data.get('student_id')
         
-        class_exists = db.query(Class).filter(Class.id == class_id).first()
+        class_exists = await db.scalar(select(Class).where(Class.id == class_id))
         if not class_exists:
             raise HTTPException(status_code=404, detail="Class not found.")
 
-        student_exists = db.query(Student).filter(Student.id == student_id).first()
+        student_exists = await db.scalar(select(Student).where(Student.id == student_id))
         if not student_exists:
             raise HTTPException(status_code=404, detail="Student not found.")
 
-        existing_assignment = (
-            db.query(ClassStudent)
-            .filter(
+        existing_assignment = await db.scalar(
+            select(ClassStudent)
+            .where(
                 ClassStudent.class_id == class_id,
                 ClassStudent.student_id == student_id
             )
-            .first()
         )
         
         if existing_assignment:
@@ -160,20 +189,20 @@ async def add_student_to_class(
             student_id=student_id
         )
         db.add(new_assignment)
-        db.commit()
+        await db.commit()
         
         return {"message": "Student added to class successfully"}
     except Exception as e:
         logger.error(f"Error adding student to class: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error adding student to class: {str(e)}")
 
 @router.post("/classes/{class_id}/subjects")
 async def add_subject_to_class(
     class_id: str,
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'admin':
@@ -183,28 +212,27 @@ async def add_subject_to_class(
         subject_id = data.get('subject_id')
         teacher_id = data.get('teacher_id')
         
-        class_exists = db.query(Class).filter(Class.id == class_id).first()
+        class_exists = await db.scalar(select(Class).where(Class.id == class_id))
         if not class_exists:
             raise HTTPException(status_code=404, detail="Class not found.")
 
-        subject_exists = db.query(SubjectModel).filter(SubjectModel.id == subject_id).first()
+        subject_exists = await db.scalar(select(SubjectModel).where(SubjectModel.id == subject_id))
         if not subject_exists:
             raise HTTPException(status_code=404, detail="Subject not found.")
 
-        teacher_exists = db.query(Teacher).filter(Teacher.id == teacher_id).first()
+        teacher_exists = await db.scalar(select(Teacher).where(Teacher.id == teacher_id))
         if not teacher_exists:
             raise HTTPException(status_code=404, detail="Teacher not found.")
 
         if teacher_exists.subject_id != subject_id:
             raise HTTPException(status_code=400, detail="Teacher is not assigned to this subject.")
 
-        existing_assignment = (
-            db.query(ClassSubject)
-            .filter(
+        existing_assignment = await db.scalar(
+            select(ClassSubject)
+            .where(
                 ClassSubject.class_id == class_id,
                 ClassSubject.subject_id == subject_id
             )
-            .first()
         )
         
         if existing_assignment:
@@ -219,18 +247,18 @@ async def add_subject_to_class(
             db.add(new_assignment)
             message = "Subject added to class and teacher assigned"
 
-        db.commit()
+        await db.commit()
         return {"message": message}
     except Exception as e:
         logger.error(f"Error adding subject to class: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error adding subject to class: {str(e)}")
 
 @router.post("/subjects")
 async def create_subject(
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'admin':
@@ -239,7 +267,7 @@ async def create_subject(
         data = await request.json()
         subject_name = data.get('subject_name')
         
-        existing_subject = db.query(SubjectModel).filter(SubjectModel.name == subject_name).first()
+        existing_subject = await db.scalar(select(SubjectModel).where(SubjectModel.name == subject_name))
         if existing_subject:
             raise HTTPException(status_code=400, detail="Subject with this name already exists")
 
@@ -249,7 +277,9 @@ async def create_subject(
             created_at=datetime.utcnow()
         )
         db.add(new_subject)
-        db.commit()
+        await bump_version(db, SUBJECTS_KEY)
+        await db.commit()
+        subject_catalogue.invalidate()
         
         return {
             "id": new_subject.id,
@@ -258,50 +288,53 @@ async def create_subject(
         }
     except Exception as e:
         logger.error(f"Error creating subject: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error creating subject: {str(e)}")
 
 @router.get("/subjects")
 async def get_all_subjects(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'admin':
             raise HTTPException(status_code=403, detail="Only admins can access this endpoint")
 
-        subjects = db.query(SubjectModel).all()
-        return {"subjects": [{"id": s.id, "name": s.name} for s in subjects]}
+        subjects, not_modified = await get_subject_catalogue(request, response, db)
+        return not_modified or {"subjects": subjects}
     except Exception as e:
         logger.error(f"Error fetching subjects: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching subjects: {str(e)}")
     
-@router.get("/students")
+@router.get("/students", response_model=StudentsPage, response_model_exclude_unset=True)
 async def get_all_students(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    page: PageParams = Depends(),
+    columns: list = Depends(STUDENT_FIELDS),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'admin':
             raise HTTPException(status_code=403, detail="Only admins can access this endpoint")
 
-        students = db.query(Student).all()
-        return {"students": [{
-            "id": s.id,
-            "first_name": s.first_name,
-            "last_name": s.last_name,
-            "student_id": s.student_id
-        } for s in students]}
+        students = (await db.execute(keyset_page(select(*columns), [Student.id], page))).mappings().all()
+        students, next_cursor = next_page(students, page, lambda row: (row["id"],))
+        return {"students": [dict(row) for row in students], "next_cursor": next_cursor}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching students: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching students: {str(e)}")
 
 @router.post("/classes/{class_id}/students/bulk")
+@bulk_enrolment_limit
 async def add_students_to_class(
     class_id: str,
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'admin':
@@ -310,16 +343,22 @@ async def add_students_to_class(
         data = await request.json()
         student_ids = data.get('student_ids', [])
         
-        class_exists = db.query(Class).filter(Class.id == class_id).first()
+        class_exists = await db.scalar(select(Class).where(Class.id == class_id))
         if not class_exists:
             raise HTTPException(status_code=404, detail="Class not found.")
 
+        # Deduplicate while keeping the request order for error messages
+        student_ids = list(dict.fromkeys(student_ids))
+        ids_param = string_array(student_ids)
+
         # Check if all students exist
-        non_existent_students = []
-        for student_id in student_ids:
-            student = db.query(Student).filter(Student.student_id == student_id).first()
-            if not student:
-                non_existent_students.append(student_id)
+        existing_ids = set((
+            await db.scalars(
+                select(Student.student_id)
+                .where(Student.student_id == any_(ids_param))
+            )
+        ).all())
+        non_existent_students = [sid for sid in student_ids if sid not in existing_ids]
 
         if non_existent_students:
             raise HTTPException(
@@ -327,26 +366,24 @@ async def add_students_to_class(
                 detail=f"Students not found: {', '.join(non_existent_students)}"
             )
 
-        students_with_classes = []
-        for student_id in student_ids:
-            # Check if student is already in another class
-            existing_class = (
-                db.query(Class)
-                .join(ClassStudent)
-                .filter(ClassStudent.student_id == student_id)
-                .first()
-            )
-            
-            if existing_class and existing_class.name != class_id:
-                student = db.query(Student).filter(Student.student_id == student_id).first()
-                students_with_classes.append(f"{student.first_name} {student.last_name} ({student_id})")
-            else:
-                # Add student to class
-                new_assignment = ClassStudent(
-                    class_id=class_id,
-                    student_id=student_id
+        # Check if any student is already in another class
+        enrolled_elsewhere = {
+            row.student_id: row
+            for row in (
+                await db.execute(
+                    select(ClassStudent.student_id, Student.first_name, Student.last_name)
+                    .join(Student)
+                    .where(
+                        ClassStudent.student_id == any_(ids_param),
+                        ClassStudent.class_id != class_id
+                    )
                 )
-                db.add(new_assignment)
+            ).all()
+        }
+        students_with_classes = [
+            f"{enrolled_elsewhere[sid].first_name} {enrolled_elsewhere[sid].last_name} ({sid})"
+            for sid in student_ids if sid in enrolled_elsewhere
+        ]
 
         if students_with_classes:
             raise HTTPException(
@@ -354,123 +391,134 @@ async def add_students_to_class(
                 detail=f"Students already in other classes: {', '.join(students_with_classes)}"
             )
 
-        db.commit()
+        # Add all students in one statement; ones already in this class are skipped
+        if student_ids:
+            await db.execute(
+                pg_insert(ClassStudent)
+                .from_select(
+                    ["class_id", "student_id"],
+                    select(literal(class_id), func.unnest(ids_param))
+                )
+                .on_conflict_do_nothing()
+            )
+
+        await db.commit()
         return {"message": "Students added to class successfully"}
     except HTTPException as he:
-        db.rollback()
+        await db.rollback()
         raise he
     except Exception as e:
         logger.error(f"Error adding students to class: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error adding students to class: {str(e)}")
 
 @router.delete("/subjects/{subject_id}")
 async def delete_subject(
     subject_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'admin':
             raise HTTPException(status_code=403, detail="Only admins can access this endpoint")
 
-        subject = db.query(SubjectModel).filter(SubjectModel.id == subject_id).first()
+        subject = await db.scalar(select(SubjectModel).where(SubjectModel.id == subject_id))
         if not subject:
             raise HTTPException(status_code=404, detail="Subject not found")
 
-        db.delete(subject)
-        db.commit()
+        await db.delete(subject)
+        await bump_version(db, SUBJECTS_KEY)
+        await db.commit()
+        subject_catalogue.invalidate()
         return {"message": "Subject deleted successfully"}
     except Exception as e:
         logger.error(f"Error deleting subject: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error deleting subject: {str(e)}")
 
 @router.delete("/classes/{class_id}")
 async def delete_class(
     class_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'admin':
             raise HTTPException(status_code=403, detail="Only admins can access this endpoint")
 
-        class_ = db.query(Class).filter(Class.id == class_id).first()
+        class_ = await db.scalar(select(Class).where(Class.id == class_id))
         if not class_:
             raise HTTPException(status_code=404, detail="Class not found")
 
         # Delete related records first
-        db.query(ClassStudent).filter(ClassStudent.class_id == class_id).delete()
-        db.query(ClassSubject).filter(ClassSubject.class_id == class_id).delete()
+        await db.execute(delete(ClassStudent).where(ClassStudent.class_id == class_id))
+        await db.execute(delete(ClassSubject).where(ClassSubject.class_id == class_id))
         
         # Now delete the class
-        db.delete(class_)
-        db.commit()
+        await db.delete(class_)
+        await db.commit()
         return {"message": "Class deleted successfully"}
     except Exception as e:
         logger.error(f"Error deleting class: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error deleting class: {str(e)}")
 
 @router.delete("/classes/{class_id}/students/{student_id}")
 async def remove_student_from_class(
     class_id: str,
     student_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'admin':
             raise HTTPException(status_code=403, detail="Only admins can access this endpoint")
 
-        class_student = (
-            db.query(ClassStudent)
-            .filter(
+        class_student = await db.scalar(
+            select(ClassStudent)
+            .where(
                 ClassStudent.class_id == class_id,
                 ClassStudent.student_id == student_id
             )
-            .first()
         )
         
         if not class_student:
             raise HTTPException(status_code=404, detail="Student not found in class")
 
-        db.delete(class_student)
-        db.commit()
+        await db.delete(class_student)
+        await db.commit()
         return {"message": "Student removed from class successfully"}
     except Exception as e:
         logger.error(f"Error removing student from class: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error removing student from class: {str(e)}")
 
 @router.delete("/classes/{class_id}/subjects/{subject_id}")
 async def remove_subject_from_class(
     class_id: str,
     subject_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'admin':
             raise HTTPException(status_code=403, detail="Only admins can access this endpoint")
 
-        class_subject = (
-            db.query(ClassSubject)
-            .filter(
+        class_subject = await db.scalar(
+            select(ClassSubject)
+            .where(
                 ClassSubject.class_id == class_id,
                 ClassSubject.subject_id == subject_id
             )
-            .first()
         )
         
         if not class_subject:
             raise HTTPException(status_code=404, detail="Subject not found in class")
 
-        db.delete(class_subject)
-        db.commit()
+        await db.delete(class_subject)
+        await db.commit()
         return {"message": "Subject removed from class successfully"}
     except Exception as e:
         logger.error(f"Error removing subject from class: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error removing subject from class: {str(e)}")
@@ -1,16 +1,24 @@
 from datetime import datetime, timedelta
 from fastapi import APIRouter, HTTPException, Depends, Request, status, Response
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from database.postgres_setup import get_db
-from models.database_models import User
-from models.auth import UserCreate, Token, UserResponse
-from utils.security import verify_password, get_password_hash
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.postgres_setup import DATABASE_URL, get_async_db
+from database.listen import PostgresListener
+from models.database_models import User, Teacher, Student, Admin
+from models.principal import Principal, TeacherPrincipal, StudentPrincipal
+from models.auth import UserCreate, Token, UserResponse, UserListResponse
+from utils.security import verify_password_async, get_password_hash_async, PasswordHasherBusy
 from utils.jwt_utils import create_access_token, verify_token, ACCESS_TOKEN_EXPIRE_MINUTES
+from utils.cache import TTLCache
+from utils.metrics import register_collector
+from utils.pagination import PageParams, keyset_page, next_page
 from middleware.rate_limit import login_limit, register_limit
+import os
+import time
 import uuid
 import logging
-from typing import List
+from typing import Optional
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -19,10 +27,40 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# Per-worker caches for decoded tokens and resolved principals
+PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "30"))
+token_cache = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL)
+principal_cache = TTLCache(maxsize=PRINCIPAL_CACHE_SIZE, ttl=PRINCIPAL_CACHE_TTL)
+register_collector("token_cache", token_cache.snapshot)
+register_collector("principal_cache", principal_cache.snapshot)
+
+# Every worker LISTENs here and drops the named user's cached principal; a
+# reconnect may have missed some, so the whole cache is dropped then
+PRINCIPAL_CHANNEL = "principal_invalidations"
+principal_listener = PostgresListener(
+    DATABASE_URL,
+    PRINCIPAL_CHANNEL,
+    principal_cache.pop,
+    on_reconnect=principal_cache.clear
+)
+register_collector("principal_listener", principal_listener.snapshot)
+
+async def invalidate_principal(db: AsyncSession, email: str) -> None:
+    """Invalidate the user's cached principal on every worker.
+
+    Call this before committing the role, status or profile change it describes:
+    NOTIFY is delivered on commit, so no worker drops its entry before the
+    change is visible. PRINCIPAL_CACHE_TTL bounds staleness if a worker misses it.
+    """
+    await db.execute(select(func.pg_notify(PRINCIPAL_CHANNEL, email)))
+    principal_cache.pop(email)
+
 async def get_current_user(
     request: Request,
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """Resolve the JWT cookie to a Principal with the user's teacher/student/admin profile."""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -32,17 +70,68 @@ async def get_current_user(
     token = request.cookies.get("access_token")
     if not token:
         raise credentials_exception
-    try:
-        payload = verify_token(token)
-        email: str = payload.get("sub")
-        if email is None:
+    payload = token_cache.get(token)
+    if payload is None:
+        try:
+            payload = verify_token(token)
+        except Exception:
             raise credentials_exception
-    except Exception:
+        # Never keep a payload past the token's own expiry
+        token_cache.set(token, payload, ttl=payload.get("exp", 0) - time.time())
+    email: str = payload.get("sub")
+    if email is None:
         raise credentials_exception
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise credentials_exception
-    return user
+
+    principal = principal_cache.get(email)
+    if principal is None:
+        principal = await load_principal(db, email)
+        if principal is None:
+            raise credentials_exception
+        principal_cache.set(email, principal)
+    return principal
+
+async def load_principal(db: AsyncSession, email: str) -> Optional[Principal]:
+    """Load a user and their role profile in a single query."""
+    row = (
+        await db.execute(
+            select(
+                User.id, User.email, User.role, User.status,
+                Teacher.id.label("teacher_id"), Teacher.subject_id,
+                Teacher.first_name.label("teacher_first_name"),
+                Teacher.last_name.label("teacher_last_name"),
+                Student.id.label("student_pk"), Student.student_id,
+                Student.first_name.label("student_first_name"),
+                Student.last_name.label("student_last_name"),
+                Admin.id.label("admin_id")
+            )
+            .outerjoin(Teacher, Teacher.user_id == User.id)
+            .outerjoin(Student, Student.user_id == User.id)
+            .outerjoin(Admin, Admin.user_id == User.id)
+            .where(User.email == email)
+            .limit(1)
+        )
+    ).first()
+    if row is None:
+        return None
+    return Principal(
+        id=row.id,
+        email=row.email,
+        role=row.role,
+        status=row.status,
+        teacher=TeacherPrincipal(
+            id=row.teacher_id,
+            subject_id=row.subject_id,
+            first_name=row.teacher_first_name,
+            last_name=row.teacher_last_name
+        ) if row.teacher_id else None,
+        student=StudentPrincipal(
+            id=row.student_pk,
+            student_id=row.student_id,
+            first_name=row.student_first_name,
+            last_name=row.student_last_name
+        ) if row.student_pk else None,
+        admin_id=row.admin_id
+    )
 
 @router.post("/login", response_model=Token)
 @login_limit
@@ -50,14 +139,14 @@ async def login(
     request: Request,
     response: Response,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Login endpoint with rate limiting."""
     try:
         # Use parameterized query
-        user = db.query(User).filter(User.email == form_data.username).first()
+        user = await db.scalar(select(User).where(User.email == form_data.username))
         
-        if not user or not verify_password(form_data.password, user.password):
+        if not user or not await verify_password_async(form_data.password, user.password):
             logger.warning(f"Login failed: Invalid credentials for email {form_data.username}")
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -95,6 +184,13 @@ async def login(
             "role": user.role
         }
         
+    except PasswordHasherBusy:
+        logger.warning("Password hashing pool is saturated, shedding login request")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, please retry",
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
         logger.error(f"Login error: {str(e)}")
         raise HTTPException(
@@ -108,12 +204,12 @@ async def register_user(
     request: Request,
     user_data: UserCreate,
     response: Response,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Register new user and return JWT."""
     try:
         # Check if user exists
-        existing_user = db.query(User).filter(User.email == user_data.email).first()
+        existing_user = await db.scalar(select(User).where(User.email == user_data.email))
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -121,7 +217,7 @@ async def register_user(
             )
 
         # Create new user with hashed password
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await get_password_hash_async(user_data.password)
         new_user = User(
             id=str(uuid.uuid4()),
             email=user_data.email,
@@ -130,8 +226,8 @@ async def register_user(
             created_at=datetime.utcnow()
         )
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
+        await db.refresh(new_user)
 
         # Create JWT
         access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -152,34 +248,43 @@ async def register_user(
         )
         logger.info(f"Successfully created user: {user_data.email}")
         return {"access_token": access_token, "token_type": "bearer"}
+    except PasswordHasherBusy:
+        logger.warning("Password hashing pool is saturated, shedding register request")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server busy, please retry",
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
         logger.error(f"Error creating user: {str(e)}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="An error occurred during registration"
         )
 
-@router.get("/users", response_model=List[UserResponse])
+@router.get("/users", response_model=UserListResponse)
 async def get_all_users(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    page: PageParams = Depends(),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get all users (admin only)."""
+    """Get one page of users (admin only)."""
     if current_user.role != "admin":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to access this resource"
         )
     
-    users = db.query(User).all()
-    return users
+    users = (await db.scalars(keyset_page(select(User), [User.id], page))).all()
+    users, next_cursor = next_page(users, page, lambda user: (user.id,))
+    return {"users": users, "next_cursor": next_cursor}
 
 @router.get("/user/{uid}", response_model=UserResponse)
 async def get_user_by_id(
     uid: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user by ID."""
     # Users can only access their own data unless they're admin
@@ -189,7 +294,7 @@ async def get_user_by_id(
             detail="Not authorized to access this resource"
         )
     
-    user = db.query(User).filter(User.id == uid).first()
+    user = await db.scalar(select(User).where(User.id == uid))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -200,7 +305,7 @@ async def get_user_by_id(
 
 @router.get("/verify-token")
 async def verify_token_endpoint(
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Verify the current user's token and return user information."""
     return {
@@ -0,0 +1,19 @@
+from fastapi import APIRouter, HTTPException, Depends
+import logging
+
+from routers.auth import get_current_user
+from models.principal import Principal
+from utils.metrics import collect
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG)
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.get("")
+async def get_metrics(current_user: Principal = Depends(get_current_user)):
+    """Internal runtime metrics (connection pool, caches, limiters) for this worker."""
+    if current_user.role != 'admin':
+        raise HTTPException(status_code=403, detail="Only admins can access this endpoint")
+    return collect()
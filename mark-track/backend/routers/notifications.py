@@ -1,13 +1,33 @@
-from fastapi import APIRouter, HTTPException, Depends, Request
-from sqlalchemy.orm import Session
-from typing import List
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends, Request, Header
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, update, delete, func, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from datetime import datetime, timezone
+import asyncio
+import json
+import orjson
+import os
 import uuid
 import logging
 
-from database.postgres_setup import get_db
-from models.database_models import Subject, Teacher, User, Student, Notification as NotificationModel
+from database.postgres_setup import AsyncSessionLocal, DATABASE_URL, get_async_db
+from database.listen import PostgresListener
+from database.retention import (
+    NOTIFICATION_RETENTION_DAYS, NOTIFICATION_RETENTION_CHUNK_SIZE, NOTIFICATION_RETENTION_CHUNK_PAUSE,
+    NOTIFICATION_RETENTION_INTERVAL, NOTIFICATION_PARTITION_MONTHS_AHEAD,
+    NOTIFICATION_PARTITION_RETENTION_MONTHS, NotificationRetentionWorker
+)
+from database.outbox import (
+    NOTIFICATION_OUTBOX_BATCH_SIZE, NOTIFICATION_OUTBOX_POLL_INTERVAL, NotificationOutboxWorker
+)
+from models.database_models import Subject, Teacher, Student, Notification as NotificationModel
 from routers.auth import get_current_user
+from models.principal import Principal
+from models.notification import NotificationsPage
+from utils.pagination import PageParams, after_key, encode_cursor, decode_cursor, keyset_page, next_page
+from utils.metrics import register_collector
+from utils.pubsub import Broker, BrokerFull
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -15,38 +35,391 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-@router.get("")
-async def get_notifications(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+# Store subject and teacher names on the notification row when it is written,
+# so the feed is read without joining subjects and teachers
+DENORMALISED_NAMES = os.getenv("NOTIFICATION_DENORMALISED_NAMES", "true").lower() in ("1", "true", "yes")
+
+# Delivers notifications queued by mark and absence writes (started from main.py's lifespan)
+outbox_worker = NotificationOutboxWorker(
+    AsyncSessionLocal,
+    batch_size=NOTIFICATION_OUTBOX_BATCH_SIZE,
+    poll_interval=NOTIFICATION_OUTBOX_POLL_INTERVAL,
+    denormalise_names=DENORMALISED_NAMES
+)
+register_collector("notification_outbox", outbox_worker.snapshot)
+
+# Purges old read notifications and maintains monthly partitions (started from main.py's lifespan)
+retention_worker = NotificationRetentionWorker(
+    AsyncSessionLocal,
+    retention_days=NOTIFICATION_RETENTION_DAYS,
+    chunk_size=NOTIFICATION_RETENTION_CHUNK_SIZE,
+    interval=NOTIFICATION_RETENTION_INTERVAL,
+    chunk_pause=NOTIFICATION_RETENTION_CHUNK_PAUSE,
+    months_ahead=NOTIFICATION_PARTITION_MONTHS_AHEAD,
+    partition_retention_months=NOTIFICATION_PARTITION_RETENTION_MONTHS
+)
+register_collector("notification_retention", retention_worker.snapshot)
+
+# Live notification stream: each worker keeps one LISTEN connection and fans
+# new rows out to its own SSE clients. A client that falls SSE_QUEUE_SIZE
+# events behind is disconnected and catches up from Last-Event-ID.
+NOTIFICATION_CHANNEL = "notifications"
+SSE_MAX_CONNECTIONS = int(os.getenv("SSE_MAX_CONNECTIONS", "1000"))
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", "100"))
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+SSE_RETRY_MS = int(os.getenv("SSE_RETRY_MS", "3000"))
+SSE_CATCH_UP_LIMIT = int(os.getenv("SSE_CATCH_UP_LIMIT", "200"))
+
+# Upper bound on the id list accepted by the bulk read/delete endpoints
+NOTIFICATION_BULK_MAX_IDS = int(os.getenv("NOTIFICATION_BULK_MAX_IDS", "1000"))
+
+notification_broker = Broker(SSE_MAX_CONNECTIONS, SSE_QUEUE_SIZE)
+register_collector("notification_stream", notification_broker.snapshot)
+
+def stored_or_looked_up(stored, looked_up, key):
+    """`stored`, or `looked_up` for the row matching `key` when it is NULL.
+
+    COALESCE stops at the first non-NULL argument, so the lookup only runs for
+    rows written before the names were stored or while storing was turned off.
+    """
+    return func.coalesce(
+        stored,
+        select(looked_up).where(looked_up.class_.id == key).scalar_subquery()
+    ).label(stored.key)
+
+def notification_query():
+    """Select the notification feed columns, joining names only when they are not stored on the row."""
+    columns = [
+        NotificationModel.id, NotificationModel.student_id, NotificationModel.teacher_id,
+        NotificationModel.subject_id, NotificationModel.value, NotificationModel.is_motivated,
+        NotificationModel.description, NotificationModel.date, NotificationModel.is_read,
+        NotificationModel.created_at
+    ]
+    if DENORMALISED_NAMES:
+        return select(
+            *columns,
+            stored_or_looked_up(NotificationModel.subject_name, Subject.name, NotificationModel.subject_id),
+            stored_or_looked_up(NotificationModel.teacher_first_name, Teacher.first_name, NotificationModel.teacher_id),
+            stored_or_looked_up(NotificationModel.teacher_last_name, Teacher.last_name, NotificationModel.teacher_id)
+        )
+    return (
+        select(
+            *columns,
+            Subject.name.label("subject_name"),
+            Teacher.first_name.label("teacher_first_name"),
+            Teacher.last_name.label("teacher_last_name")
+        )
+        .outerjoin(Subject, NotificationModel.subject_id == Subject.id)
+        .outerjoin(Teacher, NotificationModel.teacher_id == Teacher.id)
+    )
+
+def serialize_notification(row) -> dict:
+    """Build the API payload for one projected notification row."""
+    return {
+        "id": row.id,
+        "student_id": row.student_id,
+        "teacher_id": row.teacher_id,
+        "subject_id": row.subject_id,
+        "value": row.value,
+        "is_motivated": row.is_motivated,
+        "description": row.description,
+        "date": row.date,
+        "is_read": row.is_read,
+        "created_at": row.created_at,
+        "subject_name": row.subject_name,
+        "teacher_first_name": row.teacher_first_name,
+        "teacher_last_name": row.teacher_last_name
+    }
+
+def format_event(row) -> str:
+    """Encode one notification as an SSE event, once, for every subscriber it is sent to."""
+    event_id = encode_cursor(row.created_at, row.id)
+    data = orjson.dumps(serialize_notification(row)).decode()
+    return f"id: {event_id}\nevent: notification\ndata: {data}\n\n"
+
+# Tells the client it missed more than the catch-up limit and should reload the feed
+RESET_EVENT = "event: reset\ndata: {}\n\n"
+
+class NotificationFanout:
+    """Turns NOTIFY payloads into SSE events for the students subscribed to this worker.
+
+    Ids that arrive together (e.g. one outbox batch) are loaded with a single
+    query, and notifications for students without a local subscriber are
+    never read at all.
+    """
+
+    def __init__(self, broker: Broker, session_factory):
+        self.broker = broker
+        self.session_factory = session_factory
+        self._pending: List[str] = []
+        self._task: Optional[asyncio.Task] = None
+        self.loaded = 0
+        self.skipped = 0
+
+    def on_payload(self, payload: str) -> None:
+        message = json.loads(payload)
+        if not self.broker.has_subscribers(message["student_id"]):
+            self.skipped += 1
+            return
+        self._pending.append(message["id"])
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush())
+
+    async def _flush(self) -> None:
+        while self._pending:
+            ids, self._pending = self._pending, []
+            try:
+                async with self.session_factory() as db:
+                    rows = (
+                        await db.execute(
+                            notification_query()
+                            .where(NotificationModel.id.in_(ids))
+                            .order_by(NotificationModel.created_at, NotificationModel.id)
+                        )
+                    ).all()
+            except Exception as e:
+                logger.error(f"Error loading streamed notifications: {str(e)}", exc_info=True)
+                # Subscribers would otherwise silently miss these rows
+                self.broker.close_all()
+                continue
+            self.loaded += len(rows)
+            for row in rows:
+                self.broker.publish(row.student_id, format_event(row))
+
+    def snapshot(self) -> dict:
+        return {"pending": len(self._pending), "loaded": self.loaded, "skipped": self.skipped}
+
+notification_fanout = NotificationFanout(notification_broker, AsyncSessionLocal)
+register_collector("notification_fanout", notification_fanout.snapshot)
+
+# Started from main.py's lifespan; NOTIFY is not replayed, so every reconnect
+# drops the open streams and lets clients catch up from Last-Event-ID
+notification_listener = PostgresListener(
+    DATABASE_URL,
+    NOTIFICATION_CHANNEL,
+    notification_fanout.on_payload,
+    on_reconnect=notification_broker.close_all
+)
+register_collector("notification_listener", notification_listener.snapshot)
+
+async def event_stream(request: Request, subscription, backlog: List[str]):
+    try:
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        for event in backlog:
+            yield event
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), SSE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                # Comment line keeps proxies from timing out an idle stream
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                break
+            yield event
+    finally:
+        notification_broker.unsubscribe(subscription)
+
+@router.get("/stream")
+async def stream_notifications(
+    request: Request,
+    last_event_id: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    student = current_user.student
+    if not student:
+        raise HTTPException(status_code=404, detail="Student not found")
+
+    try:
+        subscription = notification_broker.subscribe(student.id)
+    except BrokerFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many open notification streams",
+            headers={"Retry-After": str(SSE_RETRY_MS // 1000 or 1)}
+        )
+
+    try:
+        # Subscribed first, so nothing written during the catch-up query is lost;
+        # the client drops any event it already has by id
+        backlog = []
+        if last_event_id:
+            try:
+                created_at, notification_id = decode_cursor(last_event_id)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid Last-Event-ID")
+            rows = (
+                await db.execute(
+                    notification_query()
+                    .where(
+                        NotificationModel.student_id == student.id,
+                        after_key([NotificationModel.created_at, NotificationModel.id], [created_at, notification_id])
+                    )
+                    .order_by(NotificationModel.created_at, NotificationModel.id)
+                    .limit(SSE_CATCH_UP_LIMIT + 1)
+                )
+            ).all()
+            if len(rows) > SSE_CATCH_UP_LIMIT:
+                backlog = [RESET_EVENT]
+            else:
+                backlog = [format_event(row) for row in rows]
+        # Release the pooled connection; the stream itself never touches the database
+        await db.close()
+    except HTTPException:
+        notification_broker.unsubscribe(subscription)
+        raise
+    except Exception as e:
+        notification_broker.unsubscribe(subscription)
+        logger.error(f"Error opening notification stream: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error opening notification stream: {str(e)}")
+
+    return StreamingResponse(
+        event_stream(request, subscription, backlog),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("", response_model=NotificationsPage)
+async def get_notifications(
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
     try:
         # Get student from current user
-        student = db.query(Student).filter(Student.user_id == current_user.id).first()
+        student = current_user.student
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
 
-        notifications = (
-            db.query(NotificationModel)
-            .filter(NotificationModel.student_id == student.id)
-            .order_by(NotificationModel.created_at.desc())
-            .all()
-        )
-        
-        notifications_list = []
-        for n in notifications:
-            subject = db.query(Subject).filter(Subject.id == n.subject_id).first()
-            teacher = db.query(Teacher).filter(Teacher.id == n.teacher_id).first()
-            notifications_list.append({
-                **n.__dict__,
-                "subject_name": subject.name if subject else None,
-                "teacher_first_name": teacher.first_name if teacher else None,
-                "teacher_last_name": teacher.last_name if teacher else None
-            })
-        return {"notifications": notifications_list}
+        rows = (
+            await db.execute(
+                keyset_page(
+                    notification_query().where(NotificationModel.student_id == student.id),
+                    [NotificationModel.created_at, NotificationModel.id],
+                    page,
+                    descending=True
+                )
+            )
+        ).all()
+        rows, next_cursor = next_page(rows, page, lambda row: (row.created_at, row.id))
+
+        return {
+            "notifications": [serialize_notification(row) for row in rows],
+            "next_cursor": next_cursor
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching notifications: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching notifications: {str(e)}")
 
+def bulk_selection(student_id: str, data: dict):
+    """WHERE clause for the bulk endpoints: either {"ids": [...]} or {"before": "<ISO timestamp>"}."""
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=400, detail="Request body must be an object")
+    ids = data.get("ids")
+    before = data.get("before")
+    if (ids is None) == (before is None):
+        raise HTTPException(status_code=400, detail="Provide exactly one of ids or before")
+
+    condition = NotificationModel.student_id == student_id
+    if ids is not None:
+        if not isinstance(ids, list) or not all(isinstance(i, str) for i in ids):
+            raise HTTPException(status_code=400, detail="ids must be a list of strings")
+        if len(ids) > NOTIFICATION_BULK_MAX_IDS:
+            raise HTTPException(status_code=400, detail=f"At most {NOTIFICATION_BULK_MAX_IDS} ids per request")
+        return and_(condition, NotificationModel.id.in_(ids))
+
+    try:
+        cutoff = datetime.fromisoformat(str(before).replace("Z", "+00:00"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="before must be an ISO 8601 timestamp")
+    # created_at is stored as naive UTC
+    if cutoff.tzinfo is not None:
+        cutoff = cutoff.astimezone(timezone.utc).replace(tzinfo=None)
+    return and_(condition, NotificationModel.created_at <= cutoff)
+
+@router.get("/unread-count")
+async def get_unread_count(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    try:
+        student = current_user.student
+        if not student:
+            raise HTTPException(status_code=404, detail="Student not found")
+
+        # Served from ix_notifications_student_unread, which only holds unread rows
+        unread = await db.scalar(
+            select(func.count())
+            .select_from(NotificationModel)
+            .where(NotificationModel.student_id == student.id, NotificationModel.is_read == False)
+        )
+        return {"unread": unread}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error counting unread notifications: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error counting unread notifications: {str(e)}")
+
+@router.post("/read")
+async def mark_notifications_read(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    try:
+        student = current_user.student
+        if not student:
+            raise HTTPException(status_code=404, detail="Student not found")
+
+        condition = bulk_selection(student.id, await request.json())
+        result = await db.execute(
+            update(NotificationModel)
+            .where(condition, NotificationModel.is_read == False)
+            .values(is_read=True)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return {"updated": result.rowcount}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error marking notifications read: {str(e)}", exc_info=True)
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error marking notifications read: {str(e)}")
+
+@router.post("/delete")
+async def delete_notifications(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    try:
+        student = current_user.student
+        if not student:
+            raise HTTPException(status_code=404, detail="Student not found")
+
+        condition = bulk_selection(student.id, await request.json())
+        result = await db.execute(
+            delete(NotificationModel)
+            .where(condition)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return {"deleted": result.rowcount}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting notifications: {str(e)}", exc_info=True)
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error deleting notifications: {str(e)}")
+
 @router.post("/mark")
-async def post_mark_notification(request: Request, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def post_mark_notification(request: Request, db: AsyncSession = Depends(get_async_db), current_user: Principal = Depends(get_current_user)):
     try:
         data = await request.json()
         student_id = data.get('student_id')
@@ -54,15 +427,15 @@ async def post_mark_notification(request: Request, db: Session = Depends(get_db)
         mark_value = data.get('mark_value')
         description = data.get('description')
 
-        student = db.query(Student).filter(Student.id == student_id).first()
+        student = await db.scalar(select(Student).where(Student.id == student_id))
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
 
-        teacher = db.query(Teacher).filter(Teacher.user_id == current_user.id).first()
+        teacher = current_user.teacher
         if not teacher:
             raise HTTPException(status_code=404, detail="Teacher not found")
 
-        subject = db.query(Subject).filter(Subject.id == subject_id).first()
+        subject = await db.scalar(select(Subject).where(Subject.id == subject_id))
         if not subject:
             raise HTTPException(status_code=404, detail="Subject not found")
 
@@ -76,16 +449,20 @@ async def post_mark_notification(request: Request, db: Session = Depends(get_db)
             date=datetime.utcnow(),
             created_at=datetime.utcnow()
         )
+        if DENORMALISED_NAMES:
+            notification.subject_name = subject.name
+            notification.teacher_first_name = teacher.first_name
+            notification.teacher_last_name = teacher.last_name
         db.add(notification)
-        db.commit()
+        await db.commit()
         return {"message": "Mark notification created successfully"}
     except Exception as e:
         logger.error(f"Error creating mark notification: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error creating mark notification: {str(e)}")
 
 @router.post("/absence")
-async def post_absence_notification(request: Request, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def post_absence_notification(request: Request, db: AsyncSession = Depends(get_async_db), current_user: Principal = Depends(get_current_user)):
     try:
         data = await request.json()
         student_id = data.get('student_id')
@@ -93,15 +470,15 @@ async def post_absence_notification(request: Request, db: Session = Depends(get_
         is_motivated = data.get('is_motivated')
         description = data.get('description')
 
-        student = db.query(Student).filter(Student.id == student_id).first()
+        student = await db.scalar(select(Student).where(Student.id == student_id))
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
 
-        teacher = db.query(Teacher).filter(Teacher.user_id == current_user.id).first()
+        teacher = current_user.teacher
         if not teacher:
             raise HTTPException(status_code=404, detail="Teacher not found")
 
-        subject = db.query(Subject).filter(Subject.id == subject_id).first()
+        subject = await db.scalar(select(Subject).where(Subject.id == subject_id))
         if not subject:
             raise HTTPException(status_code=404, detail="Subject not found")
 
@@ -115,43 +492,47 @@ async def post_absence_notification(request: Request, db: Session = Depends(get_
             date=datetime.utcnow(),
             created_at=datetime.utcnow()
         )
+        if DENORMALISED_NAMES:
+            notification.subject_name = subject.name
+            notification.teacher_first_name = teacher.first_name
+            notification.teacher_last_name = teacher.last_name
         db.add(notification)
-        db.commit()
+        await db.commit()
         return {"message": "Absence notification created successfully"}
     except Exception as e:
         logger.error(f"Error creating absence notification: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error creating absence notification: {str(e)}")
 
 @router.delete("/{notification_id}")
-async def delete_notification(notification_id: str, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def delete_notification(notification_id: str, db: AsyncSession = Depends(get_async_db), current_user: Principal = Depends(get_current_user)):
     try:
         # Get student from current user
-        student = db.query(Student).filter(Student.user_id == current_user.id).first()
+        student = current_user.student
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
 
         # Get notification and verify it belongs to the student
-        notification = db.query(NotificationModel).filter(
+        notification = await db.scalar(select(NotificationModel).where(
             NotificationModel.id == notification_id,
             NotificationModel.student_id == student.id
-        ).first()
+        ))
         
         if not notification:
             raise HTTPException(status_code=404, detail="Notification not found")
 
-        db.delete(notification)
-        db.commit()
+        await db.delete(notification)
+        await db.commit()
         return {"message": "Notification deleted successfully"}
     except Exception as e:
         logger.error(f"Error deleting notification: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error deleting notification: {str(e)}")
 
 @router.get("/teacher/{teacher_id}")
-async def get_teacher_data(teacher_id: str, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def get_teacher_data(teacher_id: str, db: AsyncSession = Depends(get_async_db), current_user: Principal = Depends(get_current_user)):
     try:
-        teacher = db.query(Teacher).filter(Teacher.id == teacher_id).first()
+        teacher = await db.scalar(select(Teacher).where(Teacher.id == teacher_id))
         if not teacher:
             raise HTTPException(status_code=404, detail="Teacher not found")
 
@@ -166,9 +547,9 @@ async def get_teacher_data(teacher_id: str, db: Session = Depends(get_db), curre
         raise HTTPException(status_code=500, detail=f"Error fetching teacher data: {str(e)}")
 
 @router.get("/subject/{subject_id}")
-async def get_subject_data(subject_id: str, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def get_subject_data(subject_id: str, db: AsyncSession = Depends(get_async_db), current_user: Principal = Depends(get_current_user)):
     try:
-        subject = db.query(Subject).filter(Subject.id == subject_id).first()
+        subject = await db.scalar(select(Subject).where(Subject.id == subject_id))
         if not subject:
             raise HTTPException(status_code=404, detail="Subject not found")
 
@@ -1,15 +1,17 @@
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Depends, Request
-from sqlalchemy.orm import Session
-from database.postgres_setup import get_db
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.postgres_setup import get_async_db
 from models.database_models import (
-    User, Teacher, Student, Subject,
+    User, Teacher, Student, Subject, RegistrationStatus,
     TeacherProfileCreate, TeacherProfileResponse,
     StudentProfileCreate, StudentProfileResponse
 )
 import logging
 import uuid
-from routers.auth import get_current_user
+from routers.auth import get_current_user, invalidate_principal
+from models.principal import Principal
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -19,8 +21,8 @@ router = APIRouter()
 
 @router.get("/get-student-profile", response_model=StudentProfileResponse)
 async def get_student_profile(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         # Only allow students to access their own profile
@@ -30,7 +32,7 @@ async def get_student_profile(
                 detail="Only students can access this endpoint"
             )
         # Get the student profile
-        student = db.query(Student).filter(Student.user_id == current_user.id).first()
+        student = await db.scalar(select(Student).where(Student.user_id == current_user.id))
         if not student:
             raise HTTPException(
                 status_code=404,
@@ -40,7 +42,7 @@ async def get_student_profile(
         response = {
             "id": student.id,
             "user_id": student.user_id,
-            "email": student.user.email if student.user else None,
+            "email": current_user.email,
             "first_name": student.first_name,
             "last_name": student.last_name,
             "father_name": student.father_name,
@@ -59,8 +61,8 @@ async def get_student_profile(
 
 @router.get("/get-teacher-profile", response_model=TeacherProfileResponse)
 async def get_teacher_profile(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         # Only allow teachers to access their own profile
@@ -69,29 +71,31 @@ async def get_teacher_profile(
                 status_code=403,
                 detail="Only teachers can access this endpoint"
             )
-        teacher = (
-            db.query(Teacher)
-            .join(User)
-            .join(Subject, isouter=True)
-            .filter(Teacher.user_id == current_user.id)
-            .first()
-        )
-        if not teacher:
+        row = (
+            await db.execute(
+                select(Teacher, User.email, Subject.name)
+                .join(User)
+                .join(Subject, isouter=True)
+                .where(Teacher.user_id == current_user.id)
+            )
+        ).first()
+        if not row:
             raise HTTPException(
                 status_code=404,
                 detail=f"No teacher profile found for user {current_user.id}"
             )
+        teacher, email, subject_name = row
         # Compose the response dict with all required fields
         response = {
             "id": teacher.id,
             "user_id": teacher.user_id,
-            "email": teacher.user.email if teacher.user else None,
+            "email": email,
             "first_name": teacher.first_name,
             "last_name": teacher.last_name,
             "father_name": teacher.father_name,
             "gov_number": teacher.gov_number,
             "subject_id": teacher.subject_id,
-            "subject_name": teacher.subject.name if teacher.subject else None
+            "subject_name": subject_name
         }
         return response
     except HTTPException as he:
@@ -106,8 +110,8 @@ async def get_teacher_profile(
 @router.post("/complete-teacher-details")
 async def complete_teacher_details(
     profile: TeacherProfileCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         # Verify user is a teacher
@@ -118,7 +122,7 @@ async def complete_teacher_details(
             )
 
         # Check subject exists
-        subject = db.query(Subject).filter(Subject.id == profile.subject_id).first()
+        subject = await db.scalar(select(Subject).where(Subject.id == profile.subject_id))
         if not subject:
             raise HTTPException(
                 status_code=404,
@@ -126,7 +130,7 @@ async def complete_teacher_details(
             )
 
         # Check if teacher exists
-        existing_teacher = db.query(Teacher).filter(Teacher.user_id == current_user.id).first()
+        existing_teacher = await db.scalar(select(Teacher).where(Teacher.user_id == current_user.id))
 
         if existing_teacher:
             # Update existing teacher
@@ -142,15 +146,20 @@ async def complete_teacher_details(
             db.add(new_teacher)
 
         # Update user status to active
-        current_user.status = "active"
-        db.commit()
+        await db.execute(
+            update(User)
+            .where(User.id == current_user.id)
+            .values(status=RegistrationStatus.active)
+        )
+        await invalidate_principal(db, current_user.email)
+        await db.commit()
         return {"status": "success", "message": "Teacher details completed successfully"}
 
     except HTTPException as he:
         raise he
     except Exception as e:
         logger.error(f"Error in complete_teacher_details: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Failed to update teacher details: {str(e)}"
@@ -159,8 +168,8 @@ async def complete_teacher_details(
 @router.post("/complete-student-details")
 async def complete_student_details(
     profile: StudentProfileCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         # Verify user is a student
@@ -171,7 +180,7 @@ async def complete_student_details(
             )
 
         # Check if student exists
-        existing_student = db.query(Student).filter(Student.user_id == current_user.id).first()
+        existing_student = await db.scalar(select(Student).where(Student.user_id == current_user.id))
 
         if existing_student:
             # Update existing student
@@ -187,15 +196,20 @@ async def complete_student_details(
             db.add(new_student)
 
         # Update user status to active
-        current_user.status = "active"
-        db.commit()
+        await db.execute(
+            update(User)
+            .where(User.id == current_user.id)
+            .values(status=RegistrationStatus.active)
+        )
+        await invalidate_principal(db, current_user.email)
+        await db.commit()
         return {"status": "success", "message": "Student details completed successfully"}
 
     except HTTPException as he:
         raise he
     except Exception as e:
         logger.error(f"Error in complete_student_details: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500,
             detail=f"Failed to update student details: {str(e)}"
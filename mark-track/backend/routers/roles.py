@@ -1,13 +1,15 @@
 import re
 from fastapi import APIRouter, HTTPException, Depends, Request, Response
-from sqlalchemy.orm import Session
-from database.postgres_setup import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.postgres_setup import get_async_db
 from models.database_models import User, Student, Teacher, Admin
 from utils.constants import TEACHER_CODE, STUDENT_CODE_PREFIX, ADMIN_CODE
 import logging
 import uuid
 from models.auth import Token
-from routers.auth import get_current_user
+from routers.auth import get_current_user, invalidate_principal
+from models.principal import Principal
 from datetime import timedelta
 from utils.jwt_utils import create_access_token
 from utils.jwt_utils import ACCESS_TOKEN_EXPIRE_MINUTES
@@ -22,15 +24,15 @@ router = APIRouter()
 async def assign_role(
     request: Request,
     response: Response,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         data = await request.json()
         code = data.get('code', '')
         if not code:
             raise HTTPException(status_code=400, detail="Role code is required")
-        user = db.query(User).filter(User.id == current_user.id).first()
+        user = await db.scalar(select(User).where(User.id == current_user.id))
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         if user.role != "pending":
@@ -41,8 +43,9 @@ async def assign_role(
             db.add(teacher)
             user.role = "teacher"
             user.status = "awaiting_details"
-            db.commit()
-            db.refresh(user)
+            await invalidate_principal(db, user.email)
+            await db.commit()
+            await db.refresh(user)
             logger.info(f"Assigned teacher role to user {user.id}")
             # Issue new JWT with updated role and status
             access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -66,15 +69,16 @@ async def assign_role(
         elif code.startswith(STUDENT_CODE_PREFIX):
             if not re.match(rf"^{STUDENT_CODE_PREFIX}\d{{4,5}}$", code):
                 raise HTTPException(status_code=400, detail="Invalid student code format")
-            existing_student = db.query(Student).filter(Student.student_id == code).first()
+            existing_student = await db.scalar(select(Student).where(Student.student_id == code))
             if existing_student:
                 raise HTTPException(status_code=400, detail="Student ID already exists")
             student = Student(id=str(uuid.uuid4()), user_id=user.id, student_id=code)
             db.add(student)
             user.role = "student"
             user.status = "awaiting_details"
-            db.commit()
-            db.refresh(user)
+            await invalidate_principal(db, user.email)
+            await db.commit()
+            await db.refresh(user)
             logger.info(f"Assigned student role to user {user.id}")
             access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
             access_token = create_access_token(
@@ -99,8 +103,9 @@ async def assign_role(
             db.add(admin)
             user.role = "admin"
             user.status = "active"
-            db.commit()
-            db.refresh(user)
+            await invalidate_principal(db, user.email)
+            await db.commit()
+            await db.refresh(user)
             logger.info(f"Assigned admin role to user {user.id}")
             access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
             access_token = create_access_token(
@@ -123,6 +128,6 @@ async def assign_role(
             raise HTTPException(status_code=400, detail="Invalid role code")
     except Exception as e:
         logger.error(f"Error assigning role: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error assigning role: {str(e)}")
 
@@ -1,11 +1,19 @@
-from fastapi import APIRouter, HTTPException, Query, Depends, Request
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 import logging
 
-from database.postgres_setup import get_db
-from models.database_models import Subject, Teacher, User, Student, Class, Mark as MarkModel, Absence as AbsenceModel, ClassSubject, ClassStudent, Notification
+from database.postgres_setup import get_async_db
+from database.versions import absences_key, get_version, marks_key
+from models.database_models import Subject, Teacher, Class, Mark as MarkModel, Absence as AbsenceModel, ClassSubject, ClassStudent, Notification
 from routers.auth import get_current_user
+from routers.notifications import notification_query
+from models.principal import Principal
+from models.teacher import AbsencesPage, MarksPage
+from utils.conditional import cache_headers, is_not_modified, make_etag, not_modified_response, variant
+from utils.pagination import PageParams, dated_key, dated_projection, keyset_page, next_page
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -13,36 +21,53 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+MARKS_FIELDS = dated_projection({
+    "id": MarkModel.id,
+    "value": MarkModel.value,
+    "description": MarkModel.description,
+    "date": MarkModel.date,
+    "subject_name": Subject.name
+})
+ABSENCES_FIELDS = dated_projection({
+    "id": AbsenceModel.id,
+    "date": AbsenceModel.date,
+    "description": AbsenceModel.description,
+    "is_motivated": AbsenceModel.is_motivated,
+    "subject_name": Subject.name
+})
+
 @router.get("/classes")
 async def get_student_classes(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'student':
             raise HTTPException(status_code=403, detail="Only students can access this endpoint")
 
-        student = db.query(Student).filter(Student.user_id == current_user.id).first()
+        student = current_user.student
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
 
         # Get classes using ORM
         classes = (
-            db.query(Class)
-            .join(Class.students)
-            .filter(Student.id == student.id)
-            .all()
-        )
+            await db.scalars(
+                select(Class)
+                .join(Class.students)
+                .where(ClassStudent.student_id == student.student_id)
+            )
+        ).all()
         
         student_classes = []
         for cls in classes:
             # Get subjects for each class using ORM
             subjects = (
-                db.query(Subject)
-                .join(Subject.classes)
-                .filter(Class.id == cls.id)
-                .all()
-            )
+                await db.scalars(
+                    select(Subject)
+                    .join(Subject.classes)
+                    .where(ClassSubject.class_id == cls.id)
+                )
+            ).all()
             
             student_classes.append({
                 "id": cls.id,
@@ -55,110 +80,143 @@ async def get_student_classes(
         logger.error(f"Error fetching classes: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching classes: {str(e)}")
 
-@router.get("/marks")
+@router.get("/marks", response_model=MarksPage, response_model_exclude_unset=True)
 async def get_student_marks(
+    request: Request,
+    response: Response,
     subject_id: str = Query(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    page: PageParams = Depends(),
+    columns: list = Depends(MARKS_FIELDS),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'student':
             raise HTTPException(status_code=403, detail="Only students can access this endpoint")
 
-        student = db.query(Student).filter(Student.user_id == current_user.id).first()
+        student = current_user.student
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
 
-        # Get marks using ORM
+        # Answer revalidations from the version row alone, before reading any marks
+        version_key = marks_key(student.id, subject_id)
+        version, updated_at = await get_version(db, version_key)
+        # Each page and field set is its own representation of the version
+        etag = make_etag(version_key, version, variant(page.after, page.limit, sorted(c.name for c in columns)))
+        if is_not_modified(request, etag, updated_at):
+            return not_modified_response(etag, updated_at)
+        response.headers.update(cache_headers(etag, updated_at))
+
         marks = (
-            db.query(MarkModel)
-            .join(Subject)
-            .filter(
-                MarkModel.student_id == student.id,
-                MarkModel.subject_id == subject_id
+            await db.execute(
+                keyset_page(
+                    select(*columns)
+                    .select_from(MarkModel)
+                    .join(Subject)
+                    .where(
+                        MarkModel.student_id == student.id,
+                        MarkModel.subject_id == subject_id
+                    ),
+                    [MarkModel.date, MarkModel.id],
+                    page
+                )
             )
-            .all()
-        )
+        ).mappings().all()
+        marks, next_cursor = next_page(marks, page, dated_key)
 
-        marks_list = [{
-            "id": mark.id,
-            "value": mark.value,
-            "description": mark.description,
-            "date": mark.date,
-            "subject_name": mark.subject.name
-        } for mark in marks]
-        
-        return {"marks": marks_list}
+        return {"marks": [dict(row) for row in marks], "next_cursor": next_cursor}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching marks: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching marks: {str(e)}")
 
-@router.get("/absences")
+@router.get("/absences", response_model=AbsencesPage, response_model_exclude_unset=True)
 async def get_student_absences(
+    request: Request,
+    response: Response,
     subject_id: str = Query(...),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    page: PageParams = Depends(),
+    columns: list = Depends(ABSENCES_FIELDS),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'student':
             raise HTTPException(status_code=403, detail="Only students can access this endpoint")
 
-        student = db.query(Student).filter(Student.user_id == current_user.id).first()
+        student = current_user.student
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
 
-        # Get absences using ORM
+        # Answer revalidations from the version row alone, before reading any absences
+        version_key = absences_key(student.id, subject_id)
+        version, updated_at = await get_version(db, version_key)
+        # Each page and field set is its own representation of the version
+        etag = make_etag(version_key, version, variant(page.after, page.limit, sorted(c.name for c in columns)))
+        if is_not_modified(request, etag, updated_at):
+            return not_modified_response(etag, updated_at)
+        response.headers.update(cache_headers(etag, updated_at))
+
         absences = (
-            db.query(AbsenceModel)
-            .join(Subject)
-            .filter(
-                AbsenceModel.student_id == student.id,
-                AbsenceModel.subject_id == subject_id
+            await db.execute(
+                keyset_page(
+                    select(*columns)
+                    .select_from(AbsenceModel)
+                    .join(Subject)
+                    .where(
+                        AbsenceModel.student_id == student.id,
+                        AbsenceModel.subject_id == subject_id
+                    ),
+                    [AbsenceModel.date, AbsenceModel.id],
+                    page
+                )
             )
-            .all()
-        )
+        ).mappings().all()
+        absences, next_cursor = next_page(absences, page, dated_key)
 
-        absences_list = [{
-            "id": absence.id,
-            "date": absence.date,
-            "description": absence.description,
-            "is_motivated": absence.is_motivated,
-            "subject_name": absence.subject.name
-        } for absence in absences]
-        
-        return {"absences": absences_list}
+        return {"absences": [dict(row) for row in absences], "next_cursor": next_cursor}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching absences: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching absences: {str(e)}")
 
 @router.get("/notifications")
 async def get_student_notifications(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'student':
             raise HTTPException(status_code=403, detail="Only students can access this endpoint")
 
-        student = db.query(Student).filter(Student.user_id == current_user.id).first()
+        student = current_user.student
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
 
-        # Get notifications using ORM
+        # Newest first, in ix_notifications_student_created order; names come from
+        # the row itself, with a lookup only for rows that do not store them
         notifications = (
-            db.query(Notification)
-            .join(Subject)
-            .join(Teacher)
-            .filter(Notification.student_id == student.id)
-            .order_by(Notification.date.desc())
-            .all()
+            await db.execute(
+                keyset_page(
+                    notification_query().where(Notification.student_id == student.id),
+                    [Notification.created_at, Notification.id],
+                    page,
+                    descending=True
+                )
+            )
+        ).all()
+        notifications, next_cursor = next_page(
+            notifications, page, lambda row: (row.created_at, row.id)
         )
 
         notifications_list = [{
             "id": n.id,
-            "subject_name": n.subject.name,
-            "teacher_first_name": n.teacher.first_name,
-            "teacher_last_name": n.teacher.last_name,
+            "subject_name": n.subject_name,
+            "teacher_first_name": n.teacher_first_name,
+            "teacher_last_name": n.teacher_last_name,
             "value": n.value,
             "is_motivated": n.is_motivated,
             "description": n.description,
@@ -166,7 +224,9 @@ async def get_student_notifications(
             "is_read": n.is_read
         } for n in notifications]
 
-        return {"notifications": notifications_list}
+        return {"notifications": notifications_list, "next_cursor": next_cursor}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching notifications: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching notifications: {str(e)}")
@@ -174,22 +234,21 @@ async def get_student_notifications(
 @router.delete("/notifications/{notification_id}")
 async def delete_student_notification(
     notification_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'student':
             raise HTTPException(status_code=403, detail="Only students can access this endpoint")
 
-        student = db.query(Student).filter(Student.user_id == current_user.id).first()
+        student = current_user.student
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
 
         # Get notification using ORM
-        notification = (
-            db.query(Notification)
-            .filter(Notification.id == notification_id)
-            .first()
+        notification = await db.scalar(
+            select(Notification)
+            .where(Notification.id == notification_id)
         )
         
         if not notification:
@@ -199,34 +258,33 @@ async def delete_student_notification(
             raise HTTPException(status_code=403, detail="Not authorized to delete this notification")
 
         # Delete notification using ORM
-        db.delete(notification)
-        db.commit()
+        await db.delete(notification)
+        await db.commit()
         
         return {"message": "Notification deleted successfully"}
     except Exception as e:
         logger.error(f"Error deleting notification: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error deleting notification: {str(e)}")
 
 @router.get("/class")
 async def get_student_class(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'student':
             raise HTTPException(status_code=403, detail="Only students can access this endpoint")
 
-        student = db.query(Student).filter(Student.user_id == current_user.id).first()
+        student = current_user.student
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
 
         # Get class using ORM
-        class_data = (
-            db.query(Class)
+        class_data = await db.scalar(
+            select(Class)
             .join(Class.students)
-            .filter(Student.id == student.id)
-            .first()
+            .where(ClassStudent.student_id == student.student_id)
         )
         
         if not class_data:
@@ -239,27 +297,28 @@ async def get_student_class(
 
 @router.get("/subjects")
 async def get_student_subjects(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'student':
             raise HTTPException(status_code=403, detail="Only students can access this endpoint")
 
-        student = db.query(Student).filter(Student.user_id == current_user.id).first()
+        student = current_user.student
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
 
         # Get subjects using ORM with correct relationship path
         subjects = (
-            db.query(Subject)
-            .join(ClassSubject)
-            .join(Class)
-            .join(ClassStudent)
-            .filter(ClassStudent.student_id == student.student_id)
-            .outerjoin(Teacher, Subject.teachers)
-            .all()
-        )
+            await db.scalars(
+                select(Subject)
+                .join(ClassSubject)
+                .join(Class)
+                .join(ClassStudent)
+                .where(ClassStudent.student_id == student.student_id)
+                .options(selectinload(Subject.teachers))
+            )
+        ).all()
 
         subjects_list = [{
             "id": s.id,
@@ -270,4 +329,115 @@ async def get_student_subjects(
         return {"subjects": subjects_list}
     except Exception as e:
         logger.error(f"Error fetching subjects: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Error fetching subjects: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error fetching subjects: {str(e)}")
+
+@router.get("/dashboard")
+async def get_student_dashboard(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Everything the student overview needs in one response: the class and, for each
+    subject taught in it, the teacher, marks, absences, average and counts.
+    Replaces /subjects followed by /marks and /absences per subject.
+    """
+    try:
+        if current_user.role != 'student':
+            raise HTTPException(status_code=403, detail="Only students can access this endpoint")
+
+        student = current_user.student
+        if not student:
+            raise HTTPException(status_code=404, detail="Student not found")
+
+        marks_agg = (
+            select(
+                MarkModel.subject_id,
+                func.avg(MarkModel.value).label("average_mark"),
+                func.count().label("total_marks"),
+                func.json_agg(aggregate_order_by(
+                    func.json_build_object(
+                        "id", MarkModel.id,
+                        "value", MarkModel.value,
+                        "description", MarkModel.description,
+                        "date", MarkModel.date
+                    ),
+                    MarkModel.date
+                ), type_=JSON).label("marks")
+            )
+            .where(MarkModel.student_id == student.id)
+            .group_by(MarkModel.subject_id)
+            .subquery()
+        )
+        absences_agg = (
+            select(
+                AbsenceModel.subject_id,
+                func.count().label("total_absences"),
+                func.count().filter(AbsenceModel.is_motivated.is_(True)).label("motivated_absences"),
+                func.json_agg(aggregate_order_by(
+                    func.json_build_object(
+                        "id", AbsenceModel.id,
+                        "is_motivated", AbsenceModel.is_motivated,
+                        "description", AbsenceModel.description,
+                        "date", AbsenceModel.date
+                    ),
+                    AbsenceModel.date
+                ), type_=JSON).label("absences")
+            )
+            .where(AbsenceModel.student_id == student.id)
+            .group_by(AbsenceModel.subject_id)
+            .subquery()
+        )
+
+        # One row per subject taught in the student's class, with its stats joined on
+        rows = (
+            await db.execute(
+                select(
+                    Class.id.label("class_id"),
+                    Class.name.label("class_name"),
+                    Subject.id,
+                    Subject.name,
+                    Teacher.first_name.label("teacher_first_name"),
+                    Teacher.last_name.label("teacher_last_name"),
+                    marks_agg.c.marks,
+                    marks_agg.c.average_mark,
+                    marks_agg.c.total_marks,
+                    absences_agg.c.absences,
+                    absences_agg.c.total_absences,
+                    absences_agg.c.motivated_absences
+                )
+                .select_from(ClassStudent)
+                .join(Class, Class.id == ClassStudent.class_id)
+                .join(ClassSubject, ClassSubject.class_id == Class.id)
+                .join(Subject, Subject.id == ClassSubject.subject_id)
+                .outerjoin(Teacher, Teacher.id == ClassSubject.teacher_id)
+                .outerjoin(marks_agg, marks_agg.c.subject_id == Subject.id)
+                .outerjoin(absences_agg, absences_agg.c.subject_id == Subject.id)
+                .where(ClassStudent.student_id == student.student_id)
+                .order_by(Subject.name)
+            )
+        ).all()
+
+        subjects_list = [{
+            "id": row.id,
+            "name": row.name,
+            "teacher_name": (
+                f"{row.teacher_first_name} {row.teacher_last_name}"
+                if row.teacher_first_name or row.teacher_last_name else "Not assigned"
+            ),
+            "marks": row.marks or [],
+            "absences": row.absences or [],
+            "average_mark": float(row.average_mark) if row.average_mark is not None else None,
+            "total_marks": row.total_marks or 0,
+            "total_absences": row.total_absences or 0,
+            "motivated_absences": row.motivated_absences or 0
+        } for row in rows]
+
+        return {
+            "class": {"id": rows[0].class_id, "name": rows[0].class_name} if rows else None,
+            "subjects": subjects_list
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching dashboard: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error fetching dashboard: {str(e)}")
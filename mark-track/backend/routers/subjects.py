@@ -1,19 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database.postgres_setup import get_db
+import os
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.postgres_setup import get_async_db
+from database.versions import SUBJECTS_KEY, get_version
 from models.database_models import Subject
 from typing import List
+from utils.cache import VersionedSnapshot
+from utils.conditional import cache_headers, is_not_modified, make_etag, not_modified_response
+from utils.metrics import register_collector
+
+# How stale another worker's subject write may look before this worker notices it
+SUBJECT_CATALOGUE_CHECK_INTERVAL = float(os.getenv("SUBJECT_CATALOGUE_CHECK_INTERVAL", "1"))
 
 router = APIRouter()
 
+async def _catalogue_version(db: AsyncSession) -> int:
+    version, _ = await get_version(db, SUBJECTS_KEY)
+    return version
+
+async def _load_catalogue(db: AsyncSession) -> List[dict]:
+    rows = await db.execute(select(Subject.id, Subject.name).order_by(Subject.name))
+    return [{"id": row.id, "name": row.name} for row in rows]
+
+# Shared with admin.get_all_subjects; admin.create_subject/delete_subject bump the version
+subject_catalogue = VersionedSnapshot(_catalogue_version, _load_catalogue, SUBJECT_CATALOGUE_CHECK_INTERVAL)
+register_collector("subject_catalogue", subject_catalogue.snapshot)
+
+async def get_subject_catalogue(request: Request, response: Response, db: AsyncSession):
+    """Return the catalogue, or a 304 response when the client's ETag is current."""
+    version, subjects = await subject_catalogue.get(db)
+    etag = make_etag(SUBJECTS_KEY, version)
+    if is_not_modified(request, etag):
+        return None, not_modified_response(etag)
+    response.headers.update(cache_headers(etag))
+    return subjects, None
+
 @router.get("/", response_model=List[dict])
-async def get_subjects(db: Session = Depends(get_db)):
+async def get_subjects(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
     """
     Get all available subjects.
     This endpoint is accessible by both teachers and admins.
     """
     try:
-        subjects = db.query(Subject).all()
-        return [{"id": subject.id, "name": subject.name} for subject in subjects]
+        subjects, not_modified = await get_subject_catalogue(request, response, db)
+        return not_modified or subjects
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,15 +1,31 @@
 from fastapi import APIRouter, HTTPException, Query, Depends, Request
-from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from sqlalchemy import select, insert, delete, func, and_, distinct, literal, any_, String
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by, insert as pg_insert
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+import os
 import uuid
 import logging
 
-from database.postgres_setup import get_db
+from database.postgres_setup import get_async_db
+from database.outbox import enqueue_notifications, outbox_row
+from database.versions import absences_key, bump_version, get_version, marks_key, teacher_dashboard_key
 from models.database_models import (
-    Subject, Teacher, User, Student, Class,
+    Subject, Student, Class,
     Mark as MarkModel, Absence as AbsenceModel,
-    ClassSubject, ClassStudent
+    ClassSubject, ClassStudent, NotificationOutbox
 )
 from routers.auth import get_current_user
+from routers.notifications import outbox_worker
+from middleware.rate_limit import class_roster_limit
+from models.principal import Principal
+from models.teacher import AbsencesPage, BulkMarkRow, BulkMarksRequest, MarksPage, RollCallRequest, StudentsResponse
+from utils.cache import TTLCache
+from utils.dates import parse_datetime
+from utils.metrics import register_collector
+from utils.pagination import PageParams, dated_key, dated_projection, keyset_page, next_page
+from utils.sql import string_array
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
@@ -17,25 +33,46 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Mark/absence writes bump the teacher's dashboard version; the TTL bounds how long
+# enrolment or class assignment changes made by admins can go unnoticed
+TEACHER_DASHBOARD_CACHE_SIZE = int(os.getenv("TEACHER_DASHBOARD_CACHE_SIZE", "1000"))
+TEACHER_DASHBOARD_CACHE_TTL = float(os.getenv("TEACHER_DASHBOARD_CACHE_TTL", "60"))
+dashboard_cache = TTLCache(maxsize=TEACHER_DASHBOARD_CACHE_SIZE, ttl=TEACHER_DASHBOARD_CACHE_TTL)
+register_collector("teacher_dashboard_cache", dashboard_cache.snapshot)
+
+MARKS_FIELDS = dated_projection({
+    "id": MarkModel.id,
+    "value": MarkModel.value,
+    "description": MarkModel.description,
+    "date": MarkModel.date
+})
+ABSENCES_FIELDS = dated_projection({
+    "id": AbsenceModel.id,
+    "is_motivated": AbsenceModel.is_motivated,
+    "description": AbsenceModel.description,
+    "date": AbsenceModel.date
+})
+
 @router.get("/classes")
 async def get_teacher_classes(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'teacher':
             raise HTTPException(status_code=403, detail="Only teachers can access this endpoint")
 
-        teacher = db.query(Teacher).filter(Teacher.user_id == current_user.id).first()
+        teacher = current_user.teacher
         if not teacher:
             raise HTTPException(status_code=404, detail="Teacher not found")
             
         classes = (
-            db.query(Class, ClassSubject.subject_id)
-            .join(ClassSubject)
-            .filter(ClassSubject.teacher_id == teacher.id)
-            .all()
-        )
+            await db.execute(
+                select(Class, ClassSubject.subject_id)
+                .join(ClassSubject)
+                .where(ClassSubject.teacher_id == teacher.id)
+            )
+        ).all()
         
         return [{
             "id": c[0].id,
@@ -47,81 +84,267 @@ async def get_teacher_classes(
         logger.error(f"Error fetching classes: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/classes/{class_id}/students")
+async def load_teacher_dashboard(db: AsyncSession, teacher_id: str) -> dict:
+    """Per-class stats for every (class, subject) the teacher is assigned to, in one query."""
+    assignments = (
+        select(
+            ClassSubject.class_id,
+            ClassSubject.subject_id,
+            Class.name.label("class_name"),
+            Subject.name.label("subject_name")
+        )
+        .join(Class, Class.id == ClassSubject.class_id)
+        .join(Subject, Subject.id == ClassSubject.subject_id)
+        .where(ClassSubject.teacher_id == teacher_id)
+        .cte("assignments")
+    )
+    enrolment = (
+        select(ClassStudent.class_id, Student.id.label("student_id"))
+        .join(Student, Student.student_id == ClassStudent.student_id)
+        .where(ClassStudent.class_id.in_(select(assignments.c.class_id)))
+        .cte("enrolment")
+    )
+    student_counts = (
+        select(enrolment.c.class_id, func.count().label("student_count"))
+        .group_by(enrolment.c.class_id)
+        .subquery()
+    )
+    # Only marks and absences in the subject the teacher teaches in that class
+    marks_stats = (
+        select(
+            enrolment.c.class_id,
+            MarkModel.subject_id,
+            func.avg(MarkModel.value).label("average_mark"),
+            func.count().label("total_marks")
+        )
+        .join(MarkModel, MarkModel.student_id == enrolment.c.student_id)
+        .join(assignments, and_(
+            assignments.c.class_id == enrolment.c.class_id,
+            assignments.c.subject_id == MarkModel.subject_id
+        ))
+        .group_by(enrolment.c.class_id, MarkModel.subject_id)
+        .subquery()
+    )
+    absence_stats = (
+        select(
+            enrolment.c.class_id,
+            AbsenceModel.subject_id,
+            func.count().label("total_absences"),
+            func.count().filter(AbsenceModel.is_motivated.is_(True)).label("motivated_absences")
+        )
+        .join(AbsenceModel, AbsenceModel.student_id == enrolment.c.student_id)
+        .join(assignments, and_(
+            assignments.c.class_id == enrolment.c.class_id,
+            assignments.c.subject_id == AbsenceModel.subject_id
+        ))
+        .group_by(enrolment.c.class_id, AbsenceModel.subject_id)
+        .subquery()
+    )
+    rows = (
+        await db.execute(
+            select(
+                assignments.c.class_id,
+                assignments.c.class_name,
+                assignments.c.subject_id,
+                assignments.c.subject_name,
+                student_counts.c.student_count,
+                marks_stats.c.average_mark,
+                marks_stats.c.total_marks,
+                absence_stats.c.total_absences,
+                absence_stats.c.motivated_absences,
+                # A class the teacher has for several subjects appears on several
+                # rows, so the totals count distinct classes and students
+                select(func.count(distinct(assignments.c.class_id)))
+                .scalar_subquery().label("distinct_classes"),
+                select(func.count(distinct(enrolment.c.student_id)))
+                .scalar_subquery().label("distinct_students")
+            )
+            .outerjoin(student_counts, student_counts.c.class_id == assignments.c.class_id)
+            .outerjoin(marks_stats, and_(
+                marks_stats.c.class_id == assignments.c.class_id,
+                marks_stats.c.subject_id == assignments.c.subject_id
+            ))
+            .outerjoin(absence_stats, and_(
+                absence_stats.c.class_id == assignments.c.class_id,
+                absence_stats.c.subject_id == assignments.c.subject_id
+            ))
+            .order_by(assignments.c.class_name, assignments.c.subject_name)
+        )
+    ).all()
+
+    classes = []
+    for row in rows:
+        student_count = row.student_count or 0
+        total_absences = row.total_absences or 0
+        classes.append({
+            "id": row.class_id,
+            "name": row.class_name,
+            "subject_id": row.subject_id,
+            "subject_name": row.subject_name,
+            "student_count": student_count,
+            "average_mark": float(row.average_mark) if row.average_mark is not None else None,
+            "total_marks": row.total_marks or 0,
+            "total_absences": total_absences,
+            "motivated_absences": row.motivated_absences or 0,
+            # Absences per enrolled student
+            "absence_rate": round(total_absences / student_count, 2) if student_count else 0
+        })
+
+    total_marks = sum(c["total_marks"] for c in classes)
+    return {
+        "classes": classes,
+        "totals": {
+            "classes": rows[0].distinct_classes if rows else 0,
+            "students": rows[0].distinct_students if rows else 0,
+            "average_mark": (
+                sum(c["average_mark"] * c["total_marks"] for c in classes if c["total_marks"]) / total_marks
+                if total_marks else None
+            ),
+            "total_absences": sum(c["total_absences"] for c in classes)
+        }
+    }
+
+@router.get("/dashboard")
+async def get_teacher_dashboard(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    All of the teacher's classes with student counts, mark averages and absence rates.
+    Replaces /classes followed by /classes/{id}/students?include_stats=true per class.
+    """
+    try:
+        if current_user.role != 'teacher':
+            raise HTTPException(status_code=403, detail="Only teachers can access this endpoint")
+
+        teacher = current_user.teacher
+        if not teacher:
+            raise HTTPException(status_code=404, detail="Teacher not found")
+
+        # The version lookup keeps every worker's cached copy consistent with writes
+        version, _ = await get_version(db, teacher_dashboard_key(teacher.id))
+        cached = dashboard_cache.get(teacher.id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        dashboard = await load_teacher_dashboard(db, teacher.id)
+        dashboard_cache.set(teacher.id, (version, dashboard))
+        return dashboard
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching dashboard: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error fetching dashboard: {str(e)}")
+
+@router.get("/classes/{class_id}/students", response_model=StudentsResponse, response_model_exclude_unset=True)
+@class_roster_limit
 async def get_class_students(
+    request: Request,
     class_id: str,
     include_stats: bool = True,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'teacher':
             raise HTTPException(status_code=403, detail="Only teachers can access this endpoint")
 
         # Find teacher by user_id
-        teacher = db.query(Teacher).filter(Teacher.user_id == current_user.id).first()
+        teacher = current_user.teacher
         if not teacher:
             raise HTTPException(status_code=401, detail="Unauthorized")
 
         # Check if class exists
-        class_obj = db.query(Class).filter(Class.id == class_id).first()
+        class_obj = await db.scalar(select(Class).where(Class.id == class_id))
         if not class_obj:
             raise HTTPException(status_code=404, detail="Class not found")
 
         # Check if teacher teaches in this class
-        class_subjects = db.query(ClassSubject).filter(
+        class_subjects = (await db.scalars(select(ClassSubject).where(
             ClassSubject.class_id == class_id,
             ClassSubject.teacher_id == teacher.id
-        ).all()
+        ))).all()
         
         if not class_subjects:
             raise HTTPException(status_code=403, detail="Teacher does not teach in this class")
 
-        # Get students in the class
-        students = db.query(Student).join(ClassStudent).filter(
-            ClassStudent.class_id == class_id
-        ).all()
+        # Build the whole roster, with per-student stats, in a single query
+        roster = (
+            select(Student.id, Student.student_id, Student.first_name, Student.last_name)
+            .join(ClassStudent)
+            .where(ClassStudent.class_id == class_id)
+            .cte("roster")
+        )
+        query = select(roster.c.id, roster.c.student_id, roster.c.first_name, roster.c.last_name)
+
+        if include_stats:
+            marks_agg = (
+                select(
+                    MarkModel.student_id,
+                    func.avg(MarkModel.value).label("average_mark"),
+                    func.json_agg(aggregate_order_by(
+                        func.json_build_object(
+                            "id", MarkModel.id,
+                            "value", MarkModel.value,
+                            "description", MarkModel.description,
+                            "date", MarkModel.date
+                        ),
+                        MarkModel.date
+                    ), type_=JSON).label("marks")
+                )
+                .join(roster, roster.c.id == MarkModel.student_id)
+                .where(MarkModel.subject_id == teacher.subject_id)
+                .group_by(MarkModel.student_id)
+                .subquery()
+            )
+            absences_agg = (
+                select(
+                    AbsenceModel.student_id,
+                    func.count().label("total_absences"),
+                    func.count().filter(AbsenceModel.is_motivated.is_(True)).label("motivated_absences"),
+                    func.json_agg(aggregate_order_by(
+                        func.json_build_object(
+                            "id", AbsenceModel.id,
+                            "is_motivated", AbsenceModel.is_motivated,
+                            "description", AbsenceModel.description,
+                            "date", AbsenceModel.date
+                        ),
+                        AbsenceModel.date
+                    ), type_=JSON).label("absences")
+                )
+                .join(roster, roster.c.id == AbsenceModel.student_id)
+                .where(AbsenceModel.subject_id == teacher.subject_id)
+                .group_by(AbsenceModel.student_id)
+                .subquery()
+            )
+            query = (
+                query.add_columns(
+                    marks_agg.c.marks,
+                    marks_agg.c.average_mark,
+                    absences_agg.c.absences,
+                    absences_agg.c.total_absences,
+                    absences_agg.c.motivated_absences
+                )
+                .outerjoin(marks_agg, marks_agg.c.student_id == roster.c.id)
+                .outerjoin(absences_agg, absences_agg.c.student_id == roster.c.id)
+            )
 
         students_info = []
-        for student in students:
+        for row in (await db.execute(query)).all():
             student_info = {
-                "id": student.id,
-                "student_id": student.student_id,
-                "first_name": student.first_name,
-                "last_name": student.last_name
+                "id": row.id,
+                "student_id": row.student_id,
+                "first_name": row.first_name,
+                "last_name": row.last_name
             }
 
             if include_stats:
-                marks = db.query(MarkModel).filter(
-                    MarkModel.student_id == student.id,
-                    MarkModel.subject_id == teacher.subject_id
-                ).all()
-
-                absences = db.query(AbsenceModel).filter(
-                    AbsenceModel.student_id == student.id,
-                    AbsenceModel.subject_id == teacher.subject_id
-                ).all()
-
-                marks_list = [{
-                    "id": m.id,
-                    "value": m.value,
-                    "description": m.description,
-                    "date": m.date
-                } for m in marks]
-                
-                absences_list = [{
-                    "id": a.id,
-                    "is_motivated": a.is_motivated,
-                    "description": a.description,
-                    "date": a.date
-                } for a in absences]
-
                 student_info.update({
-                    "marks": marks_list,
-                    "absences": absences_list,
-                    "average_mark": sum(m.value for m in marks) / len(marks) if marks else 0,
-                    "total_absences": len(absences),
-                    "motivated_absences": sum(1 for a in absences if a.is_motivated)
+                    "marks": row.marks or [],
+                    "absences": row.absences or [],
+                    "average_mark": row.average_mark or 0,
+                    "total_absences": row.total_absences or 0,
+                    "motivated_absences": row.motivated_absences or 0
                 })
 
             students_info.append(student_info)
@@ -135,8 +358,8 @@ async def get_class_students(
 async def add_student_mark(
     class_id: str,
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'teacher':
@@ -146,37 +369,38 @@ async def add_student_mark(
         student_id = data.get('student_id')
         subject_id = data.get('subject_id')
         value = data.get('value')
-        date = data.get('date')
+        date = parse_datetime(data.get('date'))
         description = data.get('description')
 
         if not subject_id:
             raise HTTPException(status_code=400, detail="subject_id is required")
 
         # Find teacher by user_id
-        teacher = db.query(Teacher).filter(Teacher.user_id == current_user.id).first()
+        teacher = current_user.teacher
         if not teacher:
             raise HTTPException(status_code=401, detail="Unauthorized")
 
         # Check if class exists
-        class_obj = db.query(Class).filter(Class.id == class_id).first()
+        class_obj = await db.scalar(select(Class).where(Class.id == class_id))
         if not class_obj:
             raise HTTPException(status_code=404, detail="Class not found")
 
         # Check if teacher is assigned to teach this subject in this class
-        class_subject = db.query(ClassSubject).filter(
+        class_subject = await db.scalar(select(ClassSubject).where(
             ClassSubject.class_id == class_id,
             ClassSubject.teacher_id == teacher.id,
             ClassSubject.subject_id == subject_id
-        ).first()
+        ))
         
         if not class_subject:
             # Get teacher's assigned subjects for better error message
             teacher_subjects = (
-                db.query(Subject.name, ClassSubject.class_id)
-                .join(ClassSubject)
-                .filter(ClassSubject.teacher_id == teacher.id)
-                .all()
-            )
+                await db.execute(
+                    select(Subject.name, ClassSubject.class_id)
+                    .join(ClassSubject)
+                    .where(ClassSubject.teacher_id == teacher.id)
+                )
+            ).all()
             
             raise HTTPException(
                 status_code=403,
@@ -184,7 +408,7 @@ async def add_student_mark(
             )
 
         # Check if student exists
-        student = db.query(Student).filter(Student.id == student_id).first()
+        student = await db.scalar(select(Student).where(Student.id == student_id))
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
 
@@ -199,20 +423,26 @@ async def add_student_mark(
             description=description
         )
         db.add(new_mark)
-        db.commit()
+        # The student's notification commits (or rolls back) together with the mark
+        await enqueue_notifications(db, [
+            outbox_row(student_id, teacher.id, subject_id, value=value, description=description)
+        ])
+        await bump_version(db, marks_key(student_id, subject_id), teacher_dashboard_key(teacher.id))
+        await db.commit()
+        outbox_worker.notify()
 
         return {"message": "Mark added successfully"}
     except Exception as e:
         logger.error(f"Error adding mark: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error adding mark: {str(e)}")
 
 @router.post("/classes/{class_id}/students/absences")
 async def add_student_absence(
     class_id: str,
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'teacher':
@@ -222,37 +452,38 @@ async def add_student_absence(
         student_id = data.get('student_id')
         subject_id = data.get('subject_id')
         is_motivated = data.get('is_motivated')
-        date = data.get('date')
+        date = parse_datetime(data.get('date'))
         description = data.get('description')
 
         if not subject_id:
             raise HTTPException(status_code=400, detail="subject_id is required")
 
         # Find teacher by user_id
-        teacher = db.query(Teacher).filter(Teacher.user_id == current_user.id).first()
+        teacher = current_user.teacher
         if not teacher:
             raise HTTPException(status_code=401, detail="Unauthorized")
 
         # Check if class exists
-        class_obj = db.query(Class).filter(Class.id == class_id).first()
+        class_obj = await db.scalar(select(Class).where(Class.id == class_id))
         if not class_obj:
             raise HTTPException(status_code=404, detail="Class not found")
 
         # Check if teacher is assigned to teach this subject in this class
-        class_subject = db.query(ClassSubject).filter(
+        class_subject = await db.scalar(select(ClassSubject).where(
             ClassSubject.class_id == class_id,
             ClassSubject.teacher_id == teacher.id,
             ClassSubject.subject_id == subject_id
-        ).first()
+        ))
         
         if not class_subject:
             # Get teacher's assigned subjects for better error message
             teacher_subjects = (
-                db.query(Subject.name, ClassSubject.class_id)
-                .join(ClassSubject)
-                .filter(ClassSubject.teacher_id == teacher.id)
-                .all()
-            )
+                await db.execute(
+                    select(Subject.name, ClassSubject.class_id)
+                    .join(ClassSubject)
+                    .where(ClassSubject.teacher_id == teacher.id)
+                )
+            ).all()
             
             raise HTTPException(
                 status_code=403,
@@ -260,7 +491,7 @@ async def add_student_absence(
             )
 
         # Check if student exists
-        student = db.query(Student).filter(Student.id == student_id).first()
+        student = await db.scalar(select(Student).where(Student.id == student_id))
         if not student:
             raise HTTPException(status_code=404, detail="Student not found")
 
@@ -275,76 +506,369 @@ async def add_student_absence(
             description=description
         )
         db.add(new_absence)
-        db.commit()
+        # The student's notification commits (or rolls back) together with the absence
+        await enqueue_notifications(db, [
+            outbox_row(student_id, teacher.id, subject_id, is_motivated=is_motivated, description=description)
+        ])
+        await bump_version(db, absences_key(student_id, subject_id), teacher_dashboard_key(teacher.id))
+        await db.commit()
+        outbox_worker.notify()
 
         return {"message": "Absence added successfully"}
     except Exception as e:
         logger.error(f"Error adding absence: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error adding absence: {str(e)}")
 
-@router.get("/students/{student_id}/marks")
+async def check_class_assignment(db: AsyncSession, class_id: str, teacher_id: str, subject_id: str) -> None:
+    """Check the class and the teacher's assignment in one lookup, for a whole batch of writes."""
+    assigned = await db.scalar(
+        select(ClassSubject.class_id).where(
+            ClassSubject.class_id == class_id,
+            ClassSubject.teacher_id == teacher_id,
+            ClassSubject.subject_id == subject_id
+        )
+    )
+    if assigned is None:
+        class_obj = await db.scalar(select(Class.id).where(Class.id == class_id))
+        if not class_obj:
+            raise HTTPException(status_code=404, detail="Class not found")
+        raise HTTPException(status_code=403, detail="Teacher does not teach this subject in this class")
+
+async def get_enrolled_student_ids(db: AsyncSession, class_id: str, student_ids: list) -> set:
+    """The subset of student ids (Student.id) enrolled in the class, with one set query."""
+    if not student_ids:
+        return set()
+    return set((await db.scalars(
+        select(Student.id)
+        .join(ClassStudent, ClassStudent.student_id == Student.student_id)
+        .where(
+            ClassStudent.class_id == class_id,
+            Student.id == any_(string_array(student_ids))
+        )
+    )).all())
+
+def validation_detail(error: ValidationError, messages: dict) -> str:
+    """The first problem in a validated body, in the endpoint's own wording where it has one.
+
+    `messages` maps a field name to its message; the None key covers a body
+    that is not a JSON object at all.
+    """
+    problem = error.errors()[0]
+    field = problem["loc"][0] if problem["loc"] else None
+    if field in messages:
+        return messages[field]
+    if problem["type"] == "missing":
+        return f"{field} is required"
+    return f"Invalid {field}"
+
+BULK_MARKS_ERRORS = {
+    None: "Request body must be a JSON object",
+    "marks": "marks must be a non-empty list",
+    "date": "Invalid date"
+}
+BULK_MARK_ROW_ERRORS = {
+    None: "Row must be a JSON object",
+    "value": "value must be a number",
+    "date": "Invalid date"
+}
+ROLL_CALL_ERRORS = {
+    None: "Request body must be a JSON object",
+    "present": "present must be a list of student ids",
+    "absent": "absent must be a list of student ids",
+    "date": "Invalid date"
+}
+
+@router.post("/classes/{class_id}/marks/bulk")
+async def add_class_marks_bulk(
+    class_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Grade many students of a class at once.
+
+    Body: {"subject_id": ..., "date": ..., "description": ...,
+           "marks": [{"student_id": ..., "value": ..., "date"?: ..., "description"?: ...}]}
+    The top-level date and description are defaults for rows that omit them.
+    Valid rows are inserted, each with its outbox notification, in one transaction;
+    rows that fail validation are reported in "errors" by their index.
+    """
+    try:
+        if current_user.role != 'teacher':
+            raise HTTPException(status_code=403, detail="Only teachers can access this endpoint")
+
+        teacher = current_user.teacher
+        if not teacher:
+            raise HTTPException(status_code=401, detail="Unauthorized")
+
+        data = await request.json()
+        try:
+            body = BulkMarksRequest.model_validate(data)
+            default_date = parse_datetime(body.date) or datetime.utcnow()
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=validation_detail(e, BULK_MARKS_ERRORS))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid date")
+        subject_id = body.subject_id or teacher.subject_id
+        if not subject_id:
+            raise HTTPException(status_code=400, detail="subject_id is required")
+
+        await check_class_assignment(db, class_id, teacher.id, subject_id)
+
+        errors = []
+        rows = []
+        for index, entry in enumerate(body.marks):
+            try:
+                row = BulkMarkRow.model_validate(entry)
+                date = parse_datetime(row.date) or default_date
+            except ValueError as e:
+                # ValidationError is a ValueError too; any other one comes from the date
+                detail = validation_detail(e, BULK_MARK_ROW_ERRORS) if isinstance(e, ValidationError) else "Invalid date"
+                student_id = entry.get('student_id') if isinstance(entry, dict) else None
+                errors.append({"index": index, "student_id": student_id, "detail": detail})
+                continue
+            # An explicit null description clears the default, a missing one inherits it
+            description = row.description if "description" in row.model_fields_set else body.description
+            rows.append((index, row.student_id, row.value, date, description))
+
+        # All students checked with one set query: they must exist and be enrolled in the class
+        requested_ids = list(dict.fromkeys(student_id for _, student_id, *_ in rows))
+        enrolled = await get_enrolled_student_ids(db, class_id, requested_ids)
+
+        marks = []
+        notifications = []
+        for index, student_id, value, date, description in rows:
+            if student_id not in enrolled:
+                errors.append({"index": index, "student_id": student_id, "detail": "Student is not enrolled in this class"})
+                continue
+            marks.append({
+                "id": str(uuid.uuid4()),
+                "student_id": student_id,
+                "teacher_id": teacher.id,
+                "subject_id": subject_id,
+                "value": value,
+                "date": date,
+                "description": description
+            })
+            notifications.append(outbox_row(student_id, teacher.id, subject_id, value=value, description=description))
+
+        if marks:
+            # Multi-row INSERTs: one statement for the marks, one for their outbox rows
+            await db.execute(insert(MarkModel).values(marks))
+            await enqueue_notifications(db, notifications)
+            await bump_version(
+                db,
+                teacher_dashboard_key(teacher.id),
+                *(marks_key(mark["student_id"], subject_id) for mark in marks)
+            )
+            await db.commit()
+            outbox_worker.notify()
+
+        errors.sort(key=lambda error: error["index"])
+        return {"created": len(marks), "errors": errors}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error adding marks: {str(e)}", exc_info=True)
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error adding marks: {str(e)}")
+
+@router.post("/classes/{class_id}/roll-call")
+async def submit_roll_call(
+    class_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Record attendance for one class, subject and day.
+
+    Body: {"subject_id": ..., "date": ..., "present": [student ids], "absent": [student ids],
+           "is_motivated"?: false, "description"?: ...}
+    Idempotent per (class, subject, date): absent students get one absence (and one
+    notification) however often the roll call is submitted, and students marked
+    present on a re-submission lose the roll-call absence recorded for that day.
+    """
+    try:
+        if current_user.role != 'teacher':
+            raise HTTPException(status_code=403, detail="Only teachers can access this endpoint")
+
+        teacher = current_user.teacher
+        if not teacher:
+            raise HTTPException(status_code=401, detail="Unauthorized")
+
+        data = await request.json()
+        try:
+            body = RollCallRequest.model_validate(data)
+            date = parse_datetime(body.date)
+        except ValidationError as e:
+            raise HTTPException(status_code=400, detail=validation_detail(e, ROLL_CALL_ERRORS))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid date")
+        subject_id = body.subject_id or teacher.subject_id
+        present = list(dict.fromkeys(body.present or []))
+        absent = list(dict.fromkeys(body.absent or []))
+        is_motivated = body.is_motivated
+        description = body.description
+        if not subject_id:
+            raise HTTPException(status_code=400, detail="subject_id is required")
+        if date is None:
+            raise HTTPException(status_code=400, detail="date is required")
+        if set(present) & set(absent):
+            raise HTTPException(status_code=400, detail="A student cannot be both present and absent")
+
+        await check_class_assignment(db, class_id, teacher.id, subject_id)
+        enrolled = await get_enrolled_student_ids(db, class_id, present + absent)
+        errors = [
+            {"student_id": student_id, "detail": "Student is not enrolled in this class"}
+            for student_id in present + absent if student_id not in enrolled
+        ]
+        present = [student_id for student_id in present if student_id in enrolled]
+        absent = [student_id for student_id in absent if student_id in enrolled]
+        roll_call_date = date.date()
+
+        removed = []
+        if present:
+            removed = (await db.scalars(
+                delete(AbsenceModel)
+                .where(
+                    AbsenceModel.student_id == any_(string_array(present)),
+                    AbsenceModel.subject_id == subject_id,
+                    AbsenceModel.roll_call_date == roll_call_date
+                )
+                .returning(AbsenceModel.student_id)
+                .execution_options(synchronize_session=False)
+            )).all()
+
+        recorded = []
+        if absent:
+            # Insert the absences, skipping ones this roll call already recorded, and an
+            # outbox notification for each absence actually inserted, in a single statement
+            inserted = (
+                pg_insert(AbsenceModel)
+                .values([{
+                    "id": str(uuid.uuid4()),
+                    "student_id": student_id,
+                    "teacher_id": teacher.id,
+                    "subject_id": subject_id,
+                    "is_motivated": is_motivated,
+                    "description": description,
+                    "date": date,
+                    "roll_call_date": roll_call_date
+                } for student_id in absent])
+                .on_conflict_do_nothing(index_elements=[
+                    AbsenceModel.student_id, AbsenceModel.subject_id, AbsenceModel.roll_call_date
+                ])
+                .returning(AbsenceModel.student_id)
+                .cte("inserted")
+            )
+            recorded = (await db.scalars(
+                insert(NotificationOutbox)
+                .from_select(
+                    ["student_id", "teacher_id", "subject_id", "is_motivated", "description", "created_at"],
+                    select(
+                        inserted.c.student_id,
+                        literal(teacher.id),
+                        literal(subject_id),
+                        literal(is_motivated),
+                        literal(description, String),
+                        literal(datetime.utcnow())
+                    )
+                )
+                .returning(NotificationOutbox.student_id)
+            )).all()
+
+        if removed or recorded:
+            await bump_version(
+                db,
+                teacher_dashboard_key(teacher.id),
+                *(absences_key(student_id, subject_id) for student_id in [*removed, *recorded])
+            )
+        await db.commit()
+        if recorded:
+            outbox_worker.notify()
+
+        return {
+            "recorded": len(recorded),
+            "already_recorded": len(absent) - len(recorded),
+            "removed": len(removed),
+            "errors": errors
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error recording roll call: {str(e)}", exc_info=True)
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Error recording roll call: {str(e)}")
+
+@router.get("/students/{student_id}/marks", response_model=MarksPage, response_model_exclude_unset=True)
 async def get_student_marks(
     student_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    page: PageParams = Depends(),
+    columns: list = Depends(MARKS_FIELDS),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'teacher':
             raise HTTPException(status_code=403, detail="Only teachers can access this endpoint")
 
         # Find teacher by user_id
-        teacher = db.query(Teacher).filter(Teacher.user_id == current_user.id).first()
+        teacher = current_user.teacher
         if not teacher:
             raise HTTPException(status_code=404, detail="Teacher not found")
 
         # Get marks for the student in the teacher's subject
-        marks = db.query(MarkModel).filter(
-            MarkModel.student_id == student_id,
-            MarkModel.subject_id == teacher.subject_id
-        ).all()
-
-        marks_list = [{
-            "id": m.id,
-            "value": m.value,
-            "description": m.description,
-            "date": m.date
-        } for m in marks]
+        marks = (await db.execute(keyset_page(
+            select(*columns).where(
+                MarkModel.student_id == student_id,
+                MarkModel.subject_id == teacher.subject_id
+            ),
+            [MarkModel.date, MarkModel.id],
+            page
+        ))).mappings().all()
+        marks, next_cursor = next_page(marks, page, dated_key)
         
-        return {"marks": marks_list}
+        return {"marks": [dict(row) for row in marks], "next_cursor": next_cursor}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching marks: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching marks: {str(e)}")
 
-@router.get("/students/{student_id}/absences")
+@router.get("/students/{student_id}/absences", response_model=AbsencesPage, response_model_exclude_unset=True)
 async def get_student_absences(
     student_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    page: PageParams = Depends(),
+    columns: list = Depends(ABSENCES_FIELDS),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'teacher':
             raise HTTPException(status_code=403, detail="Only teachers can access this endpoint")
 
         # Find teacher by user_id
-        teacher = db.query(Teacher).filter(Teacher.user_id == current_user.id).first()
+        teacher = current_user.teacher
         if not teacher:
             raise HTTPException(status_code=404, detail="Teacher not found")
 
         # Get absences for the student in the teacher's subject
-        absences = db.query(AbsenceModel).filter(
-            AbsenceModel.student_id == student_id,
-            AbsenceModel.subject_id == teacher.subject_id
-        ).all()
-
-        absences_list = [{
-            "id": a.id,
-            "is_motivated": a.is_motivated,
-            "description": a.description,
-            "date": a.date
-        } for a in absences]
+        absences = (await db.execute(keyset_page(
+            select(*columns).where(
+                AbsenceModel.student_id == student_id,
+                AbsenceModel.subject_id == teacher.subject_id
+            ),
+            [AbsenceModel.date, AbsenceModel.id],
+            page
+        ))).mappings().all()
+        absences, next_cursor = next_page(absences, page, dated_key)
         
-        return {"absences": absences_list}
+        return {"absences": [dict(row) for row in absences], "next_cursor": next_cursor}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching absences: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error fetching absences: {str(e)}")
@@ -352,63 +876,65 @@ async def get_student_absences(
 @router.delete("/marks/{mark_id}")
 async def delete_student_mark(
     mark_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'teacher':
             raise HTTPException(status_code=403, detail="Only teachers can access this endpoint")
 
-        mark = db.query(MarkModel).filter(MarkModel.id == mark_id).first()
+        mark = await db.scalar(select(MarkModel).where(MarkModel.id == mark_id))
         if not mark:
             raise HTTPException(status_code=404, detail="Mark not found")
 
         # Verify the mark belongs to this teacher
-        teacher = db.query(Teacher).filter(Teacher.user_id == current_user.id).first()
+        teacher = current_user.teacher
         if mark.teacher_id != teacher.id:
             raise HTTPException(status_code=403, detail="Not authorized to delete this mark")
 
-        db.delete(mark)
-        db.commit()
+        await db.delete(mark)
+        await bump_version(db, marks_key(mark.student_id, mark.subject_id), teacher_dashboard_key(teacher.id))
+        await db.commit()
         return {"message": "Mark deleted successfully"}
     except Exception as e:
         logger.error(f"Error deleting mark: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error deleting mark: {str(e)}")
 
 @router.delete("/absences/{absence_id}")
 async def delete_student_absence(
     absence_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'teacher':
             raise HTTPException(status_code=403, detail="Only teachers can access this endpoint")
 
-        absence = db.query(AbsenceModel).filter(AbsenceModel.id == absence_id).first()
+        absence = await db.scalar(select(AbsenceModel).where(AbsenceModel.id == absence_id))
         if not absence:
             raise HTTPException(status_code=404, detail="Absence not found")
 
         # Verify the absence belongs to this teacher
-        teacher = db.query(Teacher).filter(Teacher.user_id == current_user.id).first()
+        teacher = current_user.teacher
         if absence.teacher_id != teacher.id:
             raise HTTPException(status_code=403, detail="Not authorized to delete this absence")
 
-        db.delete(absence)
-        db.commit()
+        await db.delete(absence)
+        await bump_version(db, absences_key(absence.student_id, absence.subject_id), teacher_dashboard_key(teacher.id))
+        await db.commit()
         return {"message": "Absence deleted successfully"}
     except Exception as e:
         logger.error(f"Error deleting absence: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error deleting absence: {str(e)}")
 
 @router.put("/marks/{mark_id}")
 async def edit_student_mark(
     mark_id: str,
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'teacher':
@@ -416,33 +942,41 @@ async def edit_student_mark(
 
         data = await request.json()
         
-        mark = db.query(MarkModel).filter(MarkModel.id == mark_id).first()
+        mark = await db.scalar(select(MarkModel).where(MarkModel.id == mark_id))
         if not mark:
             raise HTTPException(status_code=404, detail="Mark not found")
 
         # Verify the mark belongs to this teacher
-        teacher = db.query(Teacher).filter(Teacher.user_id == current_user.id).first()
+        teacher = current_user.teacher
         if mark.teacher_id != teacher.id:
             raise HTTPException(status_code=403, detail="Not authorized to edit this mark")
 
+        # The update may move the mark to another student or subject
+        previous_key = marks_key(mark.student_id, mark.subject_id)
+
         # Update mark fields
         for field, value in data.items():
+            if field == 'date':
+                value = parse_datetime(value)
             if hasattr(mark, field):
                 setattr(mark, field, value)
 
-        db.commit()
+        await bump_version(
+            db, previous_key, marks_key(mark.student_id, mark.subject_id), teacher_dashboard_key(teacher.id)
+        )
+        await db.commit()
         return {"message": "Mark updated successfully"}
     except Exception as e:
         logger.error(f"Error updating mark: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error updating mark: {str(e)}")
 
 @router.put("/absences/{absence_id}")
 async def edit_student_absence(
     absence_id: str,
     request: Request,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     try:
         if current_user.role != 'teacher':
@@ -450,23 +984,31 @@ async def edit_student_absence(
 
         data = await request.json()
         
-        absence = db.query(AbsenceModel).filter(AbsenceModel.id == absence_id).first()
+        absence = await db.scalar(select(AbsenceModel).where(AbsenceModel.id == absence_id))
         if not absence:
             raise HTTPException(status_code=404, detail="Absence not found")
 
         # Verify the absence belongs to this teacher
-        teacher = db.query(Teacher).filter(Teacher.user_id == current_user.id).first()
+        teacher = current_user.teacher
         if absence.teacher_id != teacher.id:
             raise HTTPException(status_code=403, detail="Not authorized to edit this absence")
 
+        # The update may move the absence to another student or subject
+        previous_key = absences_key(absence.student_id, absence.subject_id)
+
         # Update absence fields
         for field, value in data.items():
+            if field == 'date':
+                value = parse_datetime(value)
             if hasattr(absence, field):
                 setattr(absence, field, value)
 
-        db.commit()
+        await bump_version(
+            db, previous_key, absences_key(absence.student_id, absence.subject_id), teacher_dashboard_key(teacher.id)
+        )
+        await db.commit()
         return {"message": "Absence updated successfully"}
     except Exception as e:
         logger.error(f"Error updating absence: {str(e)}", exc_info=True)
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Error updating absence: {str(e)}")
\ No newline at end of file
@@ -1,7 +1,13 @@
+import asyncio
+import uuid
 import pytest
-from sqlalchemy import create_engine
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from database.postgres_setup import Base
+from database.postgres_setup import ASYNC_DATABASE_URL, Base
+from models.database_models import Teacher, Student, Subject, Class, ClassStudent, ClassSubject
+from models.principal import Principal, TeacherPrincipal
 import os
 
 DATABASE_USER = os.getenv("POSTGRES_USER", "postgres")
@@ -23,4 +29,84 @@ def db():
         yield db
     finally:
         db.close()
-        Base.metadata.drop_all(bind=engine) 
\ No newline at end of file
+        Base.metadata.drop_all(bind=engine) 
+
+class JsonRequest:
+    """Stands in for a Request whose body is the given JSON payload."""
+    def __init__(self, payload):
+        self.payload = payload
+
+    async def json(self):
+        return self.payload
+
+def run_in_session(scenario):
+    """Run ``await scenario(session, statements)`` on a fresh async engine.
+
+    ``statements`` collects the SQL issued after the pool is warmed up, so
+    tests can assert how many queries a handler runs.
+    """
+    async def wrapper():
+        engine = create_async_engine(ASYNC_DATABASE_URL)
+        try:
+            # Open the pool first so dialect initialisation is not counted
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+            statements = []
+            event.listen(
+                engine.sync_engine,
+                "before_cursor_execute",
+                lambda conn, cursor, statement, *args: statements.append(statement)
+            )
+            async with async_sessionmaker(engine, class_=AsyncSession)() as session:
+                return await scenario(session, statements)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(wrapper())
+
+def seed_class(db, student_count):
+    """A class taught by one teacher, its students and an unenrolled outsider."""
+    subject = Subject(id=str(uuid.uuid4()), name="Math")
+    teacher = Teacher(id=str(uuid.uuid4()), first_name="Ion", last_name="Pop", subject_id=subject.id)
+    class_obj = Class(id=str(uuid.uuid4()), name="9A")
+    outsider = Student(id=str(uuid.uuid4()), student_id=str(uuid.uuid4()), first_name="Other")
+    db.add_all([subject, teacher, class_obj, outsider])
+    db.flush()
+    db.add(ClassSubject(class_id=class_obj.id, subject_id=subject.id, teacher_id=teacher.id))
+    student_ids = []
+    for i in range(student_count):
+        student = Student(id=str(uuid.uuid4()), student_id=str(uuid.uuid4()), first_name=f"S{i}")
+        db.add(student)
+        db.flush()
+        db.add(ClassStudent(class_id=class_obj.id, student_id=student.student_id))
+        student_ids.append(student.id)
+    db.commit()
+    principal = Principal(
+        id=str(uuid.uuid4()),
+        email="teacher@example.com",
+        role="teacher",
+        status=None,
+        teacher=TeacherPrincipal(id=teacher.id, subject_id=subject.id, first_name="Ion", last_name="Pop")
+    )
+    return principal, class_obj.id, student_ids, outsider.id
+
+@pytest.fixture
+def teacher_principal():
+    """A teacher that exists only in memory.
+
+    Enough for requests a handler rejects before its first query, which can
+    then be called with db=None.
+    """
+    return Principal(
+        id=str(uuid.uuid4()),
+        email="teacher@example.com",
+        role="teacher",
+        status=None,
+        teacher=TeacherPrincipal(id=str(uuid.uuid4()), subject_id=str(uuid.uuid4()), first_name=None, last_name=None)
+    )
+
+def raised(handler_call) -> HTTPException:
+    """Await a handler call that must fail and return the HTTPException it raised."""
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(handler_call)
+    return exc.value
@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import func, select
+from models.database_models import Mark, Notification, NotificationOutbox
+from database.outbox import deliver_batch
+from routers.teacher import add_class_marks_bulk
+from conftest import JsonRequest, raised, run_in_session, seed_class
+
+def run_bulk(user, class_id, payload):
+    async def scenario(session, statements):
+        result = await add_class_marks_bulk(class_id, JsonRequest(payload), db=session, current_user=user)
+        return result, len(statements)
+
+    return run_in_session(scenario)
+
+def test_bulk_marks_insert_valid_rows_and_report_errors(db):
+    user, class_id, student_ids, outsider_id = seed_class(db, 30)
+    entries = [{"student_id": student_id, "value": 8} for student_id in student_ids]
+    entries += [
+        {"student_id": outsider_id, "value": 7},
+        {"student_id": student_ids[0], "value": "ten"},
+        {"value": 5},
+        {"student_id": 12345, "value": 6},
+        {"student_id": student_ids[1], "value": 6, "date": 20240301}
+    ]
+
+    result, queries = run_bulk(user, class_id, {"description": "Test 1", "marks": entries})
+
+    assert result["created"] == 30
+    assert [(e["index"], e["detail"]) for e in result["errors"]] == [
+        (30, "Student is not enrolled in this class"),
+        (31, "value must be a number"),
+        (32, "student_id is required"),
+        (33, "Invalid student_id"),
+        (34, "Invalid date")
+    ]
+    # assignment, enrolment, marks, outbox, versions: independent of the row count
+    assert queries == 5
+    assert db.scalar(select(func.count()).select_from(Mark)) == 30
+    assert db.scalar(select(func.count()).select_from(NotificationOutbox)) == 30
+
+def test_outbox_delivers_notifications_in_batches(db):
+    user, class_id, student_ids, _ = seed_class(db, 5)
+    run_bulk(user, class_id, {"description": "Test 1", "marks": [
+        {"student_id": student_id, "value": 8} for student_id in student_ids
+    ]})
+
+    async def drain(session, statements):
+        return [len(await deliver_batch(session, batch_size=3)) for _ in range(3)]
+
+    assert run_in_session(drain) == [3, 2, 0]
+    db.expire_all()
+    assert db.scalar(select(func.count()).select_from(NotificationOutbox)) == 0
+    notifications = db.scalars(select(Notification)).all()
+    assert sorted(n.student_id for n in notifications) == sorted(student_ids)
+    assert notifications[0].value == 8
+    assert notifications[0].description == "Test 1"
+    assert notifications[0].subject_name == "Math"
+    assert notifications[0].teacher_last_name == "Pop"
+
+@pytest.mark.parametrize("payload, detail", [
+    ({"marks": []}, "marks must be a non-empty list"),
+    ({"marks": "x"}, "marks must be a non-empty list"),
+    ({"date": 20240301, "marks": [{"student_id": "s", "value": 8}]}, "Invalid date"),
+    ({"date": "soon", "marks": [{"student_id": "s", "value": 8}]}, "Invalid date"),
+    ({"subject_id": 7, "marks": [{"student_id": "s", "value": 8}]}, "Invalid subject_id"),
+    (["not", "an", "object"], "Request body must be a JSON object"),
+])
+def test_bulk_marks_reject_malformed_bodies(teacher_principal, payload, detail):
+    error = raised(add_class_marks_bulk("c", JsonRequest(payload), db=None, current_user=teacher_principal))
+    assert (error.status_code, error.detail) == (400, detail)
@@ -0,0 +1,93 @@
+import uuid
+from models.database_models import (
+    User, Teacher, Student, Subject, Class, ClassStudent, ClassSubject,
+    Mark, Absence, RegistrationStatus
+)
+from models.principal import Principal, TeacherPrincipal
+from routers.teacher import get_class_students
+from conftest import run_in_session
+
+def seed_roster(db, student_count):
+    """Like conftest.seed_class, but with a teacher account and marks/absences per student."""
+    subject = Subject(id=str(uuid.uuid4()), name="Math")
+    user = User(
+        id=str(uuid.uuid4()),
+        email=f"teacher-{uuid.uuid4()}@example.com",
+        password="hashed_password",
+        role="teacher",
+        status=RegistrationStatus.active
+    )
+    teacher = Teacher(id=str(uuid.uuid4()), user_id=user.id, subject_id=subject.id)
+    class_obj = Class(id=str(uuid.uuid4()), name="9A")
+    db.add_all([subject, user, teacher, class_obj])
+    db.flush()
+    db.add(ClassSubject(class_id=class_obj.id, subject_id=subject.id, teacher_id=teacher.id))
+
+    for i in range(student_count):
+        student = Student(
+            id=str(uuid.uuid4()),
+            student_id=str(uuid.uuid4()),
+            first_name=f"Student{i}",
+            last_name="Test"
+        )
+        db.add(student)
+        db.flush()
+        db.add(ClassStudent(class_id=class_obj.id, student_id=student.student_id))
+        for value in (6, 9):
+            db.add(Mark(
+                id=str(uuid.uuid4()), student_id=student.id, teacher_id=teacher.id,
+                subject_id=subject.id, value=value
+            ))
+        for is_motivated in (True, False, False):
+            db.add(Absence(
+                id=str(uuid.uuid4()), student_id=student.id, teacher_id=teacher.id,
+                subject_id=subject.id, is_motivated=is_motivated
+            ))
+    db.commit()
+    principal = Principal(
+        id=user.id,
+        email=user.email,
+        role=user.role,
+        status=user.status,
+        teacher=TeacherPrincipal(
+            id=teacher.id,
+            subject_id=subject.id,
+            first_name=teacher.first_name,
+            last_name=teacher.last_name
+        )
+    )
+    return principal, class_obj.id
+
+def run_roster(user, class_id):
+    async def scenario(session, statements):
+        # __wrapped__ skips the per-user rate limit, which needs a real request
+        result = await get_class_students.__wrapped__(
+            None, class_id, True, db=session, current_user=user
+        )
+        return result, len(statements)
+
+    return run_in_session(scenario)
+
+def test_class_roster_query_count_is_constant(db):
+    small_user, small_class = seed_roster(db, 2)
+    large_user, large_class = seed_roster(db, 30)
+
+    small, small_queries = run_roster(small_user, small_class)
+    large, large_queries = run_roster(large_user, large_class)
+
+    assert len(small["students"]) == 2
+    assert len(large["students"]) == 30
+    # class, class_subjects and the aggregated roster
+    assert small_queries == large_queries == 3
+
+def test_class_roster_stats(db):
+    user, class_id = seed_roster(db, 1)
+
+    result, _ = run_roster(user, class_id)
+
+    student = result["students"][0]
+    assert student["average_mark"] == 7.5
+    assert student["total_absences"] == 3
+    assert student["motivated_absences"] == 1
+    assert sorted(m["value"] for m in student["marks"]) == [6, 9]
+    assert len(student["absences"]) == 3
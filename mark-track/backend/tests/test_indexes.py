@@ -0,0 +1,108 @@
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import insert, text
+from models.database_models import (
+    Subject, Teacher, Student, Class, ClassStudent, ClassSubject,
+    Mark, Absence, Notification
+)
+
+STUDENTS = 500
+SUBJECTS = 10
+CLASSES = 20
+
+@pytest.fixture(scope="function")
+def seeded(db):
+    now = datetime.utcnow()
+    subjects = [{"id": str(uuid.uuid4()), "name": f"Subject {i}"} for i in range(SUBJECTS)]
+    teachers = [{"id": str(uuid.uuid4()), "subject_id": s["id"]} for s in subjects]
+    students = [{"id": str(uuid.uuid4()), "student_id": str(uuid.uuid4())} for _ in range(STUDENTS)]
+    classes = [{"id": str(uuid.uuid4()), "name": f"Class {i}"} for i in range(CLASSES)]
+
+    db.execute(insert(Subject), subjects)
+    db.execute(insert(Teacher), teachers)
+    db.execute(insert(Student), students)
+    db.execute(insert(Class), classes)
+    db.execute(insert(ClassStudent), [
+        {"class_id": classes[i % CLASSES]["id"], "student_id": s["student_id"]}
+        for i, s in enumerate(students)
+    ])
+    db.execute(insert(ClassSubject), [
+        {"class_id": c["id"], "subject_id": t["subject_id"], "teacher_id": t["id"]}
+        for c in classes for t in teachers
+    ])
+
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "student_id": s["id"],
+            "teacher_id": t["id"],
+            "subject_id": t["subject_id"],
+            "date": now - timedelta(days=i)
+        }
+        for s in students for t in teachers for i in range(4)
+    ]
+    db.execute(insert(Mark), [{**row, "value": 8} for row in rows])
+    db.execute(insert(Absence), [{**row, "is_motivated": False} for row in rows])
+    db.execute(insert(Notification), [{**row, "value": 8, "created_at": row["date"]} for row in rows])
+    db.commit()
+    db.execute(text("ANALYZE"))
+    return {"student": students[0], "teacher": teachers[0], "subject": subjects[0]}
+
+def explain(db, sql, seqscan=True, **params):
+    # The class link tables are only a few pages in this dataset, so for those
+    # the test checks that the index is usable rather than that it is chosen
+    db.execute(text(f"SET enable_seqscan = {'on' if seqscan else 'off'}"))
+    return "\n".join(db.execute(text(f"EXPLAIN {sql}"), params).scalars())
+
+def test_marks_lookup_uses_index(db, seeded):
+    plan = explain(
+        db,
+        "SELECT * FROM marks WHERE student_id = :student_id AND subject_id = :subject_id",
+        student_id=seeded["student"]["id"], subject_id=seeded["subject"]["id"]
+    )
+    assert "ix_marks_student_subject" in plan
+
+def test_absences_lookup_uses_index(db, seeded):
+    plan = explain(
+        db,
+        "SELECT * FROM absences WHERE student_id = :student_id AND subject_id = :subject_id",
+        student_id=seeded["student"]["id"], subject_id=seeded["subject"]["id"]
+    )
+    assert "ix_absences_student_subject" in plan
+
+def test_notification_feed_uses_index(db, seeded):
+    plan = explain(
+        db,
+        "SELECT * FROM notifications WHERE student_id = :student_id "
+        "ORDER BY created_at DESC, id DESC LIMIT 50",
+        student_id=seeded["student"]["id"]
+    )
+    assert "ix_notifications_student_created" in plan
+    assert "Sort" not in plan
+
+def test_teacher_classes_lookup_uses_index(db, seeded):
+    plan = explain(
+        db,
+        "SELECT * FROM class_subjects WHERE teacher_id = :teacher_id",
+        seqscan=False,
+        teacher_id=seeded["teacher"]["id"]
+    )
+    assert "ix_class_subjects_teacher" in plan
+
+def test_student_class_lookup_uses_index(db, seeded):
+    plan = explain(
+        db,
+        "SELECT * FROM class_students WHERE student_id = :student_id",
+        seqscan=False,
+        student_id=seeded["student"]["student_id"]
+    )
+    assert "ix_class_students_student" in plan
+
+def test_unread_count_uses_partial_index(db, seeded):
+    plan = explain(
+        db,
+        "SELECT count(*) FROM notifications WHERE student_id = :student_id AND is_read = false",
+        student_id=seeded["student"]["id"]
+    )
+    assert "ix_notifications_student_unread" in plan
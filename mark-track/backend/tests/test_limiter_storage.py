@@ -0,0 +1,54 @@
+import os
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from slowapi import _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+from middleware.rate_limit import InstrumentedLimiter, custom_key_func
+
+TEST_REDIS_URI = os.getenv("RATE_LIMIT_TEST_REDIS_URI", "redis://redis:6379/15")
+
+def make_app(limiter: InstrumentedLimiter) -> FastAPI:
+    app = FastAPI()
+    app.state.limiter = limiter
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+    @app.post("/login")
+    @limiter.limit("3/minute")
+    async def login(request: Request):
+        return {"ok": True}
+
+    return app
+
+def test_sliding_window_limit_and_metrics():
+    limiter = InstrumentedLimiter(key_func=custom_key_func, strategy="moving-window")
+    client = TestClient(make_app(limiter))
+    headers = {"X-Forwarded-For": "10.1.0.1"}
+
+    statuses = [client.post("/login", headers=headers).status_code for _ in range(5)]
+
+    assert statuses == [200, 200, 200, 429, 429]
+    snapshot = limiter.snapshot()
+    assert snapshot["checks"] == 5
+    assert snapshot["rejected"] == 2
+    assert snapshot["check_ms"]["count"] == 5
+
+def test_workers_share_redis_counters():
+    redis = pytest.importorskip("redis")
+    try:
+        redis.Redis.from_url(TEST_REDIS_URI).flushdb()
+    except redis.exceptions.ConnectionError:
+        pytest.skip("Redis is not reachable")
+
+    # Two limiters stand in for two uvicorn workers
+    workers = [
+        TestClient(make_app(InstrumentedLimiter(
+            key_func=custom_key_func, strategy="moving-window", storage_uri=TEST_REDIS_URI
+        )))
+        for _ in range(2)
+    ]
+    headers = {"X-Forwarded-For": "10.1.0.2"}
+
+    statuses = [workers[i % 2].post("/login", headers=headers).status_code for i in range(4)]
+
+    assert statuses == [200, 200, 200, 429]
@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+from database.pool_metrics import pool_saturated
+from middleware import load_shedding
+from middleware.rate_limit import admin_classes_cost, class_roster_cost, bulk_enrolment_cost
+
+def make_pool(checked_out, waiting, size=5, max_overflow=10):
+    return SimpleNamespace(
+        size=lambda: size,
+        _max_overflow=max_overflow,
+        checkedout=lambda: checked_out,
+        waiting=waiting
+    )
+
+def make_request(query_string=b"", headers=()):
+    return Request({"type": "http", "query_string": query_string, "headers": list(headers)})
+
+def test_pool_saturated():
+    assert not pool_saturated(make_pool(checked_out=14, waiting=50), max_waiting=10)
+    assert not pool_saturated(make_pool(checked_out=15, waiting=10), max_waiting=10)
+    assert pool_saturated(make_pool(checked_out=15, waiting=11), max_waiting=10)
+    assert not pool_saturated(make_pool(checked_out=99, waiting=99, max_overflow=-1), max_waiting=10)
+
+def test_route_costs():
+    assert admin_classes_cost(make_request()) == 1
+    assert admin_classes_cost(make_request(b"limit=200")) == 4
+    assert class_roster_cost(make_request()) == 5
+    assert class_roster_cost(make_request(b"include_stats=false")) == 1
+    assert bulk_enrolment_cost(make_request(headers=[(b"content-length", b"45000")])) == 5
+
+def test_sheds_with_retry_after_when_pool_saturated(monkeypatch):
+    app = FastAPI()
+    app.add_middleware(load_shedding.LoadSheddingMiddleware)
+
+    @app.get("/")
+    async def root():
+        return {"ok": True}
+
+    @app.get("/teacher/classes")
+    async def classes():
+        return {"ok": True}
+
+    client = TestClient(app)
+    monkeypatch.setattr(load_shedding, "pool_saturated", lambda pool, max_waiting: True)
+
+    response = client.get("/teacher/classes")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == load_shedding.DB_SHED_RETRY_AFTER
+    assert client.get("/").status_code == 200
+
+    monkeypatch.setattr(load_shedding, "pool_saturated", lambda pool, max_waiting: False)
+    assert client.get("/teacher/classes").status_code == 200
@@ -0,0 +1,73 @@
+import uuid
+from datetime import datetime, timedelta
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from models.database_models import Student, Notification
+from models.principal import Principal, StudentPrincipal
+from routers.notifications import bulk_selection, get_unread_count, mark_notifications_read, delete_notifications
+from conftest import JsonRequest, run_in_session
+
+def seed_notifications(db, count):
+    student = Student(id=str(uuid.uuid4()), student_id=str(uuid.uuid4()), first_name="Ana", last_name="Test")
+    db.add(student)
+    db.flush()
+    now = datetime.utcnow()
+    ids = [str(uuid.uuid4()) for _ in range(count)]
+    db.add_all(
+        Notification(id=nid, student_id=student.id, value=8, created_at=now - timedelta(days=i))
+        for i, nid in enumerate(ids)
+    )
+    db.commit()
+    user = Principal(
+        id=str(uuid.uuid4()),
+        email="ana@example.com",
+        role="student",
+        status=None,
+        student=StudentPrincipal(
+            id=student.id, student_id=student.student_id, first_name="Ana", last_name="Test"
+        )
+    )
+    return user, ids, now
+
+def run(handler, **kwargs):
+    async def scenario(session, statements):
+        result = await handler(db=session, **kwargs)
+        return result, len(statements)
+
+    return run_in_session(scenario)
+
+def test_bulk_read_by_ids_and_cutoff(db):
+    user, ids, now = seed_notifications(db, 10)
+
+    assert run(get_unread_count, current_user=user)[0] == {"unread": 10}
+
+    result, queries = run(mark_notifications_read, request=JsonRequest({"ids": ids[:3]}), current_user=user)
+    assert result == {"updated": 3}
+    assert queries == 1
+
+    # The first three are already read, so only days 3..5 change
+    cutoff = (now - timedelta(days=5)).isoformat() + "Z"
+    result, _ = run(mark_notifications_read, request=JsonRequest({"before": cutoff}), current_user=user)
+    assert result == {"updated": 4}
+
+    assert run(get_unread_count, current_user=user)[0] == {"unread": 3}
+
+def test_bulk_delete_only_touches_own_notifications(db):
+    user, ids, now = seed_notifications(db, 5)
+    other, other_ids, _ = seed_notifications(db, 2)
+
+    result, queries = run(delete_notifications, request=JsonRequest({"ids": ids[:2] + other_ids}), current_user=user)
+    assert result == {"deleted": 2}
+    assert queries == 1
+
+    cutoff = now.isoformat()
+    result, _ = run(delete_notifications, request=JsonRequest({"before": cutoff}), current_user=user)
+    assert result == {"deleted": 3}
+    assert db.scalar(select(Notification.id).where(Notification.id == other_ids[0])) is not None
+
+@pytest.mark.parametrize("payload", [{}, {"ids": [], "before": "2024-01-01"}, {"ids": "x"}, {"before": "soon"}])
+def test_bulk_selection_rejects_invalid_payloads(payload):
+    with pytest.raises(HTTPException) as exc:
+        bulk_selection("student", payload)
+    assert exc.value.status_code == 400
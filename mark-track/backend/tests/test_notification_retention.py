@@ -0,0 +1,49 @@
+import uuid
+from datetime import date, datetime, timedelta
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from database.partitions import add_months, create_partition_sql, expired_partitions, months_between
+from database.retention import NotificationRetentionWorker
+from models.database_models import Student, Notification
+from conftest import run_in_session
+
+def test_partition_months():
+    assert add_months(date(2024, 11, 1), 3) == date(2025, 2, 1)
+    assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+    assert months_between(date(2024, 11, 20), date(2025, 1, 1)) == [
+        date(2024, 11, 1), date(2024, 12, 1), date(2025, 1, 1)
+    ]
+    assert create_partition_sql(date(2024, 12, 1)).endswith(
+        "notifications_2024_12 PARTITION OF notifications FOR VALUES FROM ('2024-12-01') TO ('2025-01-01')"
+    )
+
+def test_expired_partitions_keep_retained_months_and_default():
+    names = ["notifications_2024_01", "notifications_2024_02", "notifications_default", "notifications_2024_05"]
+    assert expired_partitions(names, date(2024, 5, 10), retention_months=3) == ["notifications_2024_01"]
+
+def test_sweep_deletes_only_old_read_notifications_in_chunks(db):
+    student = Student(id=str(uuid.uuid4()), student_id=str(uuid.uuid4()), first_name="Ana", last_name="Test")
+    db.add(student)
+    db.flush()
+    now = datetime.utcnow()
+    old, recent = now - timedelta(days=200), now - timedelta(days=10)
+    db.add_all(
+        Notification(id=str(uuid.uuid4()), student_id=student.id, is_read=is_read, created_at=created_at)
+        for created_at, is_read, count in ((old, True, 25), (old, False, 3), (recent, True, 4))
+        for _ in range(count)
+    )
+    db.commit()
+
+    async def scenario(session, statements):
+        worker = NotificationRetentionWorker(
+            async_sessionmaker(session.bind, class_=AsyncSession),
+            retention_days=180, chunk_size=10, interval=3600
+        )
+        return await worker.sweep(), worker.snapshot()
+
+    deleted, snapshot = run_in_session(scenario)
+
+    assert deleted == 25
+    assert snapshot["chunks"] == 3
+    remaining = db.scalar(select(func.count()).select_from(Notification).where(Notification.student_id == student.id))
+    assert remaining == 7
@@ -0,0 +1,92 @@
+import uuid
+from datetime import datetime
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.dialects import postgresql
+from models.database_models import Mark, Student
+from utils.pagination import PageParams, encode_cursor, keyset_page, next_page
+
+def compile_sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect()))
+
+def test_first_page_orders_and_fetches_one_extra_row():
+    sql = compile_sql(keyset_page(select(Student), [Student.id], PageParams(cursor=None, limit=20)))
+    assert "ORDER BY students.id ASC" in sql
+    assert "WHERE" not in sql
+    assert "LIMIT" in sql
+
+def test_cursor_continues_after_last_key():
+    page = PageParams(cursor=encode_cursor(datetime(2024, 1, 1), "abc"), limit=20)
+    query = keyset_page(select(Student), [Student.first_name, Student.id], page, descending=True)
+    sql = compile_sql(query)
+    assert "(students.first_name, students.id) < (" in sql
+    assert "ORDER BY students.first_name DESC, students.id DESC" in sql
+
+def test_null_cursor_value_continues_among_null_rows():
+    page = PageParams(cursor=encode_cursor(None, "abc"), limit=20)
+    sql = compile_sql(keyset_page(select(Mark), [Mark.date, Mark.id], page))
+    assert "marks.date IS NULL AND (marks.id) > (" in sql
+
+    sql = compile_sql(keyset_page(select(Mark), [Mark.date, Mark.id], page, descending=True))
+    assert "marks.date IS NOT NULL OR marks.date IS NULL AND (marks.id) < (" in sql
+
+def test_cursor_must_match_sort_key():
+    page = PageParams(cursor=encode_cursor("a", "b"), limit=20)
+    with pytest.raises(HTTPException) as exc:
+        keyset_page(select(Student), [Student.id], page)
+    assert exc.value.status_code == 400
+
+    with pytest.raises(HTTPException) as exc:
+        PageParams(cursor="not-a-cursor", limit=20)
+    assert exc.value.status_code == 400
+
+def test_next_page_trims_extra_row():
+    page = PageParams(cursor=None, limit=2)
+    rows, cursor = next_page(["a", "b", "c"], page, lambda row: (row,))
+    assert rows == ["a", "b"]
+    assert cursor == encode_cursor("b")
+    assert next_page(["a"], page, lambda row: (row,)) == (["a"], None)
+
+def test_walks_every_student_exactly_once(db):
+    ids = sorted(str(uuid.uuid4()) for _ in range(25))
+    db.add_all(Student(id=sid, student_id=sid, first_name="S", last_name=str(i)) for i, sid in enumerate(ids))
+    db.commit()
+
+    seen, cursor = [], None
+    while True:
+        page = PageParams(cursor=cursor, limit=10)
+        rows = db.scalars(keyset_page(select(Student.id), [Student.id], page)).all()
+        rows, cursor = next_page(rows, page, lambda sid: (sid,))
+        seen.extend(rows)
+        if cursor is None:
+            break
+
+    assert seen == ids
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_walks_rows_with_null_sort_keys_exactly_once(db, descending):
+    student = Student(id=str(uuid.uuid4()), student_id=str(uuid.uuid4()), first_name="S")
+    db.add(student)
+    db.flush()
+    ids = [str(uuid.uuid4()) for _ in range(12)]
+    db.add_all(
+        Mark(id=mid, student_id=student.id, value=8, date=datetime(2024, 1, 1 + i % 3))
+        for i, mid in enumerate(ids)
+    )
+    db.flush()
+    # Seven undated rows, so both walk directions cross a page boundary among NULLs
+    db.execute(update(Mark).where(Mark.id.in_(ids[5:])).values(date=None))
+    db.commit()
+
+    seen, cursor = [], None
+    while True:
+        page = PageParams(cursor=cursor, limit=3)
+        rows = db.execute(keyset_page(select(Mark.date, Mark.id), [Mark.date, Mark.id], page, descending)).all()
+        rows, cursor = next_page(rows, page, lambda row: (row.date, row.id))
+        seen.extend(rows)
+        if cursor is None:
+            break
+
+    assert sorted(row.id for row in seen) == sorted(ids)
+    assert len(seen) == len(ids)
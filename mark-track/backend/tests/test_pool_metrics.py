@@ -0,0 +1,53 @@
+import asyncio
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from database.pool_metrics import InstrumentedAsyncQueuePool, pool_snapshot
+from database.postgres_setup import ASYNC_DATABASE_URL
+from utils.metrics import Histogram
+
+def test_histogram_cumulative_buckets():
+    histogram = Histogram(buckets=(1, 10, 100))
+    for value in (0.5, 5, 50, 500):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == 555.5
+    assert snapshot["buckets"] == {"le_1": 1, "le_10": 2, "le_100": 3, "le_inf": 4}
+
+def test_pool_snapshot_tracks_checkouts():
+    async def scenario():
+        engine = create_async_engine(
+            ASYNC_DATABASE_URL,
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=2,
+            max_overflow=1,
+            pool_timeout=0.2
+        )
+        try:
+            conns = [await engine.connect() for _ in range(3)]
+            for conn in conns:
+                await conn.execute(text("SELECT 1"))
+            busy = pool_snapshot(engine.pool)
+
+            with pytest.raises(Exception):
+                await engine.connect()
+            exhausted = pool_snapshot(engine.pool)
+
+            for conn in conns:
+                await conn.close()
+            idle = pool_snapshot(engine.pool)
+            return busy, exhausted, idle
+        finally:
+            await engine.dispose()
+
+    busy, exhausted, idle = asyncio.run(scenario())
+
+    assert busy["checked_out"] == 3
+    assert busy["overflow"] == 1
+    assert busy["checkout_wait_ms"]["count"] == 3
+    assert exhausted["checkout_timeouts"] == 1
+    assert exhausted["checkout_wait_ms"]["buckets"]["le_100"] == 3
+    assert idle["checked_out"] == 0
+    assert idle["idle"] == 2
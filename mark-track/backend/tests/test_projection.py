@@ -0,0 +1,20 @@
+import pytest
+from fastapi import HTTPException
+from routers.admin import STUDENT_FIELDS
+from routers.teacher import MARKS_FIELDS
+
+def names(columns):
+    return [column.name for column in columns]
+
+def test_no_fields_selects_everything_in_declared_order():
+    assert names(STUDENT_FIELDS(fields=None)) == ["id", "first_name", "last_name", "student_id"]
+
+def test_fields_select_a_subset_plus_the_sort_key():
+    assert names(STUDENT_FIELDS(fields="last_name, first_name")) == ["id", "first_name", "last_name"]
+    assert names(MARKS_FIELDS(fields="value")) == ["id", "value", "date"]
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(HTTPException) as exc:
+        STUDENT_FIELDS(fields="first_name,password")
+    assert exc.value.status_code == 400
+    assert "password" in exc.value.detail
@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+from utils.pubsub import Broker, BrokerFull
+
+def test_publish_reaches_only_subscribers_of_the_key():
+    async def scenario():
+        broker = Broker(max_subscriptions=10, queue_size=10)
+        first = broker.subscribe("student-1")
+        second = broker.subscribe("student-1")
+        other = broker.subscribe("student-2")
+
+        assert broker.publish("student-1", "event") == 2
+        assert broker.publish("student-3", "ignored") == 0
+        return await first.get(), await second.get(), len(other._items)
+
+    assert asyncio.run(scenario()) == ("event", "event", 0)
+
+def test_slow_subscriber_is_closed_instead_of_buffering():
+    async def scenario():
+        broker = Broker(max_subscriptions=10, queue_size=2)
+        subscription = broker.subscribe("student-1")
+        for i in range(3):
+            broker.publish("student-1", i)
+        return subscription, await subscription.get(), broker.snapshot()
+
+    subscription, item, snapshot = asyncio.run(scenario())
+    assert subscription.closed
+    assert item is None
+    assert len(subscription._items) == 0
+    assert snapshot["dropped"] == 1
+
+def test_subscription_limit_and_unsubscribe():
+    broker = Broker(max_subscriptions=1, queue_size=2)
+    subscription = broker.subscribe("student-1")
+    with pytest.raises(BrokerFull):
+        broker.subscribe("student-2")
+
+    broker.unsubscribe(subscription)
+    broker.unsubscribe(subscription)
+    assert not broker.has_subscribers("student-1")
+    assert broker.snapshot()["subscriptions"] == 0
+    assert broker.snapshot()["rejected"] == 1
+    broker.subscribe("student-2")
+
+def test_close_all_wakes_waiting_subscribers():
+    async def scenario():
+        broker = Broker(max_subscriptions=10, queue_size=2)
+        subscription = broker.subscribe("student-1")
+        waiter = asyncio.create_task(subscription.get())
+        await asyncio.sleep(0)
+        broker.close_all()
+        return await asyncio.wait_for(waiter, 1)
+
+    assert asyncio.run(scenario()) is None
@@ -0,0 +1,40 @@
+from datetime import datetime
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from models.teacher import MarksPage, StudentsResponse
+
+def make_client(response_model, payload) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/", response_model=response_model, response_model_exclude_unset=True)
+    async def endpoint():
+        return payload
+
+    return TestClient(app)
+
+def test_roster_without_stats_omits_stat_fields():
+    payload = {"students": [{"id": "1", "student_id": "S1", "first_name": "Ana", "last_name": "Pop"}]}
+
+    body = make_client(StudentsResponse, payload).get("/").json()
+
+    assert body == payload
+
+def test_roster_marks_from_json_aggregates_keep_their_shape():
+    # json_agg returns dates as strings; the model parses and re-emits them
+    mark = {"id": "m1", "value": 9.0, "description": None, "date": "2024-03-01T08:30:00"}
+    payload = {"students": [{
+        "id": "1", "student_id": "S1", "first_name": "Ana", "last_name": "Pop",
+        "marks": [mark], "absences": [], "average_mark": 9.0, "total_absences": 0, "motivated_absences": 0
+    }]}
+
+    body = make_client(StudentsResponse, payload).get("/").json()
+
+    assert body["students"][0]["marks"] == [mark]
+    assert body["students"][0]["average_mark"] == 9.0
+
+def test_projected_page_only_contains_selected_fields():
+    payload = {"marks": [{"id": "m1", "date": datetime(2024, 3, 1), "value": 7.0}], "next_cursor": None}
+
+    body = make_client(MarksPage, payload).get("/").json()
+
+    assert body == {"marks": [{"id": "m1", "date": "2024-03-01T00:00:00", "value": 7.0}], "next_cursor": None}
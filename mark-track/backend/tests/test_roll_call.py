@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import func, select
+from models.database_models import Absence, NotificationOutbox
+from routers.teacher import submit_roll_call
+from conftest import JsonRequest, raised, run_in_session, seed_class
+
+def run_roll_call(user, class_id, payload):
+    async def scenario(session, statements):
+        return await submit_roll_call(class_id, JsonRequest(payload), db=session, current_user=user)
+
+    return run_in_session(scenario)
+
+def count(db, model):
+    db.expire_all()
+    return db.scalar(select(func.count()).select_from(model))
+
+def test_roll_call_is_idempotent_per_day(db):
+    user, class_id, student_ids, outsider_id = seed_class(db, 5)
+    payload = {
+        "date": "2024-03-01T08:00:00Z",
+        "present": student_ids[:3],
+        "absent": student_ids[3:] + [outsider_id]
+    }
+
+    first = run_roll_call(user, class_id, payload)
+    again = run_roll_call(user, class_id, payload)
+
+    assert first["recorded"] == 2
+    assert first["errors"] == [{"student_id": outsider_id, "detail": "Student is not enrolled in this class"}]
+    assert again["recorded"] == 0 and again["already_recorded"] == 2
+    assert count(db, Absence) == 2
+    assert count(db, NotificationOutbox) == 2
+
+    # A correction: student 3 was present after all
+    corrected = run_roll_call(user, class_id, {
+        "date": "2024-03-01T10:00:00Z",
+        "present": student_ids[:4],
+        "absent": student_ids[4:]
+    })
+    assert corrected["removed"] == 1
+    assert count(db, Absence) == 1
+
+    # Another day is a separate roll call
+    next_day = run_roll_call(user, class_id, {"date": "2024-03-02", "absent": student_ids[4:]})
+    assert next_day["recorded"] == 1
+    assert count(db, Absence) == 2
+
+@pytest.mark.parametrize("payload, detail", [
+    ({"absent": ["s"]}, "date is required"),
+    ({"date": 20240301, "absent": ["s"]}, "Invalid date"),
+    ({"date": "soon", "absent": ["s"]}, "Invalid date"),
+    ({"date": "2024-03-01", "absent": [1, 2]}, "absent must be a list of student ids"),
+    ({"date": "2024-03-01", "present": "s"}, "present must be a list of student ids"),
+    ({"date": "2024-03-01", "is_motivated": "yes"}, "Invalid is_motivated"),
+    (["not", "an", "object"], "Request body must be a JSON object"),
+])
+def test_roll_call_rejects_malformed_bodies(teacher_principal, payload, detail):
+    error = raised(submit_roll_call("c", JsonRequest(payload), db=None, current_user=teacher_principal))
+    assert (error.status_code, error.detail) == (400, detail)
@@ -0,0 +1,29 @@
+from sqlalchemy import event, text
+from database.init_db import apply_schema_updates
+from conftest import engine
+
+def run_schema_updates():
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement.strip())
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        apply_schema_updates(engine)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return statements
+
+def test_schema_updates_leave_an_up_to_date_database_alone(db):
+    statements = run_schema_updates()
+
+    # create_all already made every column, so no step alters or rewrites a table
+    assert not [s for s in statements if s.startswith(("ALTER", "UPDATE"))]
+
+def test_notify_trigger_is_created_once(db):
+    first = run_schema_updates()
+    again = run_schema_updates()
+
+    assert any(s.startswith("CREATE TRIGGER") for s in first)
+    assert not [s for s in again if s.startswith(("CREATE", "DROP"))]
+    assert db.scalar(text(
+        "SELECT count(*) FROM pg_trigger WHERE tgname = 'notifications_notify'"
+    )) == 1
@@ -1,5 +1,8 @@
-# import pytest
-from utils.security import verify_password, get_password_hash
+import asyncio
+import threading
+import pytest
+from utils.security import verify_password, get_password_hash, PasswordHasher, PasswordHasherBusy
+
 
 def test_password_hashing():
     """Test that password hashing works correctly."""
@@ -12,6 +15,7 @@ def test_password_hashing():
     
     assert not verify_password("wrong_password", hashed)
 
+
 def test_password_hash_uniqueness():
     """Test that same password produces different hashes."""
     password = "test_password123"
@@ -23,6 +27,7 @@ def test_password_hash_uniqueness():
     assert verify_password(password, hash1)
     assert verify_password(password, hash2)
 
+
 def test_password_verification_edge_cases():
     """Test password verification with edge cases."""
     password = "test_password123"
@@ -36,4 +41,52 @@ def test_password_verification_edge_cases():
     
     special_password = "!@#$%^&*()_+"
     special_hashed = get_password_hash(special_password)
-    assert verify_password(special_password, special_hashed) 
\ No newline at end of file
+    assert verify_password(special_password, special_hashed) 
+
+
+def test_cancelled_hasher_calls_leave_the_queue():
+    async def scenario():
+        hasher = PasswordHasher(workers=1, max_queue=10)
+        release = threading.Event()
+        calls = [asyncio.create_task(hasher.run(release.wait)) for _ in range(5)]
+        while hasher.running == 0:
+            await asyncio.sleep(0.01)
+        assert hasher.queued == 4
+
+        for call in calls[1:]:
+            call.cancel()
+        await asyncio.gather(*calls[1:], return_exceptions=True)
+        queued_after_cancel = hasher.queued
+
+        release.set()
+        await calls[0]
+        # Give the executor a moment to drop the cancelled jobs
+        await asyncio.sleep(0.05)
+        return queued_after_cancel, hasher.snapshot()
+
+    queued_after_cancel, snapshot = asyncio.run(scenario())
+    assert queued_after_cancel == 0
+    assert snapshot["queued"] == 0
+    assert snapshot["running"] == 0
+
+
+def test_hasher_rejects_when_queue_is_full():
+    async def scenario():
+        hasher = PasswordHasher(workers=1, max_queue=1)
+        release = threading.Event()
+        running = asyncio.create_task(hasher.run(release.wait))
+        while hasher.running == 0:
+            await asyncio.sleep(0.01)
+        waiting = asyncio.create_task(hasher.run(release.wait))
+        await asyncio.sleep(0)
+        try:
+            with pytest.raises(PasswordHasherBusy):
+                await hasher.run(release.wait)
+        finally:
+            release.set()
+            await asyncio.gather(running, waiting)
+        return hasher.snapshot()
+
+    snapshot = asyncio.run(scenario())
+    assert snapshot["rejected"] == 1
+    assert snapshot["queued"] == 0
@@ -0,0 +1,97 @@
+import uuid
+from fastapi import Response
+from starlette.requests import Request
+from database.versions import bump_version, marks_key
+from models.database_models import User, Teacher, Student, Subject, Mark, RegistrationStatus
+from models.principal import Principal, StudentPrincipal
+from routers.student import MARKS_FIELDS, get_student_marks
+from utils.pagination import PageParams, encode_cursor
+from conftest import run_in_session
+
+FIRST_PAGE = PageParams(cursor=None, limit=50)
+ALL_FIELDS = MARKS_FIELDS(fields=None)
+
+def seed_student(db):
+    subject = Subject(id=str(uuid.uuid4()), name="Math")
+    teacher = Teacher(id=str(uuid.uuid4()), subject_id=subject.id)
+    student = Student(id=str(uuid.uuid4()), student_id=str(uuid.uuid4()), first_name="Ana", last_name="Test")
+    user = User(
+        id=str(uuid.uuid4()),
+        email=f"student-{uuid.uuid4()}@example.com",
+        password="hashed_password",
+        role="student",
+        status=RegistrationStatus.active
+    )
+    db.add_all([subject, teacher, student, user])
+    db.flush()
+    db.add(Mark(
+        id=str(uuid.uuid4()), student_id=student.id, teacher_id=teacher.id,
+        subject_id=subject.id, value=8
+    ))
+    db.commit()
+    principal = Principal(
+        id=user.id,
+        email=user.email,
+        role=user.role,
+        status=user.status,
+        student=StudentPrincipal(
+            id=student.id, student_id=student.student_id, first_name="Ana", last_name="Test"
+        )
+    )
+    return principal, subject.id
+
+def make_request(etag=None):
+    headers = [(b"if-none-match", etag.encode())] if etag else []
+    return Request({"type": "http", "headers": headers})
+
+def test_marks_revalidation_skips_mark_query(db):
+    user, subject_id = seed_student(db)
+
+    async def scenario(session, statements):
+        response = Response()
+        first = await get_student_marks(make_request(), response, subject_id, FIRST_PAGE, ALL_FIELDS, db=session, current_user=user)
+        etag = response.headers["etag"]
+        assert len(first["marks"]) == 1
+
+        statements.clear()
+        cached = await get_student_marks(make_request(etag), Response(), subject_id, FIRST_PAGE, ALL_FIELDS, db=session, current_user=user)
+        assert cached.status_code == 304
+        # Only the version lookup ran
+        assert len(statements) == 1
+        assert "marks" not in statements[0]
+
+        await bump_version(session, marks_key(user.student.id, subject_id))
+        await session.commit()
+        response = Response()
+        refreshed = await get_student_marks(make_request(etag), response, subject_id, FIRST_PAGE, ALL_FIELDS, db=session, current_user=user)
+        assert len(refreshed["marks"]) == 1
+        assert response.headers["etag"] != etag
+        assert "last-modified" in response.headers
+
+    run_in_session(scenario)
+
+def test_marks_etag_differs_per_page_and_fields(db):
+    user, subject_id = seed_student(db)
+
+    async def scenario(session, statements):
+        response = Response()
+        await get_student_marks(make_request(), response, subject_id, FIRST_PAGE, ALL_FIELDS, db=session, current_user=user)
+        etag = response.headers["etag"]
+
+        variants = [
+            (PageParams(cursor=encode_cursor(None, "x"), limit=50), ALL_FIELDS),
+            (PageParams(cursor=None, limit=10), ALL_FIELDS),
+            (FIRST_PAGE, MARKS_FIELDS(fields="value")),
+        ]
+        for page, fields in variants:
+            response = Response()
+            result = await get_student_marks(make_request(etag), response, subject_id, page, fields, db=session, current_user=user)
+            assert isinstance(result, dict)
+            assert response.headers["etag"] != etag
+
+        # The same page and fields, spelled differently, still revalidate
+        same_fields = MARKS_FIELDS(fields="date,value,id,description,subject_name")
+        cached = await get_student_marks(make_request(etag), Response(), subject_id, FIRST_PAGE, same_fields, db=session, current_user=user)
+        assert cached.status_code == 304
+
+    run_in_session(scenario)
@@ -0,0 +1,76 @@
+import uuid
+from models.database_models import Student, Subject, Teacher, Class, ClassStudent, ClassSubject, Mark, Absence
+from models.principal import Principal, StudentPrincipal
+from routers.student import get_student_dashboard
+from conftest import raised, run_in_session
+
+def seed_student(db, subject_count, marked_subjects=1, marks_per_subject=2):
+    student = Student(id=str(uuid.uuid4()), student_id=str(uuid.uuid4()), first_name="Ana", last_name="Test")
+    class_obj = Class(id=str(uuid.uuid4()), name="9A")
+    db.add_all([student, class_obj])
+    db.flush()
+    db.add(ClassStudent(class_id=class_obj.id, student_id=student.student_id))
+    for i in range(subject_count):
+        subject = Subject(id=str(uuid.uuid4()), name=f"Subject {i}")
+        teacher = Teacher(id=str(uuid.uuid4()), first_name="T", last_name=str(i), subject_id=subject.id)
+        db.add_all([subject, teacher])
+        db.flush()
+        db.add(ClassSubject(class_id=class_obj.id, subject_id=subject.id, teacher_id=teacher.id))
+        # By default only the first subject has any marks or absences
+        if i < marked_subjects:
+            for value in (6, 9) * (marks_per_subject // 2):
+                db.add(Mark(
+                    id=str(uuid.uuid4()), student_id=student.id, teacher_id=teacher.id,
+                    subject_id=subject.id, value=value
+                ))
+            for is_motivated in (True, False, False):
+                db.add(Absence(
+                    id=str(uuid.uuid4()), student_id=student.id, teacher_id=teacher.id,
+                    subject_id=subject.id, is_motivated=is_motivated
+                ))
+    db.commit()
+    return Principal(
+        id=str(uuid.uuid4()),
+        email="ana@example.com",
+        role="student",
+        status=None,
+        student=StudentPrincipal(
+            id=student.id, student_id=student.student_id, first_name="Ana", last_name="Test"
+        )
+    )
+
+def run_dashboard(user):
+    async def scenario(session, statements):
+        result = await get_student_dashboard(db=session, current_user=user)
+        return result, len(statements)
+
+    return run_in_session(scenario)
+
+def test_dashboard_is_a_single_query(db):
+    result, queries = run_dashboard(seed_student(db, 8))
+
+    assert queries == 1
+    assert result["class"]["name"] == "9A"
+    assert [s["name"] for s in result["subjects"]] == [f"Subject {i}" for i in range(8)]
+
+    first, second = result["subjects"][:2]
+    assert first["teacher_name"] == "T 0"
+    assert first["average_mark"] == 7.5
+    assert first["total_marks"] == 2
+    assert sorted(m["value"] for m in first["marks"]) == [6, 9]
+    assert first["total_absences"] == 3
+    assert first["motivated_absences"] == 1
+    assert second["marks"] == [] and second["absences"] == []
+    assert second["average_mark"] is None
+
+def test_dashboard_query_count_does_not_grow_with_subjects_or_marks(db):
+    one, one_queries = run_dashboard(seed_student(db, 1))
+    many, many_queries = run_dashboard(seed_student(db, 12, marked_subjects=12, marks_per_subject=20))
+
+    assert len(one["subjects"]) == 1 and one["subjects"][0]["total_marks"] == 2
+    assert len(many["subjects"]) == 12
+    assert all(subject["total_marks"] == 20 for subject in many["subjects"])
+    assert one_queries == many_queries == 1
+
+def test_dashboard_keeps_client_errors(teacher_principal):
+    assert raised(get_student_dashboard(db=None, current_user=teacher_principal)).status_code == 403
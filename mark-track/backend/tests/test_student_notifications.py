@@ -0,0 +1,53 @@
+import uuid
+from datetime import datetime, timedelta
+from models.database_models import Student, Subject, Teacher, Notification
+from models.principal import Principal, StudentPrincipal
+import routers.notifications
+from routers.student import get_student_notifications
+from utils.pagination import PageParams
+from conftest import run_in_session
+
+def test_notifications_prefer_stored_names_and_look_up_missing_ones(db, monkeypatch):
+    monkeypatch.setattr(routers.notifications, "DENORMALISED_NAMES", True)
+    subject = Subject(id=str(uuid.uuid4()), name="Math")
+    teacher = Teacher(id=str(uuid.uuid4()), first_name="Ion", last_name="Pop", subject_id=subject.id)
+    student = Student(id=str(uuid.uuid4()), student_id=str(uuid.uuid4()), first_name="Ana", last_name="Test")
+    db.add_all([subject, teacher, student])
+    db.flush()
+    now = datetime.utcnow()
+    stored, legacy = str(uuid.uuid4()), str(uuid.uuid4())
+    db.add_all([
+        # Names as they were when the notification was written
+        Notification(
+            id=stored, student_id=student.id, teacher_id=teacher.id, subject_id=subject.id, value=8,
+            created_at=now, subject_name="Algebra", teacher_first_name="Ioan", teacher_last_name="Popa"
+        ),
+        # Written before names were stored on the row
+        Notification(
+            id=legacy, student_id=student.id, teacher_id=teacher.id, subject_id=subject.id, value=6,
+            created_at=now - timedelta(days=1)
+        ),
+    ])
+    db.commit()
+    user = Principal(
+        id=str(uuid.uuid4()),
+        email="ana@example.com",
+        role="student",
+        status=None,
+        student=StudentPrincipal(
+            id=student.id, student_id=student.student_id, first_name="Ana", last_name="Test"
+        )
+    )
+
+    async def scenario(session, statements):
+        result = await get_student_notifications(PageParams(cursor=None, limit=50), db=session, current_user=user)
+        return result, len(statements)
+
+    result, queries = run_in_session(scenario)
+
+    assert queries == 1
+    names = [
+        (n["id"], n["subject_name"], n["teacher_first_name"], n["teacher_last_name"])
+        for n in result["notifications"]
+    ]
+    assert names == [(stored, "Algebra", "Ioan", "Popa"), (legacy, "Math", "Ion", "Pop")]
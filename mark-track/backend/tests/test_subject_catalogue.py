@@ -0,0 +1,59 @@
+import asyncio
+from datetime import datetime
+from starlette.requests import Request
+from utils.cache import VersionedSnapshot
+from utils.conditional import cache_headers, is_not_modified, make_etag
+
+def make_request(headers=()):
+    return Request({"type": "http", "headers": [(k.encode(), v.encode()) for k, v in headers]})
+
+def test_snapshot_reloads_only_when_version_changes():
+    state = {"version": 1, "loads": 0}
+
+    async def load_version(db):
+        return state["version"]
+
+    async def load_payload(db):
+        state["loads"] += 1
+        return [f"subject-{state['loads']}"]
+
+    async def scenario():
+        catalogue = VersionedSnapshot(load_version, load_payload, check_interval=60)
+        assert await catalogue.get(None) == (1, ["subject-1"])
+        assert await catalogue.get(None) == (1, ["subject-1"])  # within the interval: no check
+
+        state["version"] = 2  # another worker created a subject
+        assert await catalogue.get(None) == (1, ["subject-1"])
+        catalogue.invalidate()
+        assert await catalogue.get(None) == (2, ["subject-2"])
+
+        catalogue.invalidate()
+        assert await catalogue.get(None) == (2, ["subject-2"])  # version unchanged: no reload
+        return catalogue.snapshot()
+
+    snapshot = asyncio.run(scenario())
+    assert state["loads"] == 2
+    assert snapshot["reloads"] == 2
+    assert snapshot["version_checks"] == 3
+
+def test_if_none_match():
+    etag = make_etag("subjects", 7)
+    assert etag == 'W/"subjects-7"'
+    assert is_not_modified(make_request([("if-none-match", 'W/"subjects-7"')]), etag)
+    assert is_not_modified(make_request([("if-none-match", '"other", "subjects-7"')]), etag)
+    assert is_not_modified(make_request([("if-none-match", "*")]), etag)
+    assert not is_not_modified(make_request([("if-none-match", 'W/"subjects-6"')]), etag)
+    assert not is_not_modified(make_request(), etag)
+
+def test_if_modified_since():
+    changed = datetime(2024, 3, 1, 12, 0, 0, 500000)
+    last_modified = cache_headers("x", changed)["Last-Modified"]
+    assert last_modified == "Fri, 01 Mar 2024 12:00:00 GMT"
+    assert is_not_modified(make_request([("if-modified-since", last_modified)]), "x", changed)
+    assert not is_not_modified(
+        make_request([("if-modified-since", "Fri, 01 Mar 2024 11:59:59 GMT")]), "x", changed
+    )
+    # If-None-Match takes precedence
+    assert not is_not_modified(
+        make_request([("if-none-match", '"y"'), ("if-modified-since", last_modified)]), "x", changed
+    )
@@ -0,0 +1,102 @@
+import uuid
+from sqlalchemy import select, text
+from database.versions import bump_version, teacher_dashboard_key
+from models.database_models import Teacher, Student, Subject, Class, ClassStudent, ClassSubject, Mark, Absence
+from models.principal import Principal, TeacherPrincipal
+from routers.teacher import dashboard_cache, get_teacher_dashboard
+from conftest import raised, run_in_session
+
+def seed_teacher(db):
+    subject = Subject(id=str(uuid.uuid4()), name="Math")
+    other_subject = Subject(id=str(uuid.uuid4()), name="History")
+    teacher = Teacher(id=str(uuid.uuid4()), subject_id=subject.id)
+    db.add_all([subject, other_subject, teacher])
+    db.flush()
+
+    for class_name, marks in (("9A", (6, 9)), ("9B", ())):
+        class_obj = Class(id=str(uuid.uuid4()), name=class_name)
+        db.add(class_obj)
+        db.flush()
+        db.add(ClassSubject(class_id=class_obj.id, subject_id=subject.id, teacher_id=teacher.id))
+        for i in range(2):
+            student = Student(id=str(uuid.uuid4()), student_id=str(uuid.uuid4()), first_name=f"S{i}")
+            db.add(student)
+            db.flush()
+            db.add(ClassStudent(class_id=class_obj.id, student_id=student.student_id))
+            for value in marks:
+                db.add(Mark(
+                    id=str(uuid.uuid4()), student_id=student.id, teacher_id=teacher.id,
+                    subject_id=subject.id, value=value
+                ))
+            # Marks in another subject must not count towards this teacher's stats
+            db.add(Mark(
+                id=str(uuid.uuid4()), student_id=student.id, teacher_id=teacher.id,
+                subject_id=other_subject.id, value=1
+            ))
+            if class_name == "9A":
+                db.add(Absence(
+                    id=str(uuid.uuid4()), student_id=student.id, teacher_id=teacher.id,
+                    subject_id=subject.id, is_motivated=i == 0
+                ))
+    db.commit()
+    return Principal(
+        id=str(uuid.uuid4()),
+        email="teacher@example.com",
+        role="teacher",
+        status=None,
+        teacher=TeacherPrincipal(id=teacher.id, subject_id=subject.id, first_name=None, last_name=None)
+    ), subject.id
+
+def test_teacher_dashboard_stats_and_invalidation(db):
+    user, subject_id = seed_teacher(db)
+    dashboard_cache.clear()
+
+    async def scenario(session, statements):
+        first = await get_teacher_dashboard(db=session, current_user=user)
+        cached = await get_teacher_dashboard(db=session, current_user=user)
+        assert cached is first
+
+        await session.execute(text("DELETE FROM absences"))
+        await bump_version(session, teacher_dashboard_key(user.teacher.id))
+        await session.commit()
+        refreshed = await get_teacher_dashboard(db=session, current_user=user)
+        return first, refreshed
+
+    first, refreshed = run_in_session(scenario)
+
+    class_a, class_b = first["classes"]
+    assert (class_a["name"], class_b["name"]) == ("9A", "9B")
+    assert class_a["subject_id"] == subject_id
+    assert class_a["student_count"] == 2
+    assert class_a["average_mark"] == 7.5
+    assert class_a["total_marks"] == 4
+    assert class_a["total_absences"] == 2
+    assert class_a["motivated_absences"] == 1
+    assert class_a["absence_rate"] == 1.0
+    assert class_b["average_mark"] is None
+    assert class_b["total_absences"] == 0
+    assert first["totals"] == {"classes": 2, "students": 4, "average_mark": 7.5, "total_absences": 2}
+
+    assert refreshed["classes"][0]["total_absences"] == 0
+
+def test_teacher_dashboard_totals_count_each_class_and_student_once(db):
+    user, _ = seed_teacher(db)
+    dashboard_cache.clear()
+    # Also teaches History in 9A: a second row for the same class and students
+    class_a = db.scalar(select(Class).where(Class.name == "9A"))
+    history = db.scalar(select(Subject).where(Subject.name == "History"))
+    db.add(ClassSubject(class_id=class_a.id, subject_id=history.id, teacher_id=user.teacher.id))
+    db.commit()
+
+    async def scenario(session, statements):
+        return await get_teacher_dashboard(db=session, current_user=user)
+
+    dashboard = run_in_session(scenario)
+
+    assert len(dashboard["classes"]) == 3
+    assert dashboard["totals"]["classes"] == 2
+    assert dashboard["totals"]["students"] == 4
+
+def test_teacher_dashboard_keeps_client_errors():
+    student = Principal(id="u", email="ana@example.com", role="student", status=None)
+    assert raised(get_teacher_dashboard(db=None, current_user=student)).status_code == 403
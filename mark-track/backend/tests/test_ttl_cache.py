@@ -0,0 +1,52 @@
+import time
+from utils.cache import TTLCache
+from routers.auth import PRINCIPAL_CHANNEL, principal_cache, principal_listener
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.snapshot()["evictions"] == 1
+
+def test_entries_expire():
+    cache = TTLCache(maxsize=10, ttl=0.05)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=-1)  # already expired, e.g. an expired JWT
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    time.sleep(0.06)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+def test_hit_rate_and_invalidation():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("user@example.com", "principal")
+    cache.get("user@example.com")
+    cache.pop("user@example.com")
+    cache.get("user@example.com")
+
+    snapshot = cache.snapshot()
+    assert snapshot["hits"] == 1
+    assert snapshot["misses"] == 1
+    assert snapshot["hit_rate"] == 0.5
+    assert snapshot["size"] == 0
+
+def test_principal_invalidations_from_other_workers():
+    principal_cache.set("a@example.com", "principal")
+    principal_cache.set("b@example.com", "principal")
+
+    # A NOTIFY sent by another worker's invalidate_principal
+    principal_listener._handle(None, 0, PRINCIPAL_CHANNEL, "a@example.com")
+    assert principal_cache.get("a@example.com") is None
+    assert principal_cache.get("b@example.com") == "principal"
+
+    # Invalidations sent while disconnected are lost, so a reconnect drops everything
+    principal_listener.on_reconnect()
+    assert len(principal_cache) == 0
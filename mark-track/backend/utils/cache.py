@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries also expire after a time-to-live."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING or entry[1] <= now:
+                if entry is not _MISSING:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value; `ttl` may shorten (never extend) the cache-wide TTL."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+class VersionedSnapshot:
+    """Process-local copy of a small, rarely changing dataset guarded by a version counter.
+
+    `load_version(db)` is the cheap check (a single-row lookup) and runs at most
+    once per `check_interval` seconds; `load_payload(db)` only runs when the
+    version differs from the cached one. Writers bump the shared version, so
+    every worker picks up a change within `check_interval`, and the writing
+    worker immediately after calling `invalidate()`.
+    """
+
+    def __init__(
+        self,
+        load_version: Callable[[Any], Awaitable[int]],
+        load_payload: Callable[[Any], Awaitable[Any]],
+        check_interval: float
+    ):
+        self.load_version = load_version
+        self.load_payload = load_payload
+        self.check_interval = check_interval
+        self._version: Optional[int] = None
+        self._payload: Any = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.version_checks = 0
+        self.reloads = 0
+
+    async def get(self, db) -> Tuple[int, Any]:
+        """Return (version, payload), refreshing from the database when stale."""
+        if self._version is not None and time.monotonic() - self._checked_at < self.check_interval:
+            self.hits += 1
+            return self._version, self._payload
+
+        async with self._lock:
+            # Another request may have refreshed while we waited for the lock
+            if self._version is not None and time.monotonic() - self._checked_at < self.check_interval:
+                self.hits += 1
+                return self._version, self._payload
+
+            self.version_checks += 1
+            version = await self.load_version(db)
+            if version != self._version:
+                # Read the version first: a write racing with the load leaves a
+                # newer payload under the older version, and the next check reloads
+                self._payload = await self.load_payload(db)
+                self._version = version
+                self.reloads += 1
+            else:
+                self.hits += 1
+            self._checked_at = time.monotonic()
+            return self._version, self._payload
+
+    def invalidate(self) -> None:
+        """Force a version check on the next get()."""
+        self._checked_at = 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "version": self._version,
+            "check_interval_seconds": self.check_interval,
+            "hits": self.hits,
+            "version_checks": self.version_checks,
+            "reloads": self.reloads
+        }
@@ -0,0 +1,67 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request, Response
+
+# Clients may keep the body but must revalidate it on every use
+REVALIDATE = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag built from version identifiers, e.g. W/"subjects-42"."""
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def variant(*parts) -> str:
+    """Short digest telling apart representations of one version, e.g. pages or field sets.
+
+    Pass normalised values (decoded cursor, sorted field names) so equivalent
+    requests share an ETag.
+    """
+    return hashlib.blake2s(repr(parts).encode(), digest_size=6).hexdigest()
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so ignore W/ prefixes on both sides
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since against the current state."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).replace(tzinfo=None)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have second precision
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def cache_headers(etag: str, last_modified: Optional[datetime] = None) -> dict:
+    """Validator headers for a response; datetimes are naive UTC as stored in the database."""
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(
+            last_modified.replace(microsecond=0, tzinfo=timezone.utc), usegmt=True
+        )
+    return headers
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag, last_modified))
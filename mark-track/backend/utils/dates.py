@@ -0,0 +1,17 @@
+from datetime import datetime, timezone
+from typing import Optional, Union
+
+
+def parse_datetime(value: Optional[Union[str, datetime]]) -> Optional[datetime]:
+    """Convert an ISO date string from a request body into a naive UTC datetime.
+
+    asyncpg does not coerce strings for timestamp columns, so values coming
+    from raw JSON payloads have to be parsed before they reach the database.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
@@ -0,0 +1,63 @@
+import threading
+from typing import Callable, Dict, Iterable
+
+# Default latency buckets in milliseconds
+DEFAULT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+class Histogram:
+    """Thread-safe fixed-bucket histogram with cumulative bucket counts."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS_MS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._sum += value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            count, total = self._count, self._sum
+        cumulative, running = {}, 0
+        for bound, n in zip(self.buckets, counts):
+            running += n
+            cumulative[f"le_{bound}"] = running
+        cumulative["le_inf"] = count
+        return {"count": count, "sum": round(total, 3), "buckets": cumulative}
+
+class Counter:
+    """Thread-safe monotonically increasing counter."""
+
+    def __init__(self):
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+# Registry of named collectors, each returning a JSON-serialisable dict
+_collectors: Dict[str, Callable[[], dict]] = {}
+
+def register_collector(name: str, collector: Callable[[], dict]) -> None:
+    """Register a callable whose snapshot is exposed under `name`."""
+    _collectors[name] = collector
+
+def collect() -> dict:
+    """Return the current snapshot of every registered collector."""
+    return {name: collector() for name, collector in _collectors.items()}
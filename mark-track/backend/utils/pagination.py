@@ -0,0 +1,116 @@
+import base64
+import json
+import os
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+from fastapi import HTTPException, Query
+from sqlalchemy import and_, false, or_, tuple_
+from utils.projection import Projection
+
+CursorValue = Union[str, int, float, datetime, None]
+
+DEFAULT_PAGE_LIMIT = int(os.getenv("DEFAULT_PAGE_LIMIT", "50"))
+MAX_PAGE_LIMIT = int(os.getenv("MAX_PAGE_LIMIT", "500"))
+
+
+def encode_cursor(*values: CursorValue) -> str:
+    """Encode the sort key of the last row on a page into an opaque cursor."""
+    payload = [{"dt": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> List[CursorValue]:
+    """Decode a cursor produced by encode_cursor, raising ValueError if it is malformed."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(payload, list):
+            raise ValueError("cursor payload is not a list")
+        return [
+            datetime.fromisoformat(v["dt"]) if isinstance(v, dict) else v
+            for v in payload
+        ]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+class PageParams:
+    """`cursor` and `limit` query parameters, used as a dependency by list endpoints."""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None),
+        limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT)
+    ):
+        try:
+            self.after = decode_cursor(cursor) if cursor else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        self.limit = limit
+
+
+def _nullable(column) -> bool:
+    return getattr(column, "nullable", True)
+
+
+def after_key(order_by: Sequence, values: Sequence[CursorValue], descending: bool = False):
+    """Condition selecting the rows that sort after `values` in `order_by` order.
+
+    NULLs sort last ascending and first descending (PostgreSQL's defaults).
+    A row comparison is never true when either side has a NULL, so it is only
+    used where no NULL can be skipped over; otherwise the first column is
+    expanded into explicit IS NULL branches.
+    """
+    if None not in values and (descending or not any(_nullable(column) for column in order_by)):
+        key = tuple_(*order_by)
+        return key < tuple(values) if descending else key > tuple(values)
+    column, value = order_by[0], values[0]
+    if value is None:
+        beyond = column.is_not(None) if descending else false()
+        same = column.is_(None)
+    else:
+        beyond = column < value if descending else column > value
+        if not descending and _nullable(column):
+            beyond = or_(beyond, column.is_(None))
+        same = column == value
+    if len(order_by) == 1:
+        return beyond
+    return or_(beyond, and_(same, after_key(order_by[1:], values[1:], descending)))
+
+
+def keyset_page(query, order_by: Sequence, page: PageParams, descending: bool = False):
+    """Continue `query` after the page cursor, ordered by `order_by`, fetching one extra row.
+
+    `order_by` must be unique per row (end it with the primary key) so that
+    pages neither skip nor repeat rows. Leading columns may be nullable.
+    """
+    if page.after is not None:
+        if len(page.after) != len(order_by):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(after_key(order_by, page.after, descending))
+    return (
+        query
+        .order_by(*(column.desc() if descending else column.asc() for column in order_by))
+        .limit(page.limit + 1)
+    )
+
+
+def dated_projection(columns: Dict[str, object]) -> Projection:
+    """Projection for a list paged by (date, id).
+
+    The next page cursor is built from that sort key, so both fields are
+    returned whatever `fields` asks for. Pair with `dated_key`.
+    """
+    return Projection(columns, always=("id", "date"))
+
+
+def dated_key(row) -> Tuple[CursorValue, CursorValue]:
+    """Sort key of a row selected through a `dated_projection`."""
+    return row["date"], row["id"]
+
+
+def next_page(rows: list, page: PageParams, key: Callable) -> Tuple[list, Optional[str]]:
+    """Trim the extra row fetched by keyset_page and build the cursor for the following page."""
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        return rows, encode_cursor(*key(rows[-1]))
+    return rows, None
@@ -0,0 +1,31 @@
+from typing import Dict, List, Optional, Sequence
+from fastapi import HTTPException, Query
+
+
+class Projection:
+    """Public field names of a list endpoint mapped to the columns that produce them.
+
+    Used as a dependency: `?fields=id,first_name` selects only those columns,
+    no parameter selects every field. The `always` fields (the row's sort key)
+    are added regardless, since the next page cursor is built from them.
+    Handlers select the returned labelled columns and read rows with
+    `.mappings()`, so no ORM entities are built.
+    """
+
+    def __init__(self, columns: Dict[str, object], always: Sequence[str] = ("id",)):
+        self.columns = columns
+        self.always = tuple(always)
+
+    def __call__(self, fields: Optional[str] = Query(None)) -> List:
+        if fields:
+            requested = {name.strip() for name in fields.split(",") if name.strip()}
+            unknown = requested - self.columns.keys()
+            if unknown:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+                )
+            requested.update(self.always)
+        else:
+            requested = self.columns.keys()
+        return [column.label(name) for name, column in self.columns.items() if name in requested]
@@ -0,0 +1,106 @@
+import asyncio
+from collections import deque
+from typing import Any, Dict, Hashable, Optional, Set
+
+class BrokerFull(Exception):
+    """Raised when a worker already holds its maximum number of subscriptions."""
+
+class Subscription:
+    """One connected client's bounded queue of pending messages.
+
+    A client that falls more than `maxsize` messages behind is closed rather
+    than buffered, so memory per connection stays fixed; it is expected to
+    reconnect and catch up from its last received id.
+    """
+    __slots__ = ("key", "maxsize", "closed", "_items", "_ready")
+
+    def __init__(self, key: Hashable, maxsize: int):
+        self.key = key
+        self.maxsize = maxsize
+        self.closed = False
+        self._items: deque = deque()
+        self._ready = asyncio.Event()
+
+    def push(self, item: Any) -> bool:
+        if self.closed:
+            return False
+        if len(self._items) >= self.maxsize:
+            self.close()
+            return False
+        self._items.append(item)
+        self._ready.set()
+        return True
+
+    def close(self) -> None:
+        self.closed = True
+        self._items.clear()
+        self._ready.set()
+
+    async def get(self) -> Optional[Any]:
+        """Next message, or None once the subscription is closed."""
+        while not self._items:
+            if self.closed:
+                return None
+            self._ready.clear()
+            await self._ready.wait()
+        return self._items.popleft()
+
+class Broker:
+    """In-process fan-out of messages to the subscriptions registered under a key."""
+
+    def __init__(self, max_subscriptions: int, queue_size: int):
+        self.max_subscriptions = max_subscriptions
+        self.queue_size = queue_size
+        self._subscriptions: Dict[Hashable, Set[Subscription]] = {}
+        self.count = 0
+        self.published = 0
+        self.dropped = 0
+        self.rejected = 0
+
+    def subscribe(self, key: Hashable) -> Subscription:
+        if self.count >= self.max_subscriptions:
+            self.rejected += 1
+            raise BrokerFull()
+        subscription = Subscription(key, self.queue_size)
+        self._subscriptions.setdefault(key, set()).add(subscription)
+        self.count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.key)
+        if subscriptions and subscription in subscriptions:
+            subscriptions.discard(subscription)
+            self.count -= 1
+            if not subscriptions:
+                del self._subscriptions[subscription.key]
+        subscription.close()
+
+    def has_subscribers(self, key: Hashable) -> bool:
+        return key in self._subscriptions
+
+    def publish(self, key: Hashable, item: Any) -> int:
+        delivered = 0
+        for subscription in self._subscriptions.get(key, ()):
+            if subscription.push(item):
+                delivered += 1
+            else:
+                self.dropped += 1
+        self.published += 1
+        return delivered
+
+    def close_all(self) -> None:
+        """Close every subscription, e.g. after missing messages, so clients resynchronise."""
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.close()
+
+    def snapshot(self) -> dict:
+        return {
+            "subscriptions": self.count,
+            "keys": len(self._subscriptions),
+            "max_subscriptions": self.max_subscriptions,
+            "queue_size": self.queue_size,
+            "published": self.published,
+            "dropped": self.dropped,
+            "rejected": self.rejected
+        }
@@ -1,12 +1,103 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
+from utils.metrics import Counter, Histogram, register_collector
 
 # Password hashing configuration
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL while hashing, so a thread pool gives real parallelism
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "200"))
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
     """Generate password hash."""
-    return pwd_context.hash(password) 
\ No newline at end of file
+    return pwd_context.hash(password)
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many hash/verify calls are already waiting for a worker."""
+
+class PasswordHasher:
+    """Bounded thread pool that keeps bcrypt work off the event loop."""
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.max_queued = 0
+        self.rejected = Counter()
+        self.wait_ms = Histogram()
+        self.run_ms = Histogram()
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected.inc()
+                raise PasswordHasherBusy()
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+        submitted = time.perf_counter()
+        # Whichever of task() and the cancellation path gets here first takes
+        # the call off the queue, so a call cancelled before it starts is not counted forever
+        dequeued = False
+
+        def leave_queue() -> bool:
+            nonlocal dequeued
+            with self._lock:
+                if dequeued:
+                    return False
+                dequeued = True
+                self.queued -= 1
+                return True
+
+        def task():
+            started = time.perf_counter()
+            if not leave_queue():
+                raise asyncio.CancelledError()
+            with self._lock:
+                self.running += 1
+            self.wait_ms.observe((started - submitted) * 1000)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                self.run_ms.observe((time.perf_counter() - started) * 1000)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, task)
+        finally:
+            leave_queue()
+
+    def snapshot(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "queued": self.queued,
+            "running": self.running,
+            "max_queued": self.max_queued,
+            "rejected": self.rejected.value,
+            "queue_wait_ms": self.wait_ms.snapshot(),
+            "run_ms": self.run_ms.snapshot()
+        }
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE)
+register_collector("password_hasher", password_hasher.snapshot)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the password hashing pool."""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """get_password_hash on the password hashing pool."""
+    return await password_hasher.run(get_password_hash, password)
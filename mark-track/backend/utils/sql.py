@@ -0,0 +1,12 @@
+from typing import Iterable
+from sqlalchemy import String, literal
+from sqlalchemy.dialects.postgresql import ARRAY
+
+
+def string_array(values: Iterable[str]):
+    """Bind a list of ids as one text[] parameter, for `column == any_(...)` or unnest().
+
+    Unlike IN (...), the statement text and its size stay the same however
+    many ids are passed.
+    """
+    return literal(list(values), ARRAY(String))
@@ -3,21 +3,29 @@ import SubjectList from "./components/SubjectList";
 import SubjectDetails from "./components/SubjectDetails";
 import { studentService } from "@/services/studentService";
 import { useAuth } from "@/context/AuthContext";
+import { StudentDashboardData } from "@/types/student";
 import Loader from "../Loader";
 
 const StudentDashboard = () => {
     const { user } = useAuth();
     const [selectedSubjectId, setSelectedSubjectId] = useState<string | null>(null);
-    const [studentClass, setStudentClass] = useState<string | null>(null);
+    const [dashboard, setDashboard] = useState<StudentDashboardData | null>(null);
+    const [error, setError] = useState<string | null>(null);
 
     useEffect(() => {
         if (user) {
-            studentService.fetchStudentClass().then(response => {
-                setStudentClass(response.class);
-            });
+            // One request for the class, every subject and its marks and absences
+            studentService.fetchDashboard()
+                .then((response: StudentDashboardData) => setDashboard(response))
+                .catch(err => {
+                    setError("Failed to load subjects");
+                    console.error(err);
+                });
         }
     }, [user]);
 
+    const selectedSubject = dashboard?.subjects.find(subject => subject.id === selectedSubjectId);
+
     const handleSubjectSelect = (subjectId: string) => {
         setSelectedSubjectId(subjectId);
     };
@@ -26,7 +34,12 @@ const StudentDashboard = () => {
         <div className="flex flex-col text-center lg:flex-row h-screen bg-gray-50 text-gray-800 mt-16">
             <div className="lg:w-1/4 bg-white shadow-lg p-6 border-r rounded-lg mt-6 mx-6">
                 <h2 className="text-2xl text-center font-bold text-black mb-4">Subjects</h2>
-                <SubjectList onSelectSubject={handleSubjectSelect} />
+                <SubjectList
+                    subjects={dashboard?.subjects ?? []}
+                    loading={!dashboard && !error}
+                    error={error}
+                    onSelectSubject={handleSubjectSelect}
+                />
             </div>
 
             <div className="flex-1 p-6">
@@ -36,13 +49,13 @@ const StudentDashboard = () => {
                     </h1>
                     <div className="text-lg text-gray-600">
                         <span className="font-medium">Class:</span>{" "}
-                        {studentClass ? studentClass : <Loader />}
+                        {dashboard ? (dashboard.class?.name ?? "Not assigned to any class") : <Loader />}
                     </div>
                 </div>
 
                 <div className="bg-white shadow-md rounded-lg p-6">
-                    {selectedSubjectId ? (
-                        <SubjectDetails subjectId={selectedSubjectId} />
+                    {selectedSubject ? (
+                        <SubjectDetails subject={selectedSubject} />
                     ) : (
                         <div className="text-lg text-gray-600">
                             Select a subject from the left to see its details.
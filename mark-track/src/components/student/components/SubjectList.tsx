@@ -1,40 +1,16 @@
 "use client";
 
-import { useEffect, useState } from "react";
-import { studentService } from "@/services/studentService";
 import Loader from "../../Loader";
-
-interface Subject {
-    id: string;
-    name: string;
-    teacher_name: string;
-}
+import { Subject } from "@/types/student";
 
 interface SubjectListProps {
+    subjects: Subject[];
+    loading: boolean;
+    error: string | null;
     onSelectSubject: (subjectId: string) => void;
 }
 
-const SubjectList: React.FC<SubjectListProps> = ({ onSelectSubject }) => {
-    const [subjects, setSubjects] = useState<Subject[]>([]);
-    const [loading, setLoading] = useState(true);
-    const [error, setError] = useState<string | null>(null);
-
-    useEffect(() => {
-        const fetchSubjects = async () => {
-            try {
-                const response = await studentService.fetchStudentSubjects();
-                setSubjects(response.subjects);
-            } catch (err) {
-                setError("Failed to load subjects");
-                console.error(err);
-            } finally {
-                setLoading(false);
-            }
-        };
-
-        fetchSubjects();
-    }, []);
-
+const SubjectList: React.FC<SubjectListProps> = ({ subjects, loading, error, onSelectSubject }) => {
     return (
         <div className="bg-white shadow-md rounded-lg p-4 border border-gray-200">
             <h2 className="text-xl font-semibold text-gray-800 mb-4">Your Subjects</h2>
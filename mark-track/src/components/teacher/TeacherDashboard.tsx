@@ -3,7 +3,7 @@
 import { useState, useEffect } from "react";
 import { useAuth } from "@/context/AuthContext";
 import { teacherService } from "@/services/teacherService";
-import { TeacherClass, StudentResponse, Mark, Absence } from "@/types/teacher";
+import { TeacherClassSummary, StudentResponse, Mark, Absence } from "@/types/teacher";
 import ClassSidebar from "./components/ClassSidebar";
 import StudentList from "./components/StudentList";
 import StudentDetails from "./components/StudentDetails";
@@ -14,7 +14,7 @@ import EditAbsenceModal from "./modals/EditAbsenceModal";
 
 export default function TeacherDashboard() {
     const { user } = useAuth();
-    const [classes, setClasses] = useState<TeacherClass[]>([]);
+    const [classes, setClasses] = useState<TeacherClassSummary[]>([]);
     const [selectedClass, setSelectedClass] = useState<string | null>(null);
     const [selectedStudent, setSelectedStudent] = useState<StudentResponse | null>(null);
     const [students, setStudents] = useState<StudentResponse[]>([]);
@@ -41,8 +41,9 @@ export default function TeacherDashboard() {
 
     const loadClasses = async () => {
         try {
-            const classesData = await teacherService.getClasses();
-            setClasses(classesData);
+            // Classes come with their stats, so the sidebar needs no per-class requests
+            const dashboard = await teacherService.getDashboard();
+            setClasses(dashboard.classes);
             setError(null);
         } catch (err) {
             setError("Failed to load classes");
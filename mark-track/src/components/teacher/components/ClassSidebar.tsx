@@ -1,9 +1,9 @@
 import React from 'react';
-import { TeacherClass } from '@/types/teacher';
+import { TeacherClassSummary } from '@/types/teacher';
 import { FaBars, FaTimes } from "react-icons/fa";
 
 interface ClassSidebarProps {
-    classList: TeacherClass[];
+    classList: TeacherClassSummary[];
     onClassSelect: (classId: string) => void;
     selectedClass: string | null;
     isOpen: boolean;
@@ -43,7 +43,12 @@ const ClassSidebar: React.FC<ClassSidebarProps> = ({ classList, onClassSelect, s
                                         }
                                     `}
                                 >
-                                    {cls.name}
+                                    <div>{cls.name}</div>
+                                    <div className="text-xs text-gray-500">
+                                        {cls.student_count} students
+                                        {cls.average_mark !== null && ` · avg ${cls.average_mark.toFixed(2)}`}
+                                        {` · ${cls.absence_rate} absences/student`}
+                                    </div>
                                 </button>
                             ))
                         )}
@@ -35,7 +35,6 @@ export default function AbsenceModal({ student, classData, onClose, onSuccess }:
                 description,
                 absenceDate
             );
-            await teacherService.createAbsenceNotification(student.id, classData.subject_id, isMotivated, description);
             onSuccess();
             onClose();
         } catch (err) {
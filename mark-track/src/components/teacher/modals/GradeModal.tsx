@@ -42,7 +42,6 @@ export default function GradeModal({ student, classData, onClose, onSuccess }: P
                 description,
                 date
             );
-            await teacherService.createMarkNotification(student.id, classData.subject_id, gradeValue, description);
             onSuccess();
             onClose();
         } catch (err) {
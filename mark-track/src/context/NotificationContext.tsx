@@ -1,6 +1,6 @@
 'use client';
 
-import React, { createContext, useContext, useState, useEffect } from 'react';
+import React, { createContext, useContext, useState, useEffect, useRef } from 'react';
 import { useAuth } from './AuthContext';
 import { notificationService } from '@/services/notificationService';
 import { MarkNotification, AbsenceNotification } from '@/types/notification';
@@ -14,12 +14,16 @@ interface NotificationContextType {
     error: string | null;
     fetchNotifications: () => Promise<void>;
     deleteNotification: (notificationId: string) => Promise<void>;
+    markAllRead: () => Promise<void>;
 }
 
 const NotificationContext = createContext<NotificationContextType | undefined>(undefined);
 
 export function NotificationProvider({ children }: { children: React.ReactNode }) {
     const [notifications, setNotifications] = useState<Notification[]>([]);
+    const [unreadCount, setUnreadCount] = useState(0);
+    // Ids already shown, so events replayed after a reconnect are not counted twice
+    const knownIds = useRef(new Set<string>());
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
     const { user } = useAuth();
@@ -27,14 +31,20 @@ export function NotificationProvider({ children }: { children: React.ReactNode }
     const fetchNotifications = async () => {
         if (!user || user.role !== 'student') {
             setNotifications([]);
+            setUnreadCount(0);
             setLoading(false);
             return;
         }
 
         try {
             setLoading(true);
-            const response = await notificationService.getNotifications();
+            const [response, unread] = await Promise.all([
+                notificationService.getNotifications(),
+                notificationService.getUnreadCount()
+            ]);
+            knownIds.current = new Set(response.notifications.map(n => n.id));
             setNotifications(response.notifications);
+            setUnreadCount(unread);
             setError(null);
         } catch (err) {
             setError('Failed to fetch notifications');
@@ -56,13 +66,39 @@ export function NotificationProvider({ children }: { children: React.ReactNode }
         }
     };
 
+    const markAllRead = async () => {
+        if (!user || user.role !== 'student') return;
+
+        try {
+            await notificationService.markRead({ before: new Date().toISOString() });
+            setNotifications(prev => prev.map(n => ({ ...n, is_read: true })));
+            setUnreadCount(0);
+        } catch (err) {
+            setError('Failed to mark notifications as read');
+            console.error('Error marking notifications as read:', err);
+        }
+    };
+
     useEffect(() => {
         if (user?.role === 'student') {
             fetchNotifications();
         }
     }, [user]);
 
-    const unreadCount = notifications.length;
+    useEffect(() => {
+        if (user?.role !== 'student') return;
+
+        const source = notificationService.openStream(
+            (notification) => {
+                if (knownIds.current.has(notification.id)) return;
+                knownIds.current.add(notification.id);
+                setNotifications(prev => [notification, ...prev]);
+                setUnreadCount(count => count + 1);
+            },
+            () => { fetchNotifications(); }
+        );
+        return () => source.close();
+    }, [user]);
 
     return (
         <NotificationContext.Provider value={{
@@ -71,7 +107,8 @@ export function NotificationProvider({ children }: { children: React.ReactNode }
             loading,
             error,
             fetchNotifications,
-            deleteNotification
+            deleteNotification,
+            markAllRead
         }}>
             {children}
         </NotificationContext.Provider>
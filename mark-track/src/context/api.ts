@@ -88,6 +88,18 @@ export const getRequestWithParams = async (url: string, params: any) => {
     }
 }
 
+// Follows next_cursor until the list endpoint has returned every page
+export const getAllPages = async <T>(url: string, key: string, params: any = {}): Promise<T[]> => {
+    const items: T[] = [];
+    let cursor: string | null = null;
+    do {
+        const data: any = await getRequestWithParams(url, { ...params, limit: 500, ...(cursor ? { cursor } : {}) });
+        items.push(...data[key]);
+        cursor = data.next_cursor;
+    } while (cursor);
+    return items;
+};
+
 export const deleteRequest = async (url: string) => {
     try {
         const response = await api.delete(url);
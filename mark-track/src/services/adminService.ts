@@ -1,17 +1,15 @@
-import { getRequest, postRequest, deleteRequest } from '../context/api';
+import { getRequest, getAllPages, postRequest, deleteRequest } from '../context/api';
 import { Class, Subject, Teacher, Student } from '../types/admin';
 
 export const adminService = {
     // Fetch all teachers
     async fetchTeachers(): Promise<Teacher[]> {
-        const response = await getRequest('/admin/teachers');
-        return response.teachers;
+        return await getAllPages<Teacher>('/admin/teachers', 'teachers');
     },
 
     // Fetch all classes
     async fetchClasses(): Promise<Class[]> {
-        const response = await getRequest('/admin/classes');
-        return response.classes;
+        return await getAllPages<Class>('/admin/classes', 'classes');
     },
 
     // Create a new class
@@ -45,8 +43,7 @@ export const adminService = {
 
     // Fetch all students
     async fetchStudents(): Promise<Student[]> {
-        const response = await getRequest('/admin/students');
-        return response.students;
+        return await getAllPages<Student>('/admin/students', 'students');
     },
 
     // Add multiple students to a class
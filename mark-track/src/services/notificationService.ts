@@ -1,11 +1,43 @@
 import { MarkNotification, AbsenceNotification } from '@/types/notification';
 import { getRequest, postRequest, deleteRequest } from '@/context/api';
 
+type Notification = MarkNotification | AbsenceNotification;
+
 class NotificationService {
-    async getNotifications(): Promise<{ notifications: (MarkNotification | AbsenceNotification)[] }> {
+    async getNotifications(): Promise<{ notifications: (MarkNotification | AbsenceNotification)[]; next_cursor: string | null }> {
         return await getRequest('/notifications');
     }
 
+    // The browser reconnects on its own and resends Last-Event-ID, so missed
+    // notifications are replayed; "reset" means too many were missed to replay
+    openStream(onNotification: (notification: Notification) => void, onReset: () => void): EventSource {
+        const source = new EventSource(
+            `${process.env.NEXT_PUBLIC_API_BASE_URL}/notifications/stream`,
+            { withCredentials: true }
+        );
+        source.addEventListener('notification', (event) => {
+            onNotification(JSON.parse((event as MessageEvent).data));
+        });
+        source.addEventListener('reset', onReset);
+        return source;
+    }
+
+    async getUnreadCount(): Promise<number> {
+        const response = await getRequest('/notifications/unread-count');
+        return response.unread;
+    }
+
+    // Pass either a list of ids or an ISO timestamp; everything up to it is affected
+    async markRead(selection: { ids: string[] } | { before: string }): Promise<number> {
+        const response = await postRequest('/notifications/read', selection);
+        return response.updated;
+    }
+
+    async deleteMany(selection: { ids: string[] } | { before: string }): Promise<number> {
+        const response = await postRequest('/notifications/delete', selection);
+        return response.deleted;
+    }
+
     async deleteNotification(notificationId: string): Promise<void> {
         await deleteRequest(`/notifications/${notificationId}`);
     }
@@ -1,6 +1,9 @@
-import {getRequest, getRequestWithParams} from "@/context/api";
+import {getRequest, getAllPages} from "@/context/api";
 
 export const studentService = {
+    fetchDashboard: async () => {
+        return await getRequest('/student/dashboard');
+    },
     fetchStudentSubjects: async () => {
         return await getRequest('/student/subjects');
     },
@@ -8,12 +11,12 @@ export const studentService = {
         return await getRequest('/student/class');
     },
     fetchMarksAndAbsences: async (subjectId: string) => {
-        const marks = await getRequestWithParams(`/student/marks`, {
+        const marks = await getAllPages(`/student/marks`, 'marks', {
             "subject_id": subjectId
         });
-        const absences = await getRequestWithParams(`/student/absences`, {
+        const absences = await getAllPages(`/student/absences`, 'absences', {
             "subject_id": subjectId
         });
-        return { marks, absences };
+        return { marks: { marks }, absences: { absences } };
     }
 }
\ No newline at end of file
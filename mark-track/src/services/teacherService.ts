@@ -1,6 +1,5 @@
-import {putRequest, postRequest, deleteRequest, getRequest, getRequestWithParams} from '../context/api';
-import { Mark, Absence, StudentResponse, TeacherClass } from '../types/teacher';
-import {MarkNotification, AbsenceNotification} from '../types/notification'
+import {putRequest, postRequest, deleteRequest, getRequest, getRequestWithParams, getAllPages} from '../context/api';
+import { Mark, Absence, StudentResponse, TeacherClass, TeacherDashboard, BulkResult, RollCallResult } from '../types/teacher';
 
 export const teacherService = {
     getClasses: async () => {
@@ -8,6 +7,11 @@ export const teacherService = {
         return response as TeacherClass[];
     },
 
+    getDashboard: async () => {
+        const response = await getRequest('/teacher/dashboard');
+        return response as TeacherDashboard;
+    },
+
     getClassStudents: async (classId: string, includeStats: boolean = true) => {
         const response = await getRequestWithParams(`/teacher/classes/${classId}/students`, {
             include_stats: includeStats
@@ -37,6 +41,27 @@ export const teacherService = {
         return response as Absence;
     },
 
+    addMarksBulk: async (class_id: string, subject_id: string, marks: { student_id: string; value: number; description?: string }[], description?: string, date?: Date) => {
+        const response = await postRequest(`/teacher/classes/${class_id}/marks/bulk`, {
+            subject_id,
+            description,
+            date,
+            marks
+        });
+        return response as BulkResult;
+    },
+
+    submitRollCall: async (class_id: string, subject_id: string, date: Date, present: string[], absent: string[], description?: string) => {
+        const response = await postRequest(`/teacher/classes/${class_id}/roll-call`, {
+            subject_id,
+            date,
+            present,
+            absent,
+            description
+        });
+        return response as RollCallResult;
+    },
+
     updateMark: async (markId: string, value: number, description: string, date: Date) => {
         const response = await putRequest(`/teacher/marks/${markId}`, {
             value,
@@ -64,30 +89,10 @@ export const teacherService = {
     },
 
     fetchStudentMarksAndAbsences: async (studentId: string) => {
-        const marksResponse = await getRequest(`/teacher/students/${studentId}/marks`);
-        const absencesResponse = await getRequest(`/teacher/students/${studentId}/absences`);
-        return {
-            marks: marksResponse.marks, absences: absencesResponse.absences
-        }
-    },
-
-    createMarkNotification: async (student_id: string, subject_id: string, value: number, description: string) => {
-        const response = await postRequest(`notifications/mark` , {
-            student_id,
-            subject_id,
-            mark_value: value,
-            description
-        });
-        return response as MarkNotification;
-    },
-
-    createAbsenceNotification: async (student_id: string, subject_id: string, is_motivated: boolean, description: string) => {
-        const response = await postRequest(`notifications/absence`, {
-            student_id,
-            subject_id,
-            is_motivated,
-            description
-        });
-        return response as AbsenceNotification;
+        const [marks, absences] = await Promise.all([
+            getAllPages(`/teacher/students/${studentId}/marks`, 'marks'),
+            getAllPages(`/teacher/students/${studentId}/absences`, 'absences')
+        ]);
+        return { marks, absences };
     }
 }; 
\ No newline at end of file
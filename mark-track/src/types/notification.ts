@@ -8,6 +8,7 @@ export interface NotificationBase {
     teacher_last_name: string;
     description: string;
     date: string;
+    is_read?: boolean;
     created_at?: string;
 }
 
@@ -34,4 +34,18 @@ export interface Subject {
     id: string;
     name: string;
     teacher_name?: string;
-}
\ No newline at end of file
+}
+
+export interface DashboardSubject extends Subject {
+    marks: MarkBase[];
+    absences: AbsenceBase[];
+    average_mark: number | null;
+    total_marks: number;
+    total_absences: number;
+    motivated_absences: number;
+}
+
+export interface StudentDashboardData {
+    class: { id: string; name: string } | null;
+    subjects: DashboardSubject[];
+}
@@ -4,6 +4,26 @@ export interface TeacherClass {
     subject_id: string;
 }
 
+export interface TeacherClassSummary extends TeacherClass {
+    subject_name: string;
+    student_count: number;
+    average_mark: number | null;
+    total_marks: number;
+    total_absences: number;
+    motivated_absences: number;
+    absence_rate: number;
+}
+
+export interface TeacherDashboard {
+    classes: TeacherClassSummary[];
+    totals: {
+        classes: number;
+        students: number;
+        average_mark: number | null;
+        total_absences: number;
+    };
+}
+
 export interface TeacherClasses {
     classes: TeacherClass[];
 }
@@ -78,3 +98,21 @@ export interface StudentResponse {
 export interface StudentsResponse {
     students: StudentResponse[];
 } 
+
+export interface BulkRowError {
+    index: number;
+    student_id: string | null;
+    detail: string;
+}
+
+export interface BulkResult {
+    created: number;
+    errors: BulkRowError[];
+}
+
+export interface RollCallResult {
+    recorded: number;
+    already_recorded: number;
+    removed: number;
+    errors: Omit<BulkRowError, "index">[];
+}